@@ -0,0 +1,92 @@
+"""Measures substring name search latency with and without a pg_trgm GIN index.
+
+Runs against the database configured by DATABASE_URL and uses its own scratch table, which is dropped
+afterwards. Example (from the server directory):
+
+    python -m benchmarks.trigram_search --rows 1000000 10000000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from core.config import settings
+
+TABLE = "benchmark_trigram_names"
+PATTERNS = ["%quarterly%", "%7f3a%", "%2019%", "%zz9q%"]
+QUERIES = {
+    "count": f"SELECT count(*) FROM {TABLE} WHERE name ILIKE :pattern",
+    "page": f"SELECT id, name FROM {TABLE} WHERE name ILIKE :pattern ORDER BY name LIMIT 20",
+}
+
+
+async def populate(conn: AsyncConnection, rows: int) -> None:
+    await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    await conn.execute(text(f"CREATE UNLOGGED TABLE {TABLE} (id bigint PRIMARY KEY, name varchar(255) NOT NULL)"))
+    await conn.execute(
+        text(
+            f"INSERT INTO {TABLE} (id, name) "
+            "SELECT i, (ARRAY['report', 'invoice', 'quarterly summary', 'contract', 'notes'])[1 + i % 5] "
+            "|| '_' || (2015 + i % 10) || '_' || left(md5(i::text), 12) || '.pdf' "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {"rows": rows},
+    )
+    await conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+async def measure(conn: AsyncConnection, repeats: int) -> dict[tuple[str, str], float]:
+    results = {}
+    for name, query in QUERIES.items():
+        for pattern in PATTERNS:
+            await conn.execute(text(query), {"pattern": pattern})  # warm-up
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                await conn.execute(text(query), {"pattern": pattern})
+                timings.append((time.perf_counter() - start) * 1000)
+            results[(name, pattern)] = statistics.median(timings)
+    return results
+
+
+async def run(row_counts: list[int], repeats: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.commit()
+
+            for rows in row_counts:
+                print(f"Populating {rows:,} rows...")
+                await populate(conn, rows)
+                await conn.commit()
+                before = await measure(conn, repeats)
+
+                print("Building trigram index...")
+                start = time.perf_counter()
+                await conn.execute(text(f"CREATE INDEX ON {TABLE} USING gin (name gin_trgm_ops)"))
+                await conn.execute(text(f"ANALYZE {TABLE}"))
+                await conn.commit()
+                print(f"Index built in {time.perf_counter() - start:.1f} s")
+                after = await measure(conn, repeats)
+
+                print(f"\n{'query':<7} {'pattern':<14} {'seq scan (ms)':>14} {'trigram (ms)':>13} {'speedup':>8}")
+                for key in before:
+                    speedup = before[key] / after[key] if after[key] else float("inf")
+                    print(f"{key[0]:<7} {key[1]:<14} {before[key]:>14.1f} {after[key]:>13.1f} {speedup:>7.1f}x")
+                print()
+
+            await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+            await conn.commit()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeats))
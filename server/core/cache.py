@@ -0,0 +1,87 @@
+from collections import OrderedDict
+import time
+from typing import Any, Callable, Generic, Hashable, TypeVar
+from core.config import settings
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Per-worker LRU cache bounded by the total weight of its values (bytes by default). Entries
+    optionally expire ``ttl_seconds`` after they were stored."""
+
+    def __init__(
+        self, max_weight: int, weigh: Callable[[V], int] = len, ttl_seconds: float | None = None  # type: ignore[assignment]
+    ) -> None:
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[V, int, float]] = OrderedDict()
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> V | None:
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl_seconds is not None and time.monotonic() - entry[2] > self.ttl_seconds:
+            self.invalidate(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: V) -> bool:
+        weight = self.weigh(value)
+        if weight > self.max_weight:
+            return False
+
+        self.invalidate(key)
+        self._entries[key] = (value, weight, time.monotonic())
+        self.weight += weight
+        while self.weight > self.max_weight:
+            _, (_, evicted_weight, _) = self._entries.popitem(last=False)
+            self.weight -= evicted_weight
+            self.evictions += 1
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.weight = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "weight": self.weight,
+            "max_weight": self.max_weight,
+        }
+
+
+document_body_cache: LRUCache[bytes] = LRUCache(settings.DOCUMENT_CACHE_MAX_BYTES)
+archive_directory_cache: LRUCache[list] = LRUCache(settings.ARCHIVE_DIRECTORY_CACHE_MAX_ENTRIES)
+line_index_cache: LRUCache[Any] = LRUCache(settings.LINE_INDEX_CACHE_MAX_OFFSETS, weigh=lambda index: len(index.offsets))
+effective_access_cache: LRUCache[Any] = LRUCache(
+    settings.ACCESS_CACHE_MAX_USERS, weigh=lambda _: 1, ttl_seconds=settings.ACCESS_CACHE_TTL_SECONDS
+)
+autocomplete_index_cache: LRUCache[Any] = LRUCache(
+    settings.AUTOCOMPLETE_INDEX_CACHE_MAX_NAMES, weigh=lambda index: len(index.keys), ttl_seconds=settings.AUTOCOMPLETE_INDEX_TTL_SECONDS
+)
+folder_tree_cache: LRUCache[list] = LRUCache(
+    settings.FOLDER_TREE_CACHE_MAX_FOLDERS, ttl_seconds=settings.FOLDER_TREE_CACHE_TTL_SECONDS
+)
@@ -16,6 +16,57 @@ class Settings(BaseSettings):
         "application/zip",
     }
     MAX_FILE_SIZE: int = 10 * 1024 * 1024
+
+    STORAGE_BACKEND: str = "local"
+    STORAGE_PRESIGNED_DOWNLOADS: bool = True
+    STORAGE_PRESIGNED_URL_EXPIRE_SECONDS: int = 300
+    S3_ENDPOINT_URL: str | None = None
+    S3_BUCKET: str = "documents"
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_REGION: str = "us-east-1"
+
+    MEDIA_VOLUMES: dict[str, str] = {}
+    MEDIA_PLACEMENT_POLICY: str = "round_robin"
+    MEDIA_VOLUME_PINS: dict[str, str] = {}
+    MEDIA_PLACEMENT_REFRESH_SECONDS: int = 30
+    MEDIA_REBALANCE_BANDWIDTH_BYTES: int = 50 * 1024 * 1024
+    MEDIA_REBALANCE_GRACE_SECONDS: int = 120
+    MEDIA_COPY_HARDLINKS: bool = False
+
+    COLD_MEDIA_ROOT: str = ""
+    COLD_TIER_COMPRESS: bool = True
+    COLD_TIER_AFTER_DAYS: int = 30
+    TIERING_INTERVAL_SECONDS: int = 3600
+    TIERING_BATCH_SIZE: int = 500
+    ACCESS_FLUSH_INTERVAL_SECONDS: int = 30
+    TRASH_COLLECT_INTERVAL_SECONDS: int = 600
+    TRASH_GRACE_SECONDS: int = 3600
+    DELETION_BATCH_SIZE: int = 1000
+    BULK_STORAGE_CONCURRENCY: int = 16
+
+    DOCUMENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    DOCUMENT_CACHE_MAX_ITEM_BYTES: int = 256 * 1024
+
+    SIGNED_URL_SECRET_KEY: str = ""
+    SIGNED_URL_EXPIRE_SECONDS: int = 300
+
+    ARCHIVE_MAX_CENTRAL_DIRECTORY_BYTES: int = 32 * 1024 * 1024
+    ARCHIVE_DIRECTORY_CACHE_MAX_ENTRIES: int = 200_000
+
+    LINE_INDEX_INTERVAL: int = 1000
+    LINE_INDEX_CACHE_MAX_OFFSETS: int = 1_000_000
+
+    SEARCH_MAX_TEXT_CHARS: int = 500_000
+    AUTOCOMPLETE_INDEX_TTL_SECONDS: int = 300
+    AUTOCOMPLETE_INDEX_CACHE_MAX_NAMES: int = 1_000_000
+    AUTOCOMPLETE_CANDIDATE_FACTOR: int = 5
+
+    ACCESS_CACHE_MAX_USERS: int = 10_000
+    ACCESS_CACHE_TTL_SECONDS: int = 60
+
+    FOLDER_TREE_CACHE_MAX_FOLDERS: int = 500_000
+    FOLDER_TREE_CACHE_TTL_SECONDS: int = 300
     
     ADMIN_LOGIN: str = ""
     ADMIN_PASSWORD: str = ""
@@ -1,4 +1,9 @@
 from datetime import datetime, timedelta, timezone
+import base64
+import hashlib
+import hmac
+import json
+import time
 import uuid
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
@@ -48,6 +53,40 @@ def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None
     return encoded_jwt
 
 
+def _signed_url_secret() -> bytes:
+    return (settings.SIGNED_URL_SECRET_KEY or settings.JWT_SECRET_KEY).encode()
+
+
+def create_signed_url_token(claims: dict, expires_in: int | None = None) -> tuple[str, int]:
+    """Return an HMAC-SHA256 signed token carrying ``claims`` and its expiry (unix timestamp)."""
+    if expires_in is None:
+        expires_in = settings.SIGNED_URL_EXPIRE_SECONDS
+
+    expires_at = int(time.time()) + expires_in
+    payload = json.dumps({**claims, "exp": expires_at}, separators=(",", ":")).encode()
+    encoded_payload = base64.urlsafe_b64encode(payload).rstrip(b"=")
+    signature = hmac.new(_signed_url_secret(), encoded_payload, hashlib.sha256).digest()
+    return f"{encoded_payload.decode()}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}", expires_at
+
+
+def verify_signed_url_token(token: str) -> dict:
+    """Check the signature and expiry of a signed URL token without touching the database."""
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        signature = base64.urlsafe_b64decode(encoded_signature + "=" * (-len(encoded_signature) % 4))
+    except ValueError:
+        raise ValueError("Invalid signed URL")
+
+    expected = hmac.new(_signed_url_secret(), encoded_payload.encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("Invalid signed URL")
+
+    claims = json.loads(base64.urlsafe_b64decode(encoded_payload + "=" * (-len(encoded_payload) % 4)))
+    if claims.get("exp", 0) < time.time():
+        raise ValueError("Signed URL has expired")
+    return claims
+
+
 def verify_token(token: str, secret_key: str, token_type: str = "access") -> dict:
     try:
         payload = jwt.decode(token, secret_key, algorithms=[settings.JWT_ALGORITHM])
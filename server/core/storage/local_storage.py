@@ -0,0 +1,149 @@
+import asyncio
+import os
+import shutil
+from typing import AsyncIterator, BinaryIO
+from core.config import settings
+from core.storage_base import DEFAULT_CHUNK_SIZE, StorageBackend
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore
+
+FICLONE = 0x40049409
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def _abs(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def local_path(self, key: str) -> str | None:
+        return self._abs(key)
+
+    async def save(self, key: str, data: BinaryIO) -> None:
+        await asyncio.to_thread(self._save_sync, self._abs(key), data)
+
+    @staticmethod
+    def _save_sync(path: str, data: BinaryIO) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            shutil.copyfileobj(data, file, DEFAULT_CHUNK_SIZE)
+
+    async def iter_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        file = await asyncio.to_thread(open, self._abs(key), "rb")
+        try:
+            while chunk := await asyncio.to_thread(file.read, chunk_size):
+                yield chunk
+        finally:
+            file.close()
+
+    async def read_range(self, key: str, start: int, length: int) -> bytes:
+        return await asyncio.to_thread(self._read_range_sync, self._abs(key), start, length)
+
+    @staticmethod
+    def _read_range_sync(path: str, start: int, length: int) -> bytes:
+        with open(path, "rb") as file:
+            file.seek(start)
+            return file.read(length)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.isfile, self._abs(key))
+
+    async def size(self, key: str) -> int | None:
+        try:
+            return (await asyncio.to_thread(os.stat, self._abs(key))).st_size
+        except FileNotFoundError:
+            return None
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, self._abs(key))
+        except FileNotFoundError:
+            pass
+
+    async def move(self, old_key: str, new_key: str) -> None:
+        new_path = self._abs(new_key)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(new_path), exist_ok=True)
+        await asyncio.to_thread(os.rename, self._abs(old_key), new_path)
+
+    async def copy(self, old_key: str, new_key: str) -> None:
+        await asyncio.to_thread(self._copy_sync, self._abs(old_key), self._abs(new_key), settings.MEDIA_COPY_HARDLINKS)
+
+    @staticmethod
+    def _copy_sync(source: str, target: str, hardlink: bool) -> None:
+        """Clone the file with a reflink where the filesystem supports it (Btrfs, XFS, ...), otherwise
+        hardlink it if allowed, otherwise copy it (in the kernel where possible)."""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if LocalStorageBackend._reflink_sync(source, target):
+            return
+
+        if hardlink:
+            try:
+                os.link(source, target)
+                return
+            except OSError:
+                pass
+
+        shutil.copyfile(source, target)
+
+    @staticmethod
+    def _reflink_sync(source: str, target: str) -> bool:
+        if fcntl is None:
+            return False
+
+        with open(source, "rb") as source_file:
+            try:
+                target_file = open(target, "xb")
+            except FileExistsError:
+                return False
+
+            with target_file:
+                try:
+                    fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+                    return True
+                except OSError:
+                    pass
+
+        os.remove(target)
+        return False
+
+    async def make_prefix(self, prefix: str, exist_ok: bool = True) -> None:
+        path = self._abs(prefix)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+        await asyncio.to_thread(os.makedirs, path, exist_ok=exist_ok)
+
+    async def move_prefix(self, old_prefix: str, new_prefix: str) -> None:
+        await self.move(old_prefix, new_prefix)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        path = self._abs(prefix)
+        if await asyncio.to_thread(os.path.isdir, path):
+            await asyncio.to_thread(shutil.rmtree, path)
+
+    async def list_children(self, prefix: str) -> list[str]:
+        try:
+            return sorted(await asyncio.to_thread(os.listdir, self._abs(prefix)))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    async def list_tree(self, prefix: str) -> tuple[set[str], dict[str, int]]:
+        return await asyncio.to_thread(self._list_tree_sync, self._abs(prefix))
+
+    @staticmethod
+    def _list_tree_sync(base: str) -> tuple[set[str], dict[str, int]]:
+        if not os.path.isdir(base):
+            raise FileNotFoundError(f"Storage path {base} does not exist.")
+
+        dirs: set[str] = set()
+        files: dict[str, int] = {}
+        for root, dir_names, file_names in os.walk(base):
+            rel_root = os.path.relpath(root, base)
+            rel_parts = [] if rel_root == "." else rel_root.split(os.sep)
+            for dir_name in dir_names:
+                dirs.add("/".join([*rel_parts, dir_name]))
+            for file_name in file_names:
+                files["/".join([*rel_parts, file_name])] = os.path.getsize(os.path.join(root, file_name))
+        return dirs, files
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import uuid
+from core.storage.local_storage import LocalStorageBackend
+from core.storage.placement import VolumePlacement
+from core.storage_base import CATEGORIES_PREFIX, TRASH_PREFIX
+
+
+class MultiVolumeStorageBackend(LocalStorageBackend):
+    """Local storage spread over several volumes.
+
+    The second segment of every key (``categories/<category_id>/...`` or ``trash/<category_id>/...``) selects
+    the volume through the placement map. Categories unknown to this worker are located by probing the
+    volumes, and keys that do not belong to a category land on the default volume.
+    """
+
+    def __init__(self, placement: VolumePlacement) -> None:
+        super().__init__(placement.root_for(placement.default_volume))  # type: ignore
+        self.placement = placement
+
+    def _abs(self, key: str) -> str:
+        parts = key.split("/")
+        return os.path.join(self.root_for_category(parts[1]) if len(parts) > 1 else self.root, *parts)
+
+    def root_for_category(self, category_id: str) -> str:
+        try:
+            uuid.UUID(category_id)
+        except ValueError:
+            return self.root
+
+        volume = self.placement.get(category_id) or self._probe_volume(category_id)
+        return self.placement.root_for(volume) if volume else self.root
+
+    async def list_children(self, prefix: str) -> list[str]:
+        if "/" in prefix.strip("/"):
+            return await super().list_children(prefix)
+
+        names: set[str] = set()
+        for root in self.placement.volumes.values():
+            try:
+                names.update(await asyncio.to_thread(os.listdir, os.path.join(root, prefix)))
+            except FileNotFoundError:
+                pass
+        return sorted(names)
+
+    def _probe_volume(self, category_id: str) -> str | None:
+        for volume, root in self.placement.volumes.items():
+            if any(os.path.isdir(os.path.join(root, prefix, category_id)) for prefix in (CATEGORIES_PREFIX, TRASH_PREFIX)):
+                self.placement.set(category_id, volume)
+                return volume
+        return None
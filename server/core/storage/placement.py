@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+import itertools
+import shutil
+import uuid
+from core.config import settings
+
+
+class PlacementPolicy(ABC):
+    """Chooses the volume a new category is stored on."""
+
+    @abstractmethod
+    def choose(self, volumes: dict[str, str], category_id: uuid.UUID, organization_id: uuid.UUID | None) -> str:
+        pass
+
+
+class RoundRobinPolicy(PlacementPolicy):
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, volumes: dict[str, str], category_id: uuid.UUID, organization_id: uuid.UUID | None) -> str:
+        names = sorted(volumes)
+        return names[next(self._counter) % len(names)]
+
+
+class LeastUsedPolicy(PlacementPolicy):
+    def choose(self, volumes: dict[str, str], category_id: uuid.UUID, organization_id: uuid.UUID | None) -> str:
+        return max(sorted(volumes), key=lambda name: shutil.disk_usage(volumes[name]).free)
+
+
+class PinnedPolicy(PlacementPolicy):
+    """Places categories according to ``MEDIA_VOLUME_PINS`` (category or organization id -> volume)."""
+
+    def __init__(self, pins: dict[str, str], fallback: PlacementPolicy) -> None:
+        self.pins = pins
+        self.fallback = fallback
+
+    def choose(self, volumes: dict[str, str], category_id: uuid.UUID, organization_id: uuid.UUID | None) -> str:
+        for owner_id in (category_id, organization_id):
+            volume = self.pins.get(str(owner_id))
+            if volume in volumes:
+                return volume  # type: ignore
+        return self.fallback.choose(volumes, category_id, organization_id)
+
+
+PLACEMENT_POLICIES: dict[str, type[PlacementPolicy]] = {
+    "round_robin": RoundRobinPolicy,
+    "least_used": LeastUsedPolicy,
+}
+
+
+def create_placement_policy(name: str) -> PlacementPolicy:
+    if name == "pinned":
+        return PinnedPolicy(settings.MEDIA_VOLUME_PINS, fallback=LeastUsedPolicy())
+
+    policy_class = PLACEMENT_POLICIES.get(name)
+    if policy_class is None:
+        raise ValueError(f"Unsupported placement policy: {name}")
+    return policy_class()
+
+
+class VolumePlacement:
+    """Per-worker map of category id -> volume name, refreshed from the ``category_placements`` table."""
+
+    def __init__(self, volumes: dict[str, str]) -> None:
+        self.volumes = volumes
+        self.default_volume = sorted(volumes)[0] if volumes else None
+        self._placements: dict[str, str] = {}
+
+    def replace(self, placements: dict[str, str]) -> None:
+        self._placements = {category_id: volume for category_id, volume in placements.items() if volume in self.volumes}
+
+    def set(self, category_id: uuid.UUID | str, volume: str) -> None:
+        self._placements[str(category_id)] = volume
+
+    def get(self, category_id: uuid.UUID | str) -> str | None:
+        return self._placements.get(str(category_id))
+
+    def category_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for volume in self._placements.values():
+            counts[volume] = counts.get(volume, 0) + 1
+        return counts
+
+    def root_for(self, volume: str) -> str:
+        return self.volumes[volume]
+
+
+volume_placement = VolumePlacement(settings.MEDIA_VOLUMES)
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Any, AsyncIterator, BinaryIO
+from core.config import settings
+from core.storage_base import DEFAULT_CHUNK_SIZE, StorageBackend, content_disposition
+
+DELETE_BATCH_SIZE = 1000
+
+
+class S3StorageBackend(StorageBackend):
+    """S3-compatible backend (AWS S3, MinIO, ...). Directories are kept as zero-byte ``<prefix>/`` markers."""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None = None,
+        access_key_id: str = "",
+        secret_access_key: str = "",
+        region: str = "us-east-1",
+    ) -> None:
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError as e:
+            raise RuntimeError("The s3 storage backend requires the 'boto3' package") from e
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            region_name=region,
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        response = getattr(error, "response", None) or {}
+        return response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    async def save(self, key: str, data: BinaryIO) -> None:
+        await asyncio.to_thread(self.client.upload_fileobj, data, self.bucket, key)
+
+    async def iter_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        response = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=key)
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def read_range(self, key: str, start: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        response = await asyncio.to_thread(
+            self.client.get_object, Bucket=self.bucket, Key=key, Range=f"bytes={start}-{start + length - 1}"
+        )
+        return await asyncio.to_thread(response["Body"].read)
+
+    async def _head(self, key: str) -> dict[str, Any] | None:
+        try:
+            return await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if self._is_not_found(e):
+                return None
+            raise
+
+    async def exists(self, key: str) -> bool:
+        return await self._head(key) is not None
+
+    async def size(self, key: str) -> int | None:
+        head = await self._head(key)
+        return head["ContentLength"] if head else None
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def copy(self, old_key: str, new_key: str) -> None:
+        await asyncio.to_thread(
+            self.client.copy_object, Bucket=self.bucket, Key=new_key, CopySource={"Bucket": self.bucket, "Key": old_key}
+        )
+
+    async def move(self, old_key: str, new_key: str) -> None:
+        await self.copy(old_key, new_key)
+        await self.delete(old_key)
+
+    async def make_prefix(self, prefix: str, exist_ok: bool = True) -> None:
+        marker = f"{prefix.rstrip('/')}/"
+        if not exist_ok and await self._head(marker) is not None:
+            raise FileExistsError(f"Storage prefix {prefix} already exists.")
+        await asyncio.to_thread(self.client.put_object, Bucket=self.bucket, Key=marker, Body=b"")
+
+    async def _list_keys(self, prefix: str) -> list[tuple[str, int]]:
+        def list_sync() -> list[tuple[str, int]]:
+            paginator = self.client.get_paginator("list_objects_v2")
+            keys = []
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{prefix.rstrip('/')}/"):
+                keys.extend((obj["Key"], obj["Size"]) for obj in page.get("Contents", []))
+            return keys
+
+        return await asyncio.to_thread(list_sync)
+
+    async def move_prefix(self, old_prefix: str, new_prefix: str) -> None:
+        old_prefix = old_prefix.rstrip("/")
+        new_prefix = new_prefix.rstrip("/")
+        for key, _ in await self._list_keys(old_prefix):
+            await self.move(key, new_prefix + key[len(old_prefix):])
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key for key, _ in await self._list_keys(prefix)]
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[i : i + DELETE_BATCH_SIZE]
+            await asyncio.to_thread(
+                self.client.delete_objects,
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+
+    async def list_tree(self, prefix: str) -> tuple[set[str], dict[str, int]]:
+        base = f"{prefix.rstrip('/')}/"
+        keys = await self._list_keys(prefix)
+        if not keys:
+            raise FileNotFoundError(f"Storage prefix {prefix} does not exist.")
+
+        dirs: set[str] = set()
+        files: dict[str, int] = {}
+        for key, size in keys:
+            rel = key[len(base):]
+            if not rel:
+                continue
+            parts = rel.rstrip("/").split("/")
+            for i in range(1, len(parts)):
+                dirs.add("/".join(parts[:i]))
+            if rel.endswith("/"):
+                dirs.add(rel.rstrip("/"))
+            else:
+                files[rel] = size
+        return dirs, files
+
+    async def presigned_url(self, key: str, filename: str, media_type: str, as_attachment: bool = False) -> str | None:
+        if not settings.STORAGE_PRESIGNED_DOWNLOADS:
+            return None
+
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": media_type,
+                "ResponseContentDisposition": content_disposition(filename, as_attachment),
+            },
+            ExpiresIn=settings.STORAGE_PRESIGNED_URL_EXPIRE_SECONDS,
+        )
@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import os
+import shutil
+from typing import AsyncIterator, BinaryIO
+from core.storage.local_storage import LocalStorageBackend
+from core.storage_base import DEFAULT_CHUNK_SIZE, StorageBackend
+
+COMPRESSED_SUFFIX = ".gz"
+
+
+class TieredStorageBackend(StorageBackend):
+    """Hot storage backed by a slower, optionally compressed, cold tier on another local root.
+
+    Objects keep their key on both tiers (compressed cold objects get a ``.gz`` suffix). Streaming reads
+    are served from whichever tier holds the object; random access and local paths require the object
+    to be promoted back to the hot tier first.
+    """
+
+    def __init__(self, hot: StorageBackend, cold_root: str, compress: bool = True) -> None:
+        self.hot = hot
+        self.cold = LocalStorageBackend(cold_root)
+        self.compress = compress
+
+    def _cold_path(self, key: str) -> str | None:
+        path = self.cold.local_path(key)
+        for candidate in (f"{path}{COMPRESSED_SUFFIX}", path):
+            if os.path.isfile(candidate):  # type: ignore
+                return candidate
+        return None
+
+    async def is_cold(self, key: str) -> bool:
+        if await self.hot.exists(key):
+            return False
+        return await asyncio.to_thread(self._cold_path, key) is not None
+
+    async def demote(self, key: str) -> bool:
+        """Move an object from the hot to the cold tier. Returns False if it is not on the hot tier."""
+        hot_path = self.hot.local_path(key)
+        if hot_path is None or not await self.hot.exists(key):
+            return False
+
+        cold_path = self.cold.local_path(key)
+        if self.compress:
+            cold_path = f"{cold_path}{COMPRESSED_SUFFIX}"
+        await asyncio.to_thread(self._copy_sync, hot_path, cold_path, self.compress, False)  # type: ignore
+        await self.hot.delete(key)
+        return True
+
+    async def promote(self, key: str) -> bool:
+        """Move an object from the cold back to the hot tier. Returns False if it is not on the cold tier."""
+        cold_path = await asyncio.to_thread(self._cold_path, key)
+        hot_path = self.hot.local_path(key)
+        if cold_path is None or hot_path is None:
+            return False
+
+        await asyncio.to_thread(self._copy_sync, cold_path, hot_path, False, cold_path.endswith(COMPRESSED_SUFFIX))
+        await asyncio.to_thread(os.remove, cold_path)
+        return True
+
+    @staticmethod
+    def _copy_sync(source: str, target: str, compress: bool, decompress: bool) -> None:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        partial = f"{target}.partial"
+        with open(source, "rb") as raw_src, open(partial, "wb") as raw_dst:
+            src = gzip.GzipFile(fileobj=raw_src, mode="rb") if decompress else raw_src
+            dst = gzip.GzipFile(fileobj=raw_dst, mode="wb") if compress else raw_dst
+            shutil.copyfileobj(src, dst, DEFAULT_CHUNK_SIZE)
+            if compress:
+                dst.close()
+        shutil.copystat(source, partial)
+        os.replace(partial, target)
+
+    async def _ensure_hot(self, key: str) -> None:
+        if not await self.hot.exists(key):
+            await self.promote(key)
+
+    async def _delete_cold(self, key: str) -> None:
+        cold_path = await asyncio.to_thread(self._cold_path, key)
+        if cold_path:
+            await asyncio.to_thread(os.remove, cold_path)
+
+    def local_path(self, key: str) -> str | None:
+        # Cold objects have no servable path until they are promoted; callers then stream them instead.
+        path = self.hot.local_path(key)
+        return path if path is not None and os.path.isfile(path) else None
+
+    async def save(self, key: str, data: BinaryIO) -> None:
+        await self.hot.save(key, data)
+        await self._delete_cold(key)
+
+    async def iter_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        if await self.hot.exists(key):
+            async for chunk in self.hot.iter_chunks(key, chunk_size):
+                yield chunk
+            return
+
+        cold_path = await asyncio.to_thread(self._cold_path, key)
+        if cold_path is None:
+            raise FileNotFoundError(f"Object {key} does not exist.")
+
+        opener = gzip.open if cold_path.endswith(COMPRESSED_SUFFIX) else open
+        file = await asyncio.to_thread(opener, cold_path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(file.read, chunk_size):
+                yield chunk
+        finally:
+            file.close()
+
+    async def read_range(self, key: str, start: int, length: int) -> bytes:
+        await self._ensure_hot(key)
+        return await self.hot.read_range(key, start, length)
+
+    async def exists(self, key: str) -> bool:
+        return await self.hot.exists(key) or await asyncio.to_thread(self._cold_path, key) is not None
+
+    async def size(self, key: str) -> int | None:
+        await self._ensure_hot(key)
+        return await self.hot.size(key)
+
+    async def delete(self, key: str) -> None:
+        await self.hot.delete(key)
+        await self._delete_cold(key)
+
+    async def move(self, old_key: str, new_key: str) -> None:
+        await self._ensure_hot(old_key)
+        await self.hot.move(old_key, new_key)
+
+    async def copy(self, old_key: str, new_key: str) -> None:
+        # Cold objects are copied within the cold tier, so the copy keeps the tier of its source.
+        if await self.hot.exists(old_key):
+            await self.hot.copy(old_key, new_key)
+            return
+
+        cold_path = await asyncio.to_thread(self._cold_path, old_key)
+        if cold_path is None:
+            raise FileNotFoundError(f"Object {old_key} does not exist.")
+        suffix = COMPRESSED_SUFFIX if cold_path.endswith(COMPRESSED_SUFFIX) else ""
+        await self.cold.copy(f"{old_key}{suffix}", f"{new_key}{suffix}")
+
+    async def make_prefix(self, prefix: str, exist_ok: bool = True) -> None:
+        await self.hot.make_prefix(prefix, exist_ok=exist_ok)
+
+    async def move_prefix(self, old_prefix: str, new_prefix: str) -> None:
+        await self.hot.move_prefix(old_prefix, new_prefix)
+        if await asyncio.to_thread(os.path.isdir, self.cold.local_path(old_prefix)):  # type: ignore
+            await self.cold.move_prefix(old_prefix, new_prefix)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await self.hot.delete_prefix(prefix)
+        await self.cold.delete_prefix(prefix)
+
+    async def list_children(self, prefix: str) -> list[str]:
+        return sorted(set(await self.hot.list_children(prefix)) | set(await self.cold.list_children(prefix)))
+
+    async def list_tree(self, prefix: str) -> tuple[set[str], dict[str, int]]:
+        dirs, files = await self.hot.list_tree(prefix)
+        try:
+            cold_dirs, cold_files = await self.cold.list_tree(prefix)
+        except FileNotFoundError:
+            return dirs, files
+
+        dirs |= cold_dirs
+        for rel_path, size in cold_files.items():
+            if self.compress:
+                rel_path = rel_path.removesuffix(COMPRESSED_SUFFIX)
+            files.setdefault(rel_path, size)
+        return dirs, files
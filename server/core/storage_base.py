@@ -0,0 +1,180 @@
+from abc import ABC, abstractmethod
+import asyncio
+from functools import lru_cache
+import time
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Iterable
+import unicodedata
+from urllib.parse import quote
+import uuid
+from core.config import settings
+
+CATEGORIES_PREFIX = "categories"
+TRASH_PREFIX = "trash"
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def category_key(category_id: uuid.UUID | str, folder_path: Any = None, name: str | None = None) -> str:
+    """Build the storage key of a category, a folder (ltree path) or a document inside them."""
+    parts = [CATEGORIES_PREFIX, str(category_id)]
+    if folder_path is not None and str(folder_path):
+        parts.extend(str(folder_path).split("."))
+    if name is not None:
+        parts.append(name)
+    return "/".join(parts)
+
+
+def trash_key(category_id: uuid.UUID | str) -> str:
+    """Build a fresh storage key in a category's trash area, next to the category on the same volume.
+
+    The entry name starts with its creation time, so the trash sweep can tell how old an entry is on any
+    backend.
+    """
+    return "/".join([TRASH_PREFIX, str(category_id), f"{int(time.time())}-{uuid.uuid4().hex}"])
+
+
+def trashed_at(name: str) -> int | None:
+    """Return the creation time encoded in a trash entry name, or None for names without one."""
+    timestamp, separator, _ = name.partition("-")
+    return int(timestamp) if separator and timestamp.isdigit() else None
+
+
+def content_disposition(filename: str, as_attachment: bool = False) -> str:
+    """Build a Content-Disposition header value that is safe for any file name.
+
+    Header values must be latin-1, so the name is sent as an ASCII fallback plus an RFC 5987
+    ``filename*`` parameter carrying the UTF-8 name.
+    """
+    disposition = "attachment" if as_attachment else "inline"
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    fallback = "".join("_" if char in '"\\' or not char.isprintable() else char for char in fallback)
+    return f"{disposition}; filename=\"{fallback}\"; filename*=utf-8''{quote(filename, safe='')}"
+
+
+async def run_concurrently(operations: Iterable[Awaitable[Any]]) -> list[Any]:
+    """Await storage operations concurrently, at most ``BULK_STORAGE_CONCURRENCY`` at a time."""
+    semaphore = asyncio.Semaphore(settings.BULK_STORAGE_CONCURRENCY)
+
+    async def run(operation: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await operation
+
+    return await asyncio.gather(*(run(operation) for operation in operations))
+
+
+class StorageBackend(ABC):
+    """Abstract base class for media storage backends.
+
+    Keys are POSIX-style paths relative to the storage root, e.g. ``categories/<id>/reports/q1.pdf``.
+    """
+
+    @abstractmethod
+    async def save(self, key: str, data: BinaryIO) -> None:
+        """Store the contents of a file object under the given key, replacing any existing object."""
+        pass
+
+    @abstractmethod
+    def iter_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Stream the object stored under the given key."""
+        pass
+
+    @abstractmethod
+    async def read_range(self, key: str, start: int, length: int) -> bytes:
+        """Read up to ``length`` bytes starting at ``start``."""
+        pass
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def size(self, key: str) -> int | None:
+        """Return the object size in bytes, or None if it does not exist."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a single object. Missing objects are ignored."""
+        pass
+
+    @abstractmethod
+    async def move(self, old_key: str, new_key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def copy(self, old_key: str, new_key: str) -> None:
+        """Copy a single object to ``new_key``, as cheaply as the backend allows."""
+        pass
+
+    @abstractmethod
+    async def make_prefix(self, prefix: str, exist_ok: bool = True) -> None:
+        """Create an (empty) directory-like prefix."""
+        pass
+
+    @abstractmethod
+    async def move_prefix(self, old_prefix: str, new_prefix: str) -> None:
+        """Move every object below ``old_prefix`` to ``new_prefix``."""
+        pass
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Delete every object below ``prefix``. Missing prefixes are ignored."""
+        pass
+
+    @abstractmethod
+    async def list_tree(self, prefix: str) -> tuple[set[str], dict[str, int]]:
+        """Return the directories and files (with sizes) below ``prefix``, relative to it."""
+        pass
+
+    async def list_children(self, prefix: str) -> list[str]:
+        """Return the names of the direct children of ``prefix``, or an empty list if it does not exist."""
+        try:
+            dirs, files = await self.list_tree(prefix)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in (*dirs, *files) if "/" not in name)
+
+    async def presigned_url(self, key: str, filename: str, media_type: str, as_attachment: bool = False) -> str | None:
+        """Return a short-lived URL serving the object directly, or None if the backend cannot issue one."""
+        return None
+
+    def local_path(self, key: str) -> str | None:
+        """Return the filesystem path of the object, or None if it is not stored on a local disk."""
+        return None
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    backend = _create_storage_backend()
+
+    if settings.COLD_MEDIA_ROOT and backend.local_path(CATEGORIES_PREFIX) is not None:
+        from core.storage.tiered_storage import TieredStorageBackend
+
+        return TieredStorageBackend(backend, settings.COLD_MEDIA_ROOT, compress=settings.COLD_TIER_COMPRESS)
+
+    return backend
+
+
+def _create_storage_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        from core.storage.s3_storage import S3StorageBackend
+
+        return S3StorageBackend(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            region=settings.S3_REGION,
+        )
+
+    if settings.STORAGE_BACKEND == "local" and settings.MEDIA_VOLUMES:
+        from core.storage.multi_volume_storage import MultiVolumeStorageBackend
+        from core.storage.placement import volume_placement
+
+        return MultiVolumeStorageBackend(volume_placement)
+
+    if settings.STORAGE_BACKEND == "local":
+        from core.storage.local_storage import LocalStorageBackend
+
+        return LocalStorageBackend(settings.MEDIA_ROOT)
+
+    raise ValueError(f"Unsupported storage backend: {settings.STORAGE_BACKEND}")
@@ -1,11 +1,13 @@
+import asyncio
 from contextlib import asynccontextmanager
 import logging
 from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 from core.database import engine, Base, AsyncSessionLocal
-from models import organization, department, role, user, category, folder, document  # noqa: F401
-from routes import auth, category as category_router, organization as organization_router, document as document_router
+from models import organization, department, role, user, category, folder, document, category_placement  # noqa: F401
+from routes import auth, category as category_router, organization as organization_router, document as document_router, search as search_router
 from routes.admin import (
     admin_user,
     admin_organization,
@@ -15,6 +17,7 @@ from routes.admin import (
     admin_category,
     admin_folder,
     admin_document,
+    admin_storage,
 )
 from core.roles import StaticRole
 from schemas.role import RoleCreatePayload
@@ -22,11 +25,18 @@ from core.security import hash_password
 from core.config import settings
 from services.user_service import UserService
 from services.role_service import RoleService
+from services.placement_service import PlacementService
+from services.access_tracker import AccessTracker
+from services.tiering_service import TieringService
+from services.trash_service import TrashService
+from services.deletion_service import DeletionService
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
+        for extension in ("ltree", "pg_trgm"):
+            await conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
         await conn.run_sync(Base.metadata.create_all)
     async with AsyncSessionLocal() as db:
         for role_data in StaticRole.all_roles():
@@ -52,9 +62,28 @@ async def lifespan(app: FastAPI):
                 )
                 await UserService.create_user(db, admin_user)
                 logging.info(f"Admin user '{admin_login}' created.")
-        
+
+        if PlacementService.is_enabled():
+            await PlacementService.load_placements(db)
+
+    background_tasks = [
+        asyncio.create_task(AccessTracker.flush_periodically()),
+        asyncio.create_task(TrashService.collect_periodically()),
+        asyncio.create_task(DeletionService.resume_pending()),
+    ]
+    if PlacementService.is_enabled():
+        background_tasks.append(asyncio.create_task(PlacementService.refresh_placements_periodically()))
+    if TieringService.is_enabled():
+        background_tasks.append(asyncio.create_task(TieringService.run_periodically()))
+
     yield
 
+    for task in background_tasks:
+        task.cancel()
+
+    async with AsyncSessionLocal() as db:
+        await AccessTracker.flush(db)
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -84,6 +113,7 @@ api_router.include_router(auth.router)
 api_router.include_router(category_router.router)
 api_router.include_router(organization_router.router)
 api_router.include_router(document_router.router)
+api_router.include_router(search_router.router)
 
 api_router.include_router(admin_user.router)
 api_router.include_router(admin_organization.router)
@@ -93,5 +123,6 @@ api_router.include_router(admin_user_organization_role.router)
 api_router.include_router(admin_category.router)
 api_router.include_router(admin_folder.router)
 api_router.include_router(admin_document.router)
+api_router.include_router(admin_storage.router)
 
 app.include_router(api_router)
@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Boolean, Column, UUID, String, ForeignKey, Table, DateTime, func
+from sqlalchemy import Boolean, Column, Integer, UUID, String, ForeignKey, Table, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -14,6 +14,7 @@ category_department_visibility = Table(
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (Index("ix_categories_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     name = Column(String(100), nullable=False, index=True)
@@ -21,6 +22,9 @@ class Category(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True, nullable=False)
     is_public = Column(Boolean, default=False, nullable=False)
+    deleting_at = Column(DateTime(timezone=True), nullable=True)
+    # Bumped on every change to the category's folders; workers key their cached folder trees on it.
+    folder_tree_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     organization_id = Column(
         UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
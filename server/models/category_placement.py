@@ -0,0 +1,10 @@
+from sqlalchemy import Column, UUID, String, ForeignKey, DateTime, func
+from core.database import Base
+
+
+class CategoryPlacement(Base):
+    __tablename__ = "category_placements"
+
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    volume = Column(String(100), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import UUID, Column, String, ForeignKey
+from sqlalchemy import UUID, Column, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 from models.category import category_department_visibility
@@ -8,6 +8,7 @@ from models.user import user_departments
 
 class Department(Base):
     __tablename__ = "departments"
+    __table_args__ = (Index("ix_departments_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     name = Column(String(100), nullable=False)
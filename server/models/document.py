@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Index, String, DateTime, ForeignKey, BigInteger, text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Index, String, DateTime, ForeignKey, BigInteger, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from uuid import uuid4
 from enum import Enum
@@ -30,12 +30,29 @@ class SyncStatus(str, Enum):
     SYNCED = "synced"
     MODIFIED = "modified"
 
+class StorageTier(str, Enum):
+    HOT = "hot"
+    COLD = "cold"
+
+SEARCHABLE_MIME_TYPES = {
+    "text/plain",
+    "text/csv",
+    "application/json",
+    "application/pdf",
+}
+
+SEARCH_TEXT_CONFIG = "simple"
+
 class Document(Base):
     __tablename__ = "documents"
     __table_args__ = (
         Index('unique_category_folder_name', 'category_id', 'folder_id', 'name', unique=True),
         Index('unique_category_no_folder_name', 'category_id', 'name', unique=True, 
             postgresql_where=text('folder_id IS NULL')),
+        Index('ix_documents_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_documents_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_documents_folder_name_id', 'category_id', 'folder_id', 'name', 'id'),
+        Index('ix_documents_folder_created_at_id', 'category_id', 'folder_id', 'created_at', 'id'),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
@@ -50,6 +67,21 @@ class Document(Base):
     file_hash = Column(String(64), nullable=True, index=True)
     sync_status = Column(String(50), default=SyncStatus.SYNCED, nullable=False, index=True)
 
+    last_accessed_at = Column(DateTime(timezone=True), nullable=True)
+    storage_tier = Column(String(20), default=StorageTier.HOT, nullable=False, index=True)
+
+    content_text = deferred(Column(Text, nullable=True))
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(name, '')), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(content_text, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
     category_id = Column(UUID(as_uuid=True), 
                        ForeignKey("categories.id", ondelete="CASCADE"), 
                        nullable=True, 
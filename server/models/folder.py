@@ -3,7 +3,7 @@ from enum import Enum
 from core.database import Base
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import LtreeType
-from sqlalchemy import Boolean, Column, UUID, String, ForeignKey, Table, DateTime, func, event
+from sqlalchemy import Boolean, Column, UUID, String, ForeignKey, Table, DateTime, func, event, Index
 
 folder_department_permissions = Table(
     "folder_department_permissions",
@@ -11,6 +11,7 @@ folder_department_permissions = Table(
     Column("folder_id", UUID, ForeignKey("folders.id", ondelete="CASCADE"), primary_key=True),
     Column("department_id", UUID, ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True),
     Column("permission_level", String(50), default="read", nullable=False),
+    Index("ix_folder_department_permissions_department_id", "department_id"),
 )
 
 folder_user_permissions = Table(
@@ -19,6 +20,7 @@ folder_user_permissions = Table(
     Column("folder_id", UUID, ForeignKey("folders.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", UUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
     Column("permission_level", String(50), default="read", nullable=False),
+    Index("ix_folder_user_permissions_user_id", "user_id"),
 )
 
 
@@ -30,6 +32,12 @@ class AccessMode(str, Enum):
 
 class Folder(Base):
     __tablename__ = "folders"
+    __table_args__ = (
+        Index("ix_folders_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_folders_parent_name_id", "category_id", "parent_id", "name", "id"),
+        Index("ix_folders_parent_created_at_id", "category_id", "parent_id", "created_at", "id"),
+        Index("ix_folders_path_gist", "path", postgresql_using="gist"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     name = Column(String(100), nullable=False)
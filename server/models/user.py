@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import UUID, Column, String, Boolean, ForeignKey, DateTime, Table, func
+from sqlalchemy import UUID, Column, String, Boolean, ForeignKey, DateTime, Table, func, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 from models.folder import folder_user_permissions
@@ -22,6 +22,10 @@ user_departments = Table(
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_username_trgm", "username", postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     username = Column(String(50), unique=True, nullable=False)
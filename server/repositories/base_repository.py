@@ -1,6 +1,6 @@
 from typing import Sequence, TypeVar, Type, Any
 import uuid
-from sqlalchemy import Boolean, func, select
+from sqlalchemy import Boolean, func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas.pagination import PaginationResponse
@@ -13,6 +13,21 @@ class NotFoundError(Exception):
 
 
 class BaseRepository:
+    @staticmethod
+    def contains_condition(column: Any, value: str) -> Any:
+        """Case-insensitive substring match. LIKE wildcards in ``value`` are matched literally, and the
+        predicate is served by the column's pg_trgm GIN index for patterns of three or more characters."""
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return column.ilike(f"%{escaped}%", escape="\\")
+
+    @staticmethod
+    def keyset_condition(sort_column: Any, id_column: Any, after: tuple[Any, uuid.UUID], descending: bool = False) -> Any:
+        """Select the rows that follow ``after`` in ``(sort_column, id_column)`` order. The row comparison
+        is answered by a seek on an index ending in ``(sort_column, id)``, however deep the page is."""
+        key = tuple_(sort_column, id_column)
+        bound = tuple_(literal(after[0], sort_column.type), literal(after[1], id_column.type))
+        return key < bound if descending else key > bound
+
     @staticmethod
     async def get_by_id(model: Type[M], db: AsyncSession, entity_id: str | uuid.UUID) -> M | None:
         obj = await db.get(model, entity_id)
@@ -36,9 +51,14 @@ class BaseRepository:
         options: list | None = None,
         ids: list[str] | list[uuid.UUID] | None = None,
         organization_ids: list[str] | list[uuid.UUID] | None = None,
+        conditions: list | None = None,
     ) -> PaginationResponse:
         query = select(model)
         total_query = select(func.count()).select_from(model)
+
+        if conditions:
+            query = query.where(*conditions)
+            total_query = total_query.where(*conditions)
         
         if options:
             query = query.options(*options)
@@ -62,8 +82,9 @@ class BaseRepository:
                     query = query.where(column == bool_value)
                     total_query = total_query.where(column == bool_value)
                 else:
-                    query = query.where(column.ilike(f"%{value}%"))
-                    total_query = total_query.where(column.ilike(f"%{value}%"))
+                    condition = BaseRepository.contains_condition(column, str(value))
+                    query = query.where(condition)
+                    total_query = total_query.where(condition)
 
         if ordering:
             column = getattr(model, ordering)
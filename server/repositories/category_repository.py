@@ -1,9 +1,8 @@
-from typing import Any, Sequence
+from typing import Any, Collection, Sequence
 import uuid
-from sqlalchemy import ColumnElement, Subquery, select, exists, and_, or_, insert, delete
+from sqlalchemy import ColumnElement, select, exists, and_, or_, insert, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.category import Category, category_department_visibility
-from models.user import user_departments
 from models.department import Department
 from sqlalchemy.orm import joinedload
 from schemas.pagination import PaginationParams, PaginationResponse
@@ -12,10 +11,9 @@ from schemas.pagination import PaginationParams, PaginationResponse
 class CategoryRepository:
     @staticmethod
     async def get_categories_for_user_in_organization(
-        db: AsyncSession, user_id: uuid.UUID, organization_id: uuid.UUID
+        db: AsyncSession, category_ids: Collection[uuid.UUID], organization_id: uuid.UUID
     ) -> Sequence[Category]:
-        user_departments_subquery = CategoryRepository._get_user_departments_subquery(user_id)
-        access_filter = CategoryRepository._get_category_access_filter(user_departments_subquery)
+        access_filter = CategoryRepository._get_category_access_filter(category_ids)
 
         stmt = (
             select(Category)
@@ -28,9 +26,8 @@ class CategoryRepository:
         return result.scalars().all()
 
     @staticmethod
-    async def get_category_for_user(db: AsyncSession, category_id: uuid.UUID, user_id: uuid.UUID) -> Category | None:
-        user_departments_subquery = CategoryRepository._get_user_departments_subquery(user_id)
-        access_filter = CategoryRepository._get_category_access_filter(user_departments_subquery)
+    async def get_category_for_user(db: AsyncSession, category_id: uuid.UUID, category_ids: Collection[uuid.UUID]) -> Category | None:
+        access_filter = CategoryRepository._get_category_access_filter(category_ids)
 
         stmt = (
             select(Category).where(Category.id == category_id).where(Category.is_active.is_(True)).where(access_filter)
@@ -120,26 +117,12 @@ class CategoryRepository:
         return PaginationResponse(total=total, items=items)
 
     @staticmethod
-    def _get_user_departments_subquery(user_id: uuid.UUID) -> Subquery:
-        return select(user_departments.c.department_id).where(user_departments.c.user_id == user_id).subquery()
-
-    @staticmethod
-    def _get_category_access_filter(user_departments_subquery) -> ColumnElement[bool]:
-        return or_(
-            exists(
-                select(1)
-                .select_from(category_department_visibility)
-                .where(
-                    and_(
-                        category_department_visibility.c.category_id == Category.id,
-                        category_department_visibility.c.department_id.in_(
-                            select(user_departments_subquery.c.department_id)
-                        ),
-                    )
-                )
-            ),
-            Category.is_public.is_(True),
-        )
+    def _get_category_access_filter(category_ids: Collection[uuid.UUID]) -> ColumnElement[bool]:
+        """Categories are visible when they are public or shared with one of the user's departments,
+        whose ids come from the user's cached effective access."""
+        if not category_ids:
+            return Category.is_public.is_(True)
+        return or_(Category.id.in_(category_ids), Category.is_public.is_(True))
         
     @staticmethod
     def _build_departments_query(category_id: uuid.UUID, organization_id: uuid.UUID):
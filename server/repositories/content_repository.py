@@ -0,0 +1,82 @@
+from typing import Any, Collection, Optional, Sequence
+import uuid
+from sqlalchemy import Boolean, Integer, String, and_, cast, func, literal_column, null, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.document import Document
+from models.folder import Folder
+from repositories.base_repository import BaseRepository
+from repositories.folder_repository import FolderRepository
+
+LISTING_ORDERINGS = ("name", "created_at")
+
+
+class ContentRepository:
+    @staticmethod
+    async def get_folder_content(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        folder_id: uuid.UUID | None,
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+        skip: int = 0,
+        limit: int = 20,
+        filter_field: Optional[str] = None,
+        filter_value: Optional[str] = None,
+        ordering: Optional[str] = None,
+        ordering_desc: bool = False,
+    ) -> tuple[Sequence[Any], int]:
+        """List the accessible subfolders of a folder followed by its documents in a single query.
+
+        Returns one page of ``(kind, id, name, is_private, mime_type)`` rows together with the number of
+        accessible items, which is computed by a window over the same scan.
+        """
+        folder_conditions = [Folder.category_id == category_id, Folder.parent_id == folder_id]
+        document_conditions = [Document.category_id == category_id, Document.folder_id == folder_id]
+
+        if filter_field == "name" and filter_value:
+            folder_conditions.append(BaseRepository.contains_condition(Folder.name, filter_value))
+            document_conditions.append(BaseRepository.contains_condition(Document.name, filter_value))
+        elif filter_field == "mime_type" and filter_value:
+            document_conditions.append(BaseRepository.contains_condition(Document.mime_type, filter_value))
+
+        if not is_superuser:
+            folder_conditions.append(or_(*FolderRepository._build_permission_conditions(granted_folder_ids)))
+
+        folders = select(
+            literal_column("'folder'", String).label("kind"),
+            literal_column("0", Integer).label("kind_order"),
+            Folder.id.label("id"),
+            Folder.name.label("name"),
+            Folder.created_at.label("created_at"),
+            Folder.is_private.label("is_private"),
+            cast(null(), String).label("mime_type"),
+        ).where(and_(*folder_conditions))
+        documents = select(
+            literal_column("'document'", String).label("kind"),
+            literal_column("1", Integer).label("kind_order"),
+            Document.id.label("id"),
+            Document.name.label("name"),
+            Document.created_at.label("created_at"),
+            cast(null(), Boolean).label("is_private"),
+            Document.mime_type.label("mime_type"),
+        ).where(and_(*document_conditions))
+        content = union_all(folders, documents).subquery("content")
+
+        sort_column = content.c[ordering if ordering in LISTING_ORDERINGS else "name"]
+        query = (
+            select(content, func.count().over().label("total"))
+            .order_by(content.c.kind_order, sort_column.desc() if ordering_desc else sort_column, content.c.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        rows = result.all()
+
+        if rows:
+            return rows, rows[0].total
+        if skip == 0:
+            return rows, 0
+
+        # A page past the end has no row to carry the window count, so count separately.
+        count_result = await db.execute(select(func.count()).select_from(content))
+        return rows, count_result.scalar() or 0
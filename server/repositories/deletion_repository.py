@@ -0,0 +1,102 @@
+from typing import Any, Sequence
+import uuid
+from sqlalchemy import ColumnElement, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.category import Category
+from models.department import Department
+from models.document import Document
+from models.folder import Folder
+from models.organization import Organization
+
+
+class DeletionRepository:
+    @staticmethod
+    async def mark_category_deleting(db: AsyncSession, category_id: uuid.UUID) -> None:
+        await db.execute(
+            update(Category)
+            .where(Category.id == category_id)
+            .values(deleting_at=func.now(), is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def mark_organization_deleting(db: AsyncSession, organization_id: uuid.UUID) -> None:
+        await db.execute(
+            update(Organization)
+            .where(Organization.id == organization_id)
+            .values(deleting_at=func.now(), is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(Category)
+            .where(Category.organization_id == organization_id, Category.deleting_at.is_(None))
+            .values(deleting_at=func.now(), is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def get_pending_deletions(db: AsyncSession) -> tuple[Sequence[Any], Sequence[Any]]:
+        """Return the ``(id,)`` rows of organizations and the ``(id, organization_id)`` rows of categories
+        still marked as deleting, leaving out categories whose organization is being deleted as a whole."""
+        organizations = await db.execute(select(Organization.id).where(Organization.deleting_at.is_not(None)))
+        categories = await db.execute(
+            select(Category.id, Category.organization_id)
+            .join(Organization, Organization.id == Category.organization_id)
+            .where(Category.deleting_at.is_not(None), Organization.deleting_at.is_(None))
+        )
+        return organizations.all(), categories.all()
+
+    @staticmethod
+    async def get_category_progress(db: AsyncSession, category_id: uuid.UUID) -> Any:
+        """Return the ``(organization_id, documents, folders)`` left of a category marked as deleting, or
+        None if the category is gone or not being deleted."""
+        result = await db.execute(
+            select(
+                Category.organization_id,
+                select(func.count()).select_from(Document).where(Document.category_id == category_id).scalar_subquery(),
+                select(func.count()).select_from(Folder).where(Folder.category_id == category_id).scalar_subquery(),
+            ).where(Category.id == category_id, Category.deleting_at.is_not(None))
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    async def get_organization_progress(db: AsyncSession, organization_id: uuid.UUID) -> Any:
+        """Return the ``(categories, documents, folders, departments)`` left of an organization marked as
+        deleting, or None if the organization is gone or not being deleted."""
+        category_ids = select(Category.id).where(Category.organization_id == organization_id)
+        result = await db.execute(
+            select(
+                select(func.count()).select_from(Category).where(Category.organization_id == organization_id).scalar_subquery(),
+                select(func.count()).select_from(Document).where(Document.category_id.in_(category_ids)).scalar_subquery(),
+                select(func.count()).select_from(Folder).where(Folder.category_id.in_(category_ids)).scalar_subquery(),
+                select(func.count()).select_from(Department).where(Department.organization_id == organization_id).scalar_subquery(),
+            ).where(Organization.id == organization_id, Organization.deleting_at.is_not(None))
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    async def get_category_ids(db: AsyncSession, organization_id: uuid.UUID) -> Sequence[uuid.UUID]:
+        result = await db.execute(select(Category.id).where(Category.organization_id == organization_id))
+        return result.scalars().all()
+
+    @staticmethod
+    async def delete_batch(
+        db: AsyncSession, model: Any, condition: ColumnElement[bool], limit: int, order_by: Any = None
+    ) -> int:
+        """Delete up to ``limit`` rows matching ``condition`` in their own transaction and return how many
+        were deleted. Rows locked by a concurrent deleter are skipped rather than waited for."""
+        batch = select(model.id).where(condition).limit(limit).with_for_update(skip_locked=True)
+        if order_by is not None:
+            batch = batch.order_by(order_by)
+
+        try:
+            result = await db.execute(
+                delete(model).where(model.id.in_(batch.scalar_subquery())).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return result.rowcount  # type: ignore
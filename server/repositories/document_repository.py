@@ -1,14 +1,94 @@
-from typing import Optional, Sequence, Tuple
+from typing import Collection, Optional, Sequence, Tuple
 import uuid
-from sqlalchemy import Select, and_, func, literal, or_
+from sqlalchemy import Select, and_, cast, delete, func, insert, literal, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from models.document import Document
-from models.user import User
+from repositories.base_repository import BaseRepository
+from models.document import SEARCH_TEXT_CONFIG, Document, StorageTier
+
+
+# Columns carried over when a document row is copied; id, folder and name are set by the copy itself.
+DOCUMENT_COPY_COLUMNS = (
+    Document.category_id,
+    Document.name,
+    Document.mime_type,
+    Document.file_size,
+    Document.file_hash,
+    Document.sync_status,
+    Document.storage_tier,
+    Document.content_text,
+)
 
 
 class DocumentRepository:
+    @staticmethod
+    async def get_by_ids_with_category(db: AsyncSession, document_ids: Collection[uuid.UUID]) -> Sequence[Document]:
+        result = await db.execute(select(Document).where(Document.id.in_(document_ids)).options(selectinload(Document.category)))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_taken_names(
+        db: AsyncSession, folder_id: uuid.UUID | None, names: Collection[tuple[uuid.UUID, str]]
+    ) -> set[tuple[uuid.UUID, str]]:
+        """Return the ``(category_id, name)`` pairs out of ``names`` already used by a document in the folder
+        (or in the category root when ``folder_id`` is None)."""
+        if not names:
+            return set()
+
+        folder_condition = Document.folder_id == folder_id if folder_id else Document.folder_id.is_(None)
+        result = await db.execute(
+            select(Document.category_id, Document.name).where(folder_condition, tuple_(Document.category_id, Document.name).in_(names))
+        )
+        return {(category_id, name) for category_id, name in result.all()}
+
+    @staticmethod
+    async def move_to_folder(db: AsyncSession, document_ids: Collection[uuid.UUID], folder_id: uuid.UUID | None) -> None:
+        try:
+            await db.execute(
+                update(Document)
+                .where(Document.id.in_(document_ids))
+                # Moving a file through the tiered backend promotes it to the hot tier.
+                .values(folder_id=folder_id, storage_tier=StorageTier.HOT)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    @staticmethod
+    async def copy_document(db: AsyncSession, document_id: uuid.UUID, folder_id: uuid.UUID | None, name: str) -> uuid.UUID:
+        """Copy a document row, including its extracted text, with a single INSERT ... SELECT."""
+        copied_columns = [column for column in DOCUMENT_COPY_COLUMNS if column is not Document.name]
+        try:
+            result = await db.execute(
+                insert(Document)
+                .from_select(
+                    [*copied_columns, Document.id, Document.folder_id, Document.name],
+                    select(*copied_columns, func.gen_random_uuid(), literal(folder_id, Document.folder_id.type), literal(name, Document.name.type)).where(
+                        Document.id == document_id
+                    ),
+                )
+                .returning(Document.id)
+            )
+            copy_id = result.scalar_one()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return copy_id
+
+    @staticmethod
+    async def delete_by_ids(db: AsyncSession, document_ids: Collection[uuid.UUID]) -> None:
+        try:
+            await db.execute(delete(Document).where(Document.id.in_(document_ids)).execution_options(synchronize_session=False))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
     @staticmethod
     async def get_by_id_with_category(db: AsyncSession, document_id: uuid.UUID) -> Optional[Document]:
         result = await db.execute(select(Document).where(Document.id == document_id).options(selectinload(Document.category)))
@@ -33,9 +113,9 @@ class DocumentRepository:
 
         if filter_field and filter_value:
             if filter_field == "name":
-                query = query.where(Document.name.ilike(f"%{filter_value}%"))
+                query = query.where(BaseRepository.contains_condition(Document.name, filter_value))
             elif filter_field == "mime_type":
-                query = query.where(Document.mime_type.ilike(f"%{filter_value}%"))
+                query = query.where(BaseRepository.contains_condition(Document.mime_type, filter_value))
 
         result = await db.execute(query)
         return result.scalar() or 0
@@ -61,9 +141,9 @@ class DocumentRepository:
 
         if filter_field and filter_value:
             if filter_field == "name":
-                query = query.where(Document.name.ilike(f"%{filter_value}%"))
+                query = query.where(BaseRepository.contains_condition(Document.name, filter_value))
             elif filter_field == "mime_type":
-                query = query.where(Document.mime_type.ilike(f"%{filter_value}%"))
+                query = query.where(BaseRepository.contains_condition(Document.mime_type, filter_value))
 
         if ordering:
             order_column = getattr(Document, ordering, Document.name)
@@ -79,35 +159,41 @@ class DocumentRepository:
         return result.scalars().all()
 
     @staticmethod
-    async def is_user_permitted_to_view_document(db: AsyncSession, user: User, document_id: uuid.UUID) -> bool:
-        from repositories.folder_repository import FolderRepository
-
-        document = await DocumentRepository.get_by_id_with_category(db, document_id)
-        if not document:
-            return False
-
-        user_org_ids = [str(org.id) for org in user.additional_organizations]
-        if str(document.category.organization_id) not in user_org_ids:
-            return False
+    async def get_documents_by_folder_after(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        folder_id: uuid.UUID | None,
+        after: tuple | None = None,
+        limit: int = 20,
+        filter_field: Optional[str] = None,
+        filter_value: Optional[str] = None,
+        ordering: str = "name",
+        ordering_desc: bool = False,
+    ) -> Sequence[Document]:
+        sort_column = getattr(Document, ordering)
+        query = select(Document).where(Document.category_id == category_id, Document.folder_id == folder_id)
 
-        if document.folder_id is not None:
-            folder = await FolderRepository.get_by_id_with_category(db, document.folder_id)  # type: ignore
+        if filter_field == "name" and filter_value:
+            query = query.where(BaseRepository.contains_condition(Document.name, filter_value))
+        elif filter_field == "mime_type" and filter_value:
+            query = query.where(BaseRepository.contains_condition(Document.mime_type, filter_value))
 
-            if folder and bool(folder.is_private):
-                from services.folder_service import FolderService
+        if after is not None:
+            query = query.where(BaseRepository.keyset_condition(sort_column, Document.id, after, ordering_desc))
 
-                has_access = await FolderService.user_has_access_to_folder(db, folder.id, user.id)  # type: ignore
-                if not has_access:
-                    return False
+        if ordering_desc:
+            query = query.order_by(sort_column.desc(), Document.id.desc())
+        else:
+            query = query.order_by(sort_column, Document.id)
 
-        return True
+        result = await db.execute(query.limit(limit))
+        return result.scalars().all()
 
     @staticmethod
     async def search_documents_recursive_with_permissions(
         db: AsyncSession,
         category_id: uuid.UUID,
-        user_id: uuid.UUID,
-        user_department_ids: list[uuid.UUID],
+        granted_folder_ids: Collection[uuid.UUID],
         is_superuser: bool,
         search_query: str,
         parent_folder_id: uuid.UUID | None = None,
@@ -120,7 +206,7 @@ class DocumentRepository:
         base_conditions = await DocumentRepository._add_recursive_conditions(db, base_conditions, category_id, parent_folder_id)
 
         if not is_superuser:
-            permission_conditions = DocumentRepository._build_permission_conditions(user_id, user_department_ids)
+            permission_conditions = DocumentRepository._build_permission_conditions(granted_folder_ids)
             base_conditions.append(or_(*permission_conditions))
 
         total = await DocumentRepository._count_documents(db, base_conditions)
@@ -129,11 +215,60 @@ class DocumentRepository:
 
         return result.scalars().all(), total
 
+    @staticmethod
+    async def search_documents_by_content_with_permissions(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+        search_query: str,
+        parent_folder_id: uuid.UUID | None = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[Sequence[tuple[Document, str | None]], int]:
+        """Full-text search over document names and extracted contents, ranked and with highlighted snippets."""
+        text_config = cast(SEARCH_TEXT_CONFIG, REGCONFIG)
+        ts_query = func.websearch_to_tsquery(text_config, search_query)
+
+        base_conditions = [Document.category_id == category_id, Document.search_vector.op("@@")(ts_query)]
+        base_conditions = await DocumentRepository._add_recursive_conditions(db, base_conditions, category_id, parent_folder_id)
+
+        if not is_superuser:
+            permission_conditions = DocumentRepository._build_permission_conditions(granted_folder_ids)
+            base_conditions.append(or_(*permission_conditions))
+
+        total = await DocumentRepository._count_documents(db, base_conditions)
+
+        rank = func.ts_rank_cd(Document.search_vector, ts_query).label("rank")
+        ranked = (
+            select(Document.id, rank)
+            .where(and_(*base_conditions))
+            .order_by(rank.desc(), Document.name)
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        # Headlines are expensive, so they are only computed for the rows of the requested page.
+        snippet = func.ts_headline(
+            text_config,
+            Document.content_text,
+            ts_query,
+            "MaxFragments=2, MinWords=5, MaxWords=20, StartSel=<mark>, StopSel=</mark>",
+        ).label("snippet")
+        query = (
+            select(Document, snippet)
+            .join(ranked, ranked.c.id == Document.id)
+            .order_by(ranked.c.rank.desc(), Document.name)
+        )
+        result = await db.execute(query)
+
+        return [(row[0], row[1]) for row in result.all()], total
+
     @staticmethod
     def _build_base_conditions(category_id: uuid.UUID, search_query: str) -> list:
         conditions = [Document.category_id == category_id]
         if search_query:
-            conditions.append(Document.name.ilike(f"%{search_query}%"))
+            conditions.append(BaseRepository.contains_condition(Document.name, search_query))
         return conditions
 
     @staticmethod
@@ -149,41 +284,20 @@ class DocumentRepository:
         return base_conditions
 
     @staticmethod
-    def _build_permission_conditions(user_id: uuid.UUID, user_department_ids: list[uuid.UUID]) -> list:
-        from models.folder import Folder, folder_user_permissions, folder_department_permissions
+    def _build_permission_conditions(granted_folder_ids: Collection[uuid.UUID]) -> list:
+        from models.folder import Folder
+        from repositories.folder_repository import FolderRepository
 
-        folder_not_private = (
+        folder_visible = (
             select(literal(1))
             .select_from(Folder)
-            .where(Folder.id == Document.folder_id, Folder.is_private == False)  # noqa: E712
+            .where(Folder.id == Document.folder_id, or_(*FolderRepository._build_permission_conditions(granted_folder_ids)))
             .exists()
         )
-        user_assigned_to_folder = (
-            select(literal(1))
-            .select_from(folder_user_permissions)
-            .where(
-                folder_user_permissions.c.folder_id == Document.folder_id,
-                folder_user_permissions.c.user_id == user_id,
-            )
-            .exists()
-        )
-        permission_conditions = [
+        return [
             Document.folder_id == None,  # noqa: E711
-            folder_not_private,
-            user_assigned_to_folder,
+            folder_visible,
         ]
-        if user_department_ids:
-            dept_assigned_to_folder = (
-                select(literal(1))
-                .select_from(folder_department_permissions)
-                .where(
-                    folder_department_permissions.c.folder_id == Document.folder_id,
-                    folder_department_permissions.c.department_id.in_(user_department_ids),
-                )
-                .exists()
-            )
-            permission_conditions.append(dept_assigned_to_folder)
-        return permission_conditions
 
     @staticmethod
     async def _count_documents(db: AsyncSession, conditions: list) -> int:
@@ -1,13 +1,18 @@
-from typing import Optional, Sequence
+from typing import Any, Collection, Optional, Sequence
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy_utils import Ltree
+from sqlalchemy_utils import Ltree, LtreeType
 from sqlalchemy.future import select
-from sqlalchemy import delete, exists, func, or_, and_, literal
-from sqlalchemy.orm import selectinload
+from sqlalchemy import UUID, case, column, delete, exists, func, insert, or_, and_, literal, update, values
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from repositories.base_repository import BaseRepository
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from models.folder import Folder, folder_department_permissions, folder_user_permissions
+from models.category import Category
 from models.department import Department
+from models.document import Document
+from repositories.document_repository import DOCUMENT_COPY_COLUMNS
 from models.organization import Organization
 from schemas.pagination import PaginationParams, PaginationResponse
 from schemas.admin import DepartmentWithAssignment
@@ -21,6 +26,18 @@ class FolderRepository:
         folder_result = await db.execute(folder_query)
         return folder_result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_by_ids_with_category(db: AsyncSession, folder_ids: Collection[uuid.UUID]) -> Sequence[Folder]:
+        result = await db.execute(select(Folder).options(selectinload(Folder.category)).where(Folder.id.in_(folder_ids)))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_paths(db: AsyncSession, folder_ids: Collection[uuid.UUID]) -> dict[uuid.UUID, str]:
+        if not folder_ids:
+            return {}
+        result = await db.execute(select(Folder.id, Folder.path).where(Folder.id.in_(folder_ids)))
+        return {folder_id: str(path) for folder_id, path in result.all()}
+
     @staticmethod
     async def get_by_path(db: AsyncSession, category_id: uuid.UUID, path: str) -> Optional[Folder]:
         ltree_path = Ltree(path) if path else None
@@ -37,6 +54,7 @@ class FolderRepository:
         folder = await FolderRepository.get_by_path(db, category_id, path)
         if folder:
             await db.delete(folder)
+            await FolderRepository.bump_tree_version(db, [category_id])
             await db.commit()
 
     @staticmethod
@@ -58,7 +76,7 @@ class FolderRepository:
 
         if filter_field and filter_value:
             if filter_field == "name":
-                query = query.where(Folder.name.ilike(f"%{filter_value}%"))
+                query = query.where(BaseRepository.contains_condition(Folder.name, filter_value))
 
         result = await db.execute(query)
         return result.scalar() or 0
@@ -84,7 +102,7 @@ class FolderRepository:
 
         if filter_field and filter_value:
             if filter_field == "name":
-                query = query.where(Folder.name.ilike(f"%{filter_value}%"))
+                query = query.where(BaseRepository.contains_condition(Folder.name, filter_value))
 
         if ordering:
             order_column = getattr(Folder, ordering, Folder.name)
@@ -99,6 +117,259 @@ class FolderRepository:
         result = await db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    async def get_folders_by_parent_after(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        parent_id: uuid.UUID | None,
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+        after: tuple | None = None,
+        limit: int = 20,
+        filter_field: Optional[str] = None,
+        filter_value: Optional[str] = None,
+        ordering: str = "name",
+        ordering_desc: bool = False,
+    ) -> Sequence[Folder]:
+        sort_column = getattr(Folder, ordering)
+        query = select(Folder).where(Folder.category_id == category_id, Folder.parent_id == parent_id)
+
+        if filter_field == "name" and filter_value:
+            query = query.where(BaseRepository.contains_condition(Folder.name, filter_value))
+
+        if not is_superuser:
+            query = query.where(or_(*FolderRepository._build_permission_conditions(granted_folder_ids)))
+
+        if after is not None:
+            query = query.where(BaseRepository.keyset_condition(sort_column, Folder.id, after, ordering_desc))
+
+        if ordering_desc:
+            query = query.order_by(sort_column.desc(), Folder.id.desc())
+        else:
+            query = query.order_by(sort_column, Folder.id)
+
+        result = await db.execute(query.limit(limit))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_tree_version(db: AsyncSession, category_id: uuid.UUID) -> int | None:
+        result = await db.execute(select(Category.folder_tree_version).where(Category.id == category_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def bump_tree_version(db: AsyncSession, category_ids: Collection[uuid.UUID]) -> None:
+        """Bump the folder tree version of the given categories. Run it in the transaction that changes their
+        folders, so no worker can cache the new rows under the old version."""
+        await db.execute(
+            update(Category)
+            .where(Category.id.in_(category_ids))
+            .values(folder_tree_version=Category.folder_tree_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def create(db: AsyncSession, folder: Folder) -> Folder:
+        try:
+            db.add(folder)
+            await db.flush()
+            await FolderRepository.bump_tree_version(db, [folder.category_id])  # type: ignore
+            await db.commit()
+            await db.refresh(folder)
+            return folder
+        except Exception:
+            await db.rollback()
+            raise
+
+    @staticmethod
+    async def get_tree_rows(db: AsyncSession, category_id: uuid.UUID) -> Sequence:
+        result = await db.execute(
+            select(Folder.id, Folder.name, Folder.parent_id, Folder.path, Folder.is_private)
+            .where(Folder.category_id == category_id)
+            .order_by(Folder.name, Folder.id)
+        )
+        return result.all()
+
+    @staticmethod
+    async def get_subtree_with_counts(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        root: Folder | None,
+        depth: int,
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+    ) -> Sequence:
+        """Return the visible folders up to ``depth`` levels below ``root`` (the category root when ``None``)
+        with the number of visible child folders and of documents in each, as one grouped query."""
+        root_level = len(str(root.path).split(".")) if root is not None else 0
+        permission_conditions = [] if is_superuser else [or_(*FolderRepository._build_permission_conditions(granted_folder_ids))]
+
+        node_conditions = [
+            Folder.category_id == category_id,
+            func.nlevel(Folder.path).between(root_level + 1, root_level + depth),
+            *permission_conditions,
+        ]
+        if root is not None:
+            node_conditions.append(Folder.path.descendant_of(root.path))
+        nodes = select(Folder.id, Folder.name, Folder.parent_id, Folder.is_private).where(*node_conditions).cte("nodes")
+
+        child_counts = (
+            select(Folder.parent_id.label("folder_id"), func.count().label("child_folder_count"))
+            .where(Folder.parent_id.in_(select(nodes.c.id)), *permission_conditions)
+            .group_by(Folder.parent_id)
+            .subquery("child_counts")
+        )
+        document_counts = (
+            select(Document.folder_id.label("folder_id"), func.count().label("document_count"))
+            .where(Document.folder_id.in_(select(nodes.c.id)))
+            .group_by(Document.folder_id)
+            .subquery("document_counts")
+        )
+
+        query = (
+            select(
+                nodes,
+                func.coalesce(child_counts.c.child_folder_count, 0).label("child_folder_count"),
+                func.coalesce(document_counts.c.document_count, 0).label("document_count"),
+            )
+            .outerjoin(child_counts, child_counts.c.folder_id == nodes.c.id)
+            .outerjoin(document_counts, document_counts.c.folder_id == nodes.c.id)
+            .order_by(nodes.c.name, nodes.c.id)
+        )
+        result = await db.execute(query)
+        return result.all()
+
+    @staticmethod
+    async def rewrite_subtree(
+        db: AsyncSession, folder: Folder, new_path: str, make_private: bool = False, **changes: Any
+    ) -> int:
+        """Move a folder's whole subtree to ``new_path`` with a single UPDATE, committed together with the
+        ``changes`` (e.g. a new name or parent) to the folder itself. With ``make_private`` the same UPDATE
+        marks the whole subtree private. Returns the number of rewritten folders."""
+        old_path = Ltree(str(folder.path))
+        new_prefix = literal(Ltree(new_path), LtreeType)
+        old_level = len(old_path.path.split("."))
+
+        values: dict[str, Any] = {
+            "path": case(
+                (Folder.path == old_path, new_prefix),
+                else_=new_prefix.op("||")(func.subpath(Folder.path, old_level)),
+            )
+        }
+        if make_private:
+            values["is_private"] = True
+
+        try:
+            result = await db.execute(
+                update(Folder)
+                .where(Folder.category_id == folder.category_id, Folder.path.descendant_of(old_path))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            for field, value in changes.items():
+                setattr(folder, field, value)
+            await FolderRepository.bump_tree_version(db, [folder.category_id])  # type: ignore
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        set_committed_value(folder, "path", Ltree(new_path))
+        if make_private:
+            set_committed_value(folder, "is_private", True)
+        return result.rowcount  # type: ignore
+
+    @staticmethod
+    async def get_subtree(db: AsyncSession, folder: Folder) -> Sequence[Any]:
+        result = await db.execute(
+            select(Folder.id, Folder.name, Folder.path, Folder.parent_id, Folder.is_private, Folder.access_mode)
+            .where(Folder.category_id == folder.category_id, Folder.path.descendant_of(Ltree(str(folder.path))))
+            .order_by(Folder.path)
+        )
+        return result.all()
+
+    @staticmethod
+    async def get_subtree_document_paths(db: AsyncSession, folder: Folder) -> Sequence[Any]:
+        """Return the ``(folder path, name)`` of every document in a folder's subtree."""
+        result = await db.execute(
+            select(Folder.path, Document.name)
+            .join(Document, Document.folder_id == Folder.id)
+            .where(Folder.category_id == folder.category_id, Folder.path.descendant_of(Ltree(str(folder.path))))
+        )
+        return result.all()
+
+    @staticmethod
+    async def copy_subtree(db: AsyncSession, folder_rows: list[dict[str, Any]], folder_copies: dict[uuid.UUID, uuid.UUID]) -> int:
+        """Insert the copied folders with one bulk INSERT, then copy the documents of every source folder in
+        ``folder_copies`` into its copy with one INSERT ... SELECT, in a single transaction. Returns the
+        number of copied documents."""
+        copies = values(
+            column("source_id", UUID(as_uuid=True)), column("copy_id", UUID(as_uuid=True)), name="folder_copies"
+        ).data(list(folder_copies.items()))
+
+        try:
+            await db.execute(insert(Folder), folder_rows)
+            result = await db.execute(
+                insert(Document).from_select(
+                    [*DOCUMENT_COPY_COLUMNS, Document.id, Document.folder_id],
+                    select(*DOCUMENT_COPY_COLUMNS, func.gen_random_uuid(), copies.c.copy_id).join(
+                        copies, copies.c.source_id == Document.folder_id
+                    ),
+                )
+            )
+            await FolderRepository.bump_tree_version(db, {row["category_id"] for row in folder_rows})
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return result.rowcount  # type: ignore
+
+    @staticmethod
+    async def delete_subtree(db: AsyncSession, folder: Folder) -> int:
+        """Delete a folder and its whole subtree with a single DELETE. Documents and permission grants are
+        removed by ``ON DELETE CASCADE``. Returns the number of deleted folders."""
+        try:
+            result = await db.execute(
+                delete(Folder)
+                .where(Folder.category_id == folder.category_id, Folder.path.descendant_of(Ltree(str(folder.path))))
+                .execution_options(synchronize_session=False)
+            )
+            await FolderRepository.bump_tree_version(db, [folder.category_id])  # type: ignore
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return result.rowcount  # type: ignore
+
+    @staticmethod
+    async def set_privacy(db: AsyncSession, folders: Sequence[Folder], is_private: bool, include_descendants: bool = True) -> int:
+        """Set the privacy flag of the given folders, and optionally of their whole subtrees, with a single
+        UPDATE. Returns the number of folders whose flag actually changed."""
+        if include_descendants:
+            targets = [
+                and_(Folder.category_id == folder.category_id, Folder.path.descendant_of(Ltree(str(folder.path))))
+                for folder in folders
+            ]
+        else:
+            targets = [Folder.id.in_([folder.id for folder in folders])]
+
+        try:
+            result = await db.execute(
+                update(Folder)
+                .where(or_(*targets), Folder.is_private != is_private)
+                .values(is_private=is_private)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:  # type: ignore
+                await FolderRepository.bump_tree_version(db, {folder.category_id for folder in folders})  # type: ignore
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        for folder in folders:
+            set_committed_value(folder, "is_private", is_private)
+        return result.rowcount  # type: ignore
+
     @staticmethod
     async def is_department_assigned(db: AsyncSession, folder_id: uuid.UUID, department_id: uuid.UUID) -> bool:
         result = await db.execute(select(Folder).where(Folder.id == folder_id, Folder.allowed_departments.any(Department.id == department_id)))
@@ -116,15 +387,6 @@ class FolderRepository:
             .values(folder_id=folder.id, department_id=department.id)
             .on_conflict_do_nothing(constraint="folder_department_permissions_pkey")
         )
-        child_folders = await FolderRepository.get_all_child_folders(db, folder.id)  # type: ignore
-
-        if child_folders:
-            await db.execute(
-                pg_insert(folder_department_permissions)
-                .values([{"folder_id": child_folder.id, "department_id": department.id} for child_folder in child_folders])
-                .on_conflict_do_nothing(constraint="folder_department_permissions_pkey")
-            )
-
         await db.commit()
 
     @staticmethod
@@ -136,16 +398,6 @@ class FolderRepository:
             )
         )
 
-        child_folders = await FolderRepository.get_all_child_folders(db, folder.id)  # type: ignore
-
-        if child_folders:
-            await db.execute(
-                delete(folder_department_permissions).where(
-                    folder_department_permissions.c.folder_id.in_([child_folder.id for child_folder in child_folders]),
-                    folder_department_permissions.c.department_id == department.id,
-                )
-            )
-
         await db.commit()
 
     @staticmethod
@@ -163,15 +415,6 @@ class FolderRepository:
             .values(folder_id=folder.id, user_id=user.id)
             .on_conflict_do_nothing(constraint="folder_user_permissions_pkey")
         )
-        child_folders = await FolderRepository.get_all_child_folders(db, folder.id)  # type: ignore
-
-        if child_folders:
-            await db.execute(
-                pg_insert(folder_user_permissions)
-                .values([{"folder_id": child_folder.id, "user_id": user.id} for child_folder in child_folders])
-                .on_conflict_do_nothing(constraint="folder_user_permissions_pkey")
-            )
-
         await db.commit()
 
     @staticmethod
@@ -183,16 +426,6 @@ class FolderRepository:
             )
         )
 
-        child_folders = await FolderRepository.get_all_child_folders(db, folder.id)  # type: ignore
-
-        if child_folders:
-            await db.execute(
-                delete(folder_user_permissions).where(
-                    folder_user_permissions.c.folder_id.in_([child_folder.id for child_folder in child_folders]),
-                    folder_user_permissions.c.user_id == user.id,
-                )
-            )
-
         await db.commit()
 
     @staticmethod
@@ -332,17 +565,6 @@ class FolderRepository:
             user_schemas.append(user_dict)
         return user_schemas
 
-    @staticmethod
-    async def get_all_child_folders(db: AsyncSession, folder_id: uuid.UUID) -> Sequence[Folder]:
-        folder = await FolderRepository.get_by_id_with_category(db, folder_id)
-
-        if not folder:
-            return []
-
-        query = select(Folder).where(Folder.category_id == folder.category_id, Folder.path.descendant_of(folder.path))
-        result = await db.execute(query)
-        return result.scalars().all()
-
     @staticmethod
     async def get_folder_hierarchy(db: AsyncSession, folder_id: uuid.UUID) -> Sequence[Folder]:
         folder = await FolderRepository.get_by_id_with_category(db, folder_id)
@@ -370,8 +592,7 @@ class FolderRepository:
     async def search_folders_recursive_with_permissions(
         db: AsyncSession,
         category_id: uuid.UUID,
-        user_id: uuid.UUID,
-        user_department_ids: list[str],
+        granted_folder_ids: Collection[uuid.UUID],
         is_superuser: bool,
         search_query: str,
         parent_folder_id: uuid.UUID | None = None,
@@ -389,10 +610,10 @@ class FolderRepository:
                 base_conditions.append(Folder.path.descendant_of(parent_folder.path))
 
         if search_query:
-            base_conditions.append(Folder.name.ilike(f"%{search_query}%"))
+            base_conditions.append(BaseRepository.contains_condition(Folder.name, search_query))
 
         if not is_superuser:
-            permission_conditions = FolderRepository._build_permission_conditions(user_id, user_department_ids)
+            permission_conditions = FolderRepository._build_permission_conditions(granted_folder_ids)
             base_conditions.append(or_(*permission_conditions))
 
         total = await FolderRepository._get_total_count(db, base_conditions)
@@ -403,33 +624,25 @@ class FolderRepository:
         return folders, total
 
     @staticmethod
-    def _build_permission_conditions(user_id: uuid.UUID, user_department_ids: list[str]) -> list:
+    def _build_permission_conditions(granted_folder_ids: Collection[uuid.UUID]) -> list:
+        """Folders are visible when they are public or when they lie in the subtree of a folder granted to
+        the user or one of their departments. Grants are stored only where they were assigned."""
         permission_conditions = [
             Folder.is_private == False,  # noqa: E712
         ]
 
-        user_assigned_subquery = (
-            select(literal(1))
-            .select_from(folder_user_permissions)
-            .where(
-                folder_user_permissions.c.folder_id == Folder.id,
-                folder_user_permissions.c.user_id == user_id,
-            )
-            .exists()
-        )
-        permission_conditions.append(user_assigned_subquery)
-
-        if user_department_ids:
-            dept_assigned_subquery = (
+        if granted_folder_ids:
+            grant_folder = aliased(Folder)
+            permission_conditions.append(
                 select(literal(1))
-                .select_from(folder_department_permissions)
+                .select_from(grant_folder)
                 .where(
-                    folder_department_permissions.c.folder_id == Folder.id,
-                    folder_department_permissions.c.department_id.in_(user_department_ids),
+                    grant_folder.id.in_(granted_folder_ids),
+                    grant_folder.category_id == Folder.category_id,
+                    grant_folder.path.ancestor_of(Folder.path),
                 )
                 .exists()
             )
-            permission_conditions.append(dept_assigned_subquery)
 
         return permission_conditions
 
@@ -0,0 +1,87 @@
+from typing import Collection, Iterable
+import uuid
+from sqlalchemy import String, literal_column, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.category import Category, category_department_visibility
+from models.document import Document
+from models.folder import Folder, folder_department_permissions, folder_user_permissions
+from models.user import user_departments
+from repositories.document_repository import DocumentRepository
+from repositories.folder_repository import FolderRepository
+
+
+class PermissionRepository:
+    @staticmethod
+    async def get_accessible_folder_ids(
+        db: AsyncSession,
+        folder_ids: Iterable[uuid.UUID],
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+    ) -> set[uuid.UUID]:
+        """Return the subset of ``folder_ids`` the user may open: public folders, and private folders
+        inside the subtree of one of the user's granted folders."""
+        folder_ids = set(folder_ids)
+        if not folder_ids:
+            return set()
+
+        query = select(Folder.id).where(Folder.id.in_(folder_ids))
+        if not is_superuser:
+            query = query.where(or_(*FolderRepository._build_permission_conditions(granted_folder_ids)))
+
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def get_viewable_document_ids(
+        db: AsyncSession,
+        document_ids: Iterable[uuid.UUID],
+        organization_ids: list[uuid.UUID],
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+    ) -> set[uuid.UUID]:
+        """Return the subset of ``document_ids`` in the user's organizations whose folder the user may open."""
+        document_ids = set(document_ids)
+        if not document_ids or not organization_ids:
+            return set()
+
+        query = (
+            select(Document.id)
+            .join(Category, Category.id == Document.category_id)
+            .where(
+                Document.id.in_(document_ids),
+                Category.organization_id.in_(organization_ids),
+                Category.deleting_at.is_(None),
+            )
+        )
+        if not is_superuser:
+            query = query.where(or_(*DocumentRepository._build_permission_conditions(granted_folder_ids)))
+
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def get_effective_access_ids(db: AsyncSession, user_id: uuid.UUID) -> dict[str, set[uuid.UUID]]:
+        """Collect the user's department ids, the categories shared with those departments and the folders
+        granted to the user or the departments in one round trip, keyed ``departments``, ``categories`` and
+        ``folders``."""
+        department_ids = select(user_departments.c.department_id).where(user_departments.c.user_id == user_id)
+        query = union_all(
+            select(literal_column("'departments'", String).label("kind"), user_departments.c.department_id.label("id")).where(
+                user_departments.c.user_id == user_id
+            ),
+            select(literal_column("'categories'", String), category_department_visibility.c.category_id).where(
+                category_department_visibility.c.department_id.in_(department_ids)
+            ),
+            select(literal_column("'folders'", String), folder_user_permissions.c.folder_id).where(
+                folder_user_permissions.c.user_id == user_id
+            ),
+            select(literal_column("'folders'", String), folder_department_permissions.c.folder_id).where(
+                folder_department_permissions.c.department_id.in_(department_ids)
+            ),
+        )
+        result = await db.execute(query)
+
+        access_ids: dict[str, set[uuid.UUID]] = {"departments": set(), "categories": set(), "folders": set()}
+        for kind, entity_id in result.all():
+            access_ids[kind].add(entity_id)
+        return access_ids
@@ -0,0 +1,93 @@
+from decimal import Decimal
+from typing import Any, Collection, Sequence
+import uuid
+from sqlalchemy import Numeric, String, and_, cast, func, literal_column, null, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.category import Category
+from models.document import Document
+from models.folder import Folder
+from repositories.base_repository import BaseRepository
+from repositories.category_repository import CategoryRepository
+from repositories.document_repository import DocumentRepository
+from repositories.folder_repository import FolderRepository
+
+
+class SearchRepository:
+    @staticmethod
+    async def search_visible_content(
+        db: AsyncSession,
+        organization_ids: list[uuid.UUID],
+        category_ids: Collection[uuid.UUID],
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+        search_query: str,
+        limit: int,
+        after: tuple[Decimal, str, uuid.UUID] | None = None,
+    ) -> Sequence[Any]:
+        """Search folders and documents in every category the user can see with a single query.
+
+        Results are ranked by trigram similarity and paginated with a ``(score, kind, id)`` keyset.
+        """
+        access_filter = CategoryRepository._get_category_access_filter(category_ids)
+        visible_categories = (
+            select(Category.id, Category.name, Category.organization_id)
+            .where(Category.is_active.is_(True), Category.organization_id.in_(organization_ids), access_filter)
+            .cte("visible_categories")
+        )
+        visible_category_ids = select(visible_categories.c.id)
+
+        folder_conditions = [
+            Folder.category_id.in_(visible_category_ids),
+            BaseRepository.contains_condition(Folder.name, search_query),
+        ]
+        document_conditions = [
+            Document.category_id.in_(visible_category_ids),
+            BaseRepository.contains_condition(Document.name, search_query),
+        ]
+        if not is_superuser:
+            folder_conditions.append(or_(*FolderRepository._build_permission_conditions(granted_folder_ids)))
+            document_conditions.append(or_(*DocumentRepository._build_permission_conditions(granted_folder_ids)))
+
+        folders = select(
+            literal_column("'folder'", String).label("kind"),
+            Folder.id.label("id"),
+            Folder.name.label("name"),
+            Folder.category_id.label("category_id"),
+            Folder.parent_id.label("folder_id"),
+            cast(null(), String).label("mime_type"),
+            SearchRepository._score(Folder.name, search_query).label("score"),
+        ).where(and_(*folder_conditions))
+        documents = select(
+            literal_column("'document'", String).label("kind"),
+            Document.id.label("id"),
+            Document.name.label("name"),
+            Document.category_id.label("category_id"),
+            Document.folder_id.label("folder_id"),
+            Document.mime_type.label("mime_type"),
+            SearchRepository._score(Document.name, search_query).label("score"),
+        ).where(and_(*document_conditions))
+        results = union_all(folders, documents).subquery("results")
+
+        query = select(
+            results,
+            visible_categories.c.name.label("category_name"),
+            visible_categories.c.organization_id.label("organization_id"),
+        ).join(visible_categories, visible_categories.c.id == results.c.category_id)
+
+        if after is not None:
+            score, kind, entity_id = after
+            query = query.where(
+                or_(
+                    results.c.score < score,
+                    and_(results.c.score == score, tuple_(results.c.kind, results.c.id) > tuple_(kind, entity_id)),
+                )
+            )
+
+        query = query.order_by(results.c.score.desc(), results.c.kind, results.c.id).limit(limit)
+        result = await db.execute(query)
+        return result.all()
+
+    @staticmethod
+    def _score(column: Any, search_query: str) -> Any:
+        # Rounded to a fixed-precision numeric so cursor values compare exactly.
+        return func.round(cast(func.similarity(column, search_query), Numeric), 4)
@@ -1,16 +1,18 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from core.roles import StaticRole
 from core.security import RoleChecker, get_current_user
 from core.database import get_db
 from models.user import User
 from repositories.user_repository import UserRepository
 from schemas.category import CategoryCreatePayload, CategoryUpdatePayload
+from schemas.deletion import DeletionStatus
 from schemas.pagination import PaginationParams
 from schemas.pagination import PaginationResponse
 from services.sync_service import SyncService
 from services.organization_service import OrganizationService
 from services.category_service import CategoryService
+from services.deletion_service import CATEGORY, DeletionService
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(
@@ -85,12 +87,13 @@ async def create_category(
     return category
 
 
-@router.delete("/{category_id}")
+@router.delete("/{category_id}", status_code=status.HTTP_202_ACCEPTED, response_model=DeletionStatus)
 async def delete_category(
     category_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> None:
+) -> DeletionStatus:
     category = await CategoryService.get_category_by_id(db, category_id)
 
     if not category:
@@ -98,7 +101,25 @@ async def delete_category(
 
     await verify_category_manager_access(db, current_user, category.organization_id) # type: ignore
 
-    await CategoryService.delete_category(db, category_id=category_id)
+    deletion = await CategoryService.delete_category(db, category)
+    background_tasks.add_task(DeletionService.delete_category, category_id)
+    return deletion
+
+
+@router.get("/{category_id}/deletion", response_model=DeletionStatus)
+async def get_category_deletion_status(
+    category_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> DeletionStatus:
+    deletion = await DeletionService.get_status(db, CATEGORY, category_id)
+
+    if not deletion:
+        raise HTTPException(status_code=404, detail="No deletion job found for this category")
+
+    await verify_category_manager_access(db, current_user, deletion.organization_id)
+
+    return deletion
 
 
 @router.put("/{category_id}")
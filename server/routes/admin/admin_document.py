@@ -1,17 +1,29 @@
 from typing import Optional
 import uuid
-from fastapi import Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import BackgroundTasks, Depends, File, Form, HTTPException, UploadFile, status
 from fastapi import APIRouter
 from core.roles import StaticRole
 from core.security import get_current_user
 from core.database import get_db
+from models.document import Document
 from models.user import User
 from repositories.user_repository import UserRepository
 from sqlalchemy.ext.asyncio import AsyncSession
-from schemas.document import UpdateDocumentRequest, MoveDocumentRequest
+from schemas.document import (
+    BulkDeleteDocumentsRequest,
+    BulkDocumentResponse,
+    BulkDocumentResult,
+    BulkMoveDocumentsRequest,
+    CopyDocumentRequest,
+    CopyDocumentResponse,
+    MoveDocumentRequest,
+    UpdateDocumentRequest,
+)
 from services.folder_service import FolderService
 from services.document_service import DocumentService
 from services.category_service import CategoryService
+from services.text_extraction_service import TextExtractionService
+from services.trash_service import TrashService
 
 
 router = APIRouter(
@@ -37,6 +49,72 @@ async def verify_category_manager_access(db: AsyncSession, current_user: User, o
         )
 
 
+async def _authorize_documents(
+    db: AsyncSession, current_user: User, document_ids: list[uuid.UUID]
+) -> tuple[list[Document], dict[uuid.UUID, BulkDocumentResult]]:
+    """Load the requested documents and check the manager role once per organization. Returns the documents
+    the user may manage and the results of the ones that were rejected."""
+    documents = {document.id: document for document in await DocumentService.get_documents_by_ids_with_category(db, set(document_ids))}
+    allowed_organizations: dict[uuid.UUID, bool] = {}
+    authorized: list[Document] = []
+    rejected: dict[uuid.UUID, BulkDocumentResult] = {}
+
+    for document_id in dict.fromkeys(document_ids):
+        document = documents.get(document_id)
+        if document is None or document.category.deleting_at is not None:
+            rejected[document_id] = BulkDocumentResult(id=document_id, status="not_found", detail="Document not found")
+            continue
+
+        organization_id = document.category.organization_id
+        if organization_id not in allowed_organizations:
+            try:
+                await verify_category_manager_access(db, current_user, organization_id)  # type: ignore
+                allowed_organizations[organization_id] = True  # type: ignore
+            except HTTPException:
+                allowed_organizations[organization_id] = False  # type: ignore
+
+        if allowed_organizations[organization_id]:  # type: ignore
+            authorized.append(document)
+        else:
+            rejected[document_id] = BulkDocumentResult(id=document_id, status="forbidden", detail="You cannot manage this document")
+
+    return authorized, rejected
+
+
+@router.post("/bulk/move", response_model=BulkDocumentResponse)
+async def bulk_move_documents(
+    request: BulkMoveDocumentsRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BulkDocumentResponse:
+    target_folder = None
+    if request.folder_id:
+        target_folder = await FolderService.get_folder_by_id(db, request.folder_id)
+        if not target_folder:
+            raise HTTPException(status_code=404, detail="Target folder not found")
+
+    documents, results = await _authorize_documents(db, current_user, request.document_ids)
+    results.update(await DocumentService.bulk_move_documents(db, documents, target_folder))
+
+    return BulkDocumentResponse(results=[results[document_id] for document_id in dict.fromkeys(request.document_ids)])
+
+
+@router.post("/bulk/delete", response_model=BulkDocumentResponse)
+async def bulk_delete_documents(
+    request: BulkDeleteDocumentsRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BulkDocumentResponse:
+    documents, results = await _authorize_documents(db, current_user, request.document_ids)
+    deleted, trashed_keys = await DocumentService.bulk_delete_documents(db, documents)
+    results.update(deleted)
+    for trashed_key in trashed_keys:
+        background_tasks.add_task(TrashService.purge, trashed_key)
+
+    return BulkDocumentResponse(results=[results[document_id] for document_id in dict.fromkeys(request.document_ids)])
+
+
 @router.post("")
 async def create_document(
     name: str = Form(...),
@@ -82,6 +160,7 @@ async def create_document(
         await DocumentService.save_document_file(document_path, file)
 
         file_hash = await DocumentService.get_document_hash(document_path)
+        content_text = await TextExtractionService.extract(document_path, mime_type)
 
         try:
             await DocumentService.create_uploaded_document(
@@ -92,6 +171,7 @@ async def create_document(
                 file_size=file_size,
                 category_id=category_id_uuid,
                 folder_id=folder_id_uuid,
+                content_text=content_text,
             )
         except Exception as db_error:
             await DocumentService.cleanup_file(document_path)
@@ -188,6 +268,50 @@ async def move_document(
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred while moving the document: {str(e)}") from e
 
 
+@router.post("/{document_id}/copy", response_model=CopyDocumentResponse)
+async def copy_document(
+    document_id: str,
+    request: CopyDocumentRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> CopyDocumentResponse:
+    try:
+        try:
+            document_id_uuid = uuid.UUID(document_id)
+            folder_id_uuid = uuid.UUID(request.folder_id) if request.folder_id else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(e)}")
+
+        document = await DocumentService.get_document_by_id(db, document_id_uuid)
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found")
+
+        category = await CategoryService.get_category_by_id(db, document.category_id)  # type: ignore
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        await verify_category_manager_access(
+            db,
+            current_user,
+            category.organization_id,  # type: ignore
+        )
+
+        target_folder = None
+        if folder_id_uuid:
+            target_folder = await FolderService.get_folder_by_id(db, folder_id_uuid)
+            if not target_folder:
+                raise HTTPException(status_code=404, detail="Target folder not found")
+
+        name = request.name.strip() if request.name else None
+        copy_id = await DocumentService.copy_document(db, document, target_folder, name)
+        return CopyDocumentResponse(id=copy_id)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred while copying the document: {str(e)}") from e
+
+
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: str,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 
@@ -6,11 +6,12 @@ from core.roles import StaticRole
 from core.security import get_current_user
 from models.user import User
 from repositories.user_repository import UserRepository
-from schemas.folder import FolderPrivacyUpdate, FolderUpdate
+from schemas.folder import FolderCopyPayload, FolderCopyResult, FolderMovePayload, FolderPrivacyBatchResponse, FolderPrivacyBatchUpdate, FolderPrivacyUpdate, FolderUpdate
 from schemas.pagination import PaginationParams, PaginationResponse
 from services.user_service import UserService
 from services.department_service import DepartmentService
 from services.folder_service import FolderService
+from services.trash_service import TrashService
 import uuid
 
 
@@ -175,6 +176,25 @@ async def unassign_user_from_folder(
     await FolderService.unassign_user_from_folder(db, folder, user)
 
 
+@router.patch("/privacy", response_model=FolderPrivacyBatchResponse)
+async def set_folders_privacy(
+    privacy_update: FolderPrivacyBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> FolderPrivacyBatchResponse:
+    folders = await FolderService.get_folders_by_ids_with_category(db, set(privacy_update.folder_ids))
+
+    missing = set(privacy_update.folder_ids) - {folder.id for folder in folders}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Folders not found: {', '.join(sorted(str(folder_id) for folder_id in missing))}")
+
+    for organization_id in {folder.category.organization_id for folder in folders}:
+        await verify_folder_manager_access(db, current_user, organization_id)  # type: ignore
+
+    updated = await FolderService.set_folders_private(db, folders, privacy_update.is_private)
+    return FolderPrivacyBatchResponse(updated=updated)
+
+
 @router.patch("/{folder_id}/privacy")
 async def set_folder_privacy(
     folder_id: uuid.UUID,
@@ -209,9 +229,44 @@ async def update_folder(
     await FolderService.update_folder(db, folder_id, folder_update)
 
 
+@router.post("/{folder_id}/move")
+async def move_folder(
+    folder_id: uuid.UUID,
+    payload: FolderMovePayload,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    folder = await FolderService.get_folder_by_id_with_category(db, folder_id)
+
+    if not folder:
+        raise HTTPException(status_code=404, detail="Folder not found")
+
+    await verify_folder_manager_access(db, current_user, folder.category.organization_id)  # type: ignore
+
+    await FolderService.move_folder(db, folder_id, payload.parent_id)
+
+
+@router.post("/{folder_id}/copy", response_model=FolderCopyResult)
+async def copy_folder(
+    folder_id: uuid.UUID,
+    payload: FolderCopyPayload,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> FolderCopyResult:
+    folder = await FolderService.get_folder_by_id_with_category(db, folder_id)
+
+    if not folder:
+        raise HTTPException(status_code=404, detail="Folder not found")
+
+    await verify_folder_manager_access(db, current_user, folder.category.organization_id)  # type: ignore
+
+    return await FolderService.copy_folder(db, folder_id, payload.parent_id, payload.name)
+
+
 @router.delete("/{folder_id}")
 async def delete_folder(
     folder_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> None:
@@ -222,4 +277,6 @@ async def delete_folder(
 
     await verify_folder_manager_access(db, current_user, folder.category.organization_id)  # type: ignore
 
-    await FolderService.delete_folder(db, folder_id)
+    trashed_key = await FolderService.delete_folder(db, folder_id)
+    if trashed_key:
+        background_tasks.add_task(TrashService.purge, trashed_key)
@@ -1,10 +1,12 @@
 import uuid
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.deletion import DeletionStatus
 from schemas.pagination import PaginationParams, PaginationResponse
 from core.roles import StaticRole
 from models.user import User
+from services.deletion_service import ORGANIZATION, DeletionService
 from services.organization_service import OrganizationService
 from services.user_service import UserService
 from core.security import RoleChecker, get_current_user
@@ -32,14 +34,30 @@ async def get_organizations_paginated(
     return organizations
 
 
-@router.delete("/{organization_id}", dependencies=[Depends(RoleChecker([]))])
-async def delete_organization(organization_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> None:
+@router.delete(
+    "/{organization_id}", status_code=202, dependencies=[Depends(RoleChecker([]))], response_model=DeletionStatus
+)
+async def delete_organization(
+    organization_id: uuid.UUID, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)
+) -> DeletionStatus:
     organization = await OrganizationService.get_organization_by_id(db, organization_id)
 
     if not organization:
         raise HTTPException(status_code=404, detail="Organization not found")
 
-    await OrganizationService.delete_organization(db, organization_id=organization_id)
+    deletion = await OrganizationService.delete_organization(db, organization)
+    background_tasks.add_task(DeletionService.delete_organization, organization_id)
+    return deletion
+
+
+@router.get("/{organization_id}/deletion", dependencies=[Depends(RoleChecker([]))], response_model=DeletionStatus)
+async def get_organization_deletion_status(organization_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> DeletionStatus:
+    deletion = await DeletionService.get_status(db, ORGANIZATION, organization_id)
+
+    if not deletion:
+        raise HTTPException(status_code=404, detail="No deletion job found for this organization")
+
+    return deletion
 
 
 @router.put("/{organization_id}", dependencies=[Depends(RoleChecker([]))])
@@ -0,0 +1,72 @@
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import document_body_cache
+from core.database import get_db
+from core.security import RoleChecker
+from schemas.storage import CacheStats, RebalancePayload, RebalanceStatus, TieringResult, VolumeUsage
+from services.access_tracker import AccessTracker
+from services.category_service import CategoryService
+from services.placement_service import PlacementService
+from services.tiering_service import TieringService
+
+
+router = APIRouter(prefix="/admin/storage", tags=["admin_storage"])
+
+
+@router.get("/volumes", dependencies=[Depends(RoleChecker([]))], response_model=list[VolumeUsage])
+async def get_volumes() -> list[VolumeUsage]:
+    if not PlacementService.is_enabled():
+        raise HTTPException(status_code=400, detail="Multi-volume storage is not configured")
+
+    return PlacementService.get_volume_usage()
+
+
+@router.post(
+    "/categories/{category_id}/rebalance", dependencies=[Depends(RoleChecker([]))], response_model=RebalanceStatus
+)
+async def rebalance_category(
+    category_id: uuid.UUID,
+    payload: RebalancePayload,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+) -> RebalanceStatus:
+    category = await CategoryService.get_category_by_id(db, category_id)
+
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    try:
+        status = await PlacementService.start_rebalance(db, category_id, payload.volume)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    background_tasks.add_task(PlacementService.rebalance_category, category_id)
+    return status
+
+
+@router.get(
+    "/categories/{category_id}/rebalance", dependencies=[Depends(RoleChecker([]))], response_model=RebalanceStatus
+)
+async def get_rebalance_status(category_id: uuid.UUID) -> RebalanceStatus:
+    status = PlacementService.get_rebalance_status(category_id)
+
+    if not status:
+        raise HTTPException(status_code=404, detail="No rebalance job found for this category")
+
+    return status
+
+
+@router.post("/tiering/run", dependencies=[Depends(RoleChecker([]))], response_model=TieringResult)
+async def run_tiering(db: AsyncSession = Depends(get_db)) -> TieringResult:
+    if not TieringService.is_enabled():
+        raise HTTPException(status_code=400, detail="Tiered storage is not configured")
+
+    await AccessTracker.flush(db)
+    demoted = await TieringService.demote_cold_documents(db)
+    return TieringResult(demoted=demoted)
+
+
+@router.get("/cache", dependencies=[Depends(RoleChecker([]))], response_model=CacheStats)
+async def get_document_cache_stats() -> CacheStats:
+    return CacheStats(**document_body_cache.stats())
@@ -9,6 +9,8 @@ from core.security import RoleChecker, get_current_user
 from core.database import get_db
 from schemas.user import PasswordResetPayload, UserEditPayload
 from schemas.admin import UserAdmin as UserSchema
+from schemas.storage import CacheStats
+from core.cache import effective_access_cache
 
 
 router = APIRouter(prefix="/admin/users", tags=["admin_users"], dependencies=[Depends(RoleChecker([StaticRole.USER_MANAGER.name_value]))])
@@ -23,6 +25,11 @@ async def get_users_paginated(
     return users
 
 
+@router.get("/access-cache", dependencies=[Depends(RoleChecker([]))], response_model=CacheStats)
+async def get_access_cache_stats() -> CacheStats:
+    return CacheStats(**effective_access_cache.stats())
+
+
 @router.get("/{user_id}", response_model=UserSchema)
 async def get_user_by_id(user_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> UserSchema | None:
     user = await UserService.get_user_by_id(db, user_id)
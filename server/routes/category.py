@@ -8,7 +8,10 @@ from routes.auth import get_current_user
 from schemas.pagination import PaginationParams
 from services.category_service import CategoryService
 from schemas.category import Category as CategorySchema, CategoryContentResponse
-from schemas.folder import FolderTreeNode
+from schemas.folder import FolderChildNode, FolderTreeNode
+from schemas.search import AutocompleteItem
+from services.access_service import AccessService
+from services.autocomplete_service import AutocompleteService
 from services.folder_service import FolderService
 
 
@@ -43,6 +46,10 @@ async def get_category_content_in_folder(
     category_id: uuid.UUID,
     folder_id: uuid.UUID | None = Query(None, description="ID of the folder"),
     search: str | None = Query(None, description="Search query for recursive search in folder/document names"),
+    search_mode: str = Query("name", pattern="^(name|content)$", description="Search in names or in document contents"),
+    cursor: str | None = Query(
+        None, description="Switches to cursor pagination: pass an empty value for the first page, then the returned next_cursor"
+    ),
     pagination: PaginationParams = Depends(),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -52,9 +59,12 @@ async def get_category_content_in_folder(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    return await CategoryService.get_category_content_in_folder(
-        db, category_id, folder_id, pagination, current_user.id, search_query=search # type: ignore
-    )
+    try:
+        return await CategoryService.get_category_content_in_folder(
+            db, category_id, folder_id, pagination, current_user, search_query=search, search_mode=search_mode, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{category_id}/folder-breadcrumb", response_model=list[dict])
@@ -75,6 +85,7 @@ async def get_folder_breadcrumb(
 @router.get("/{category_id}/folder-tree", response_model=list[FolderTreeNode])
 async def get_category_folder_tree(
     category_id: uuid.UUID,
+    depth: int | None = Query(None, ge=1, description="Maximum number of folder levels to return"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[FolderTreeNode]:
@@ -83,4 +94,44 @@ async def get_category_folder_tree(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    return await FolderService.get_category_folder_tree(db, category_id)
\ No newline at end of file
+    return await FolderService.get_category_folder_tree(db, category_id, current_user, depth)
+
+
+@router.get("/{category_id}/folder-tree/children", response_model=list[FolderChildNode])
+async def get_folder_tree_children(
+    category_id: uuid.UUID,
+    folder_id: uuid.UUID | None = Query(None, description="ID of the folder to expand; omit for the category root"),
+    depth: int = Query(1, ge=1, le=5, description="Number of folder levels to return below the folder"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[FolderChildNode]:
+    category = await CategoryService.get_category_for_user(db, category_id, current_user.id) # type: ignore
+
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    return await FolderService.get_folder_children(db, category_id, folder_id, current_user, depth)
+
+
+@router.get("/{category_id}/autocomplete", response_model=list[AutocompleteItem])
+async def autocomplete_names(
+    category_id: uuid.UUID,
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix of a folder or document name"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[AutocompleteItem]:
+    category = await CategoryService.get_category_for_user(db, category_id, current_user.id) # type: ignore
+
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    access = await AccessService.get_effective_access(db, current_user.id)  # type: ignore
+    return await AutocompleteService.suggest(
+        db,
+        category_id,
+        q,
+        granted_folder_ids=access.granted_folder_ids,
+        is_superuser=bool(current_user.is_superuser),
+        limit=limit,
+    )
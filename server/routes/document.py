@@ -1,12 +1,18 @@
+import mimetypes
 import uuid
 from core.database import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from core.security import get_current_user
+from core.security import create_signed_url_token, get_current_user, verify_signed_url_token
+from core.storage_base import content_disposition
 from models.document import VIEWABLE_MIME_TYPES
-from schemas.document import DocumentMetadata
+from schemas.document import ArchiveEntry, DocumentMetadata, DocumentRowsResponse, SignedUrlResponse
+from schemas.pagination import PaginationParams, PaginationResponse
+from services.archive_service import ArchiveService
 from services.document_service import DocumentService
+from services.line_index_service import LineIndexService
 
 
 router = APIRouter(prefix="/documents", tags=["documents"])
@@ -17,7 +23,7 @@ async def get_document_content(
     document_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
-) -> FileResponse:
+) -> Response:
     document = await DocumentService.get_document_by_id(db, document_id)
 
     if not document:
@@ -27,13 +33,21 @@ async def get_document_content(
     if not permitted:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this document")
 
+    mime_type = str(document.mime_type) if document.mime_type is not None else "application/octet-stream"
+
+    body = await DocumentService.get_cached_body(db, document)
+    if body is not None:
+        DocumentService.record_access(document)
+        return DocumentService.build_body_response(body, str(document.name), mime_type)
+
     file_path = await DocumentService.get_file_path(db, document)
 
-    if not DocumentService.is_file_exists(file_path):
+    if not await DocumentService.is_file_exists(file_path):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on server")
 
-    mime_type = str(document.mime_type) if document.mime_type is not None else "application/octet-stream"
-    return FileResponse(path=file_path, filename=str(document.name), media_type=mime_type)
+    DocumentService.record_access(document)
+
+    return await DocumentService.build_file_response(file_path, str(document.name), mime_type)
 
 
 @router.get("/{document_id}/metadata", response_model=DocumentMetadata)
@@ -51,8 +65,8 @@ async def get_document_metadata(
     if not permitted:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this document")
 
-    file_path = await DocumentService.get_file_path(db, document)
-    file_exists = DocumentService.is_file_exists(file_path)
+    file_path = await DocumentService.get_file_path(db, document, resolve_tier=False)
+    file_exists = await DocumentService.is_file_exists(file_path)
 
     mime_type = str(document.mime_type) if document.mime_type is not None else None
     is_viewable = mime_type in VIEWABLE_MIME_TYPES if mime_type is not None else False
@@ -73,7 +87,69 @@ async def download_document(
     document_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
-) -> FileResponse:
+) -> Response:
+    document = await DocumentService.get_document_by_id(db, document_id)
+
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    permitted = await DocumentService.is_user_permitted_to_view_document(db, current_user, document_id)
+    if not permitted:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this document")
+
+    file_path = await DocumentService.get_file_path(db, document)
+
+    if not await DocumentService.is_file_exists(file_path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on server")
+
+    DocumentService.record_access(document)
+
+    return await DocumentService.build_file_response(
+        file_path, str(document.name), "application/octet-stream", as_attachment=True
+    )
+
+
+@router.post("/{document_id}/signed-url", response_model=SignedUrlResponse)
+async def create_signed_url(
+    document_id: uuid.UUID,
+    request: Request,
+    download: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> SignedUrlResponse:
+    document = await DocumentService.get_document_by_id(db, document_id)
+
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    permitted = await DocumentService.is_user_permitted_to_view_document(db, current_user, document_id)
+    if not permitted:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this document")
+
+    claims = await DocumentService.get_signed_url_claims(db, document, as_attachment=download)
+    token, expires_at = create_signed_url_token(claims)
+    url = request.url_for("get_signed_document_content", document_id=document_id).include_query_params(token=token)
+
+    return SignedUrlResponse(url=str(url), expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc))
+
+
+@router.get("/{document_id}/signed")
+async def get_signed_document_content(document_id: uuid.UUID, token: str, request: Request) -> Response:
+    try:
+        claims = verify_signed_url_token(token)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    if claims.get("d") != str(document_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid signed URL")
+
+    if claims.get("h") and request.headers.get("If-None-Match") == f'"{claims["h"]}"':
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": f'"{claims["h"]}"'})
+
+    return await DocumentService.build_signed_response(claims)
+
+
+async def _get_archive_document(db: AsyncSession, current_user, document_id: uuid.UUID):
     document = await DocumentService.get_document_by_id(db, document_id)
 
     if not document:
@@ -83,14 +159,98 @@ async def download_document(
     if not permitted:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this document")
 
+    if document.mime_type != "application/zip":  # type: ignore
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Document is not a ZIP archive")
+
+    return document
+
+
+@router.get("/{document_id}/archive/entries", response_model=PaginationResponse)
+async def list_archive_entries(
+    document_id: uuid.UUID,
+    prefix: str | None = Query(None, description="Only return entries whose path starts with this prefix"),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> PaginationResponse:
+    document = await _get_archive_document(db, current_user, document_id)
     file_path = await DocumentService.get_file_path(db, document)
 
-    if not DocumentService.is_file_exists(file_path):
+    try:
+        entries = await ArchiveService.get_entries(document.file_hash, file_path)  # type: ignore
+    except FileNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on server")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    DocumentService.record_access(document)
+
+    if prefix:
+        entries = [entry for entry in entries if entry.name.startswith(prefix)]
+
+    page = entries[pagination.offset : pagination.offset + pagination.page_size]
+    return PaginationResponse(total=len(entries), items=[ArchiveEntry.model_validate(entry) for entry in page])
 
-    return FileResponse(
-        path=file_path,
-        filename=str(document.name),
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={document.name}"},
+
+@router.get("/{document_id}/archive/entry")
+async def get_archive_entry(
+    document_id: uuid.UUID,
+    path: str = Query(..., description="Path of the entry inside the archive"),
+    download: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> Response:
+    document = await _get_archive_document(db, current_user, document_id)
+    file_path = await DocumentService.get_file_path(db, document)
+
+    try:
+        entry = await ArchiveService.get_entry(document.file_hash, file_path, path)  # type: ignore
+        if not entry:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Archive entry not found")
+        content = await ArchiveService.open_entry(file_path, entry)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on server")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    DocumentService.record_access(document)
+
+    media_type = mimetypes.guess_type(entry.name)[0] or "application/octet-stream"
+    filename = entry.name.rsplit("/", 1)[-1]
+    # No Content-Length: the size comes from the archive itself and is only verified while streaming.
+    return StreamingResponse(
+        content, media_type=media_type, headers={"Content-Disposition": content_disposition(filename, download)}
     )
+
+
+@router.get("/{document_id}/rows", response_model=DocumentRowsResponse)
+async def get_document_rows(
+    document_id: uuid.UUID,
+    start: int = Query(0, ge=0, description="Index of the first line (or CSV data row) to return"),
+    limit: int = Query(50, ge=1, le=1000, description="Number of lines or rows to return"),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> DocumentRowsResponse:
+    document = await DocumentService.get_document_by_id(db, document_id)
+
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    permitted = await DocumentService.is_user_permitted_to_view_document(db, current_user, document_id)
+    if not permitted:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this document")
+
+    if document.mime_type not in ("text/plain", "text/csv"):  # type: ignore
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only text and CSV documents can be paged")
+
+    file_path = await DocumentService.get_file_path(db, document)
+
+    if not await DocumentService.is_file_exists(file_path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on server")
+
+    DocumentService.record_access(document)
+
+    csv_mode = document.mime_type == "text/csv"  # type: ignore
+    index, rows = await LineIndexService.read_rows(document.file_hash, file_path, csv_mode, start, limit)  # type: ignore
+
+    return DocumentRowsResponse(start=start, total=LineIndexService.total_rows(index), header=index.header, rows=rows)
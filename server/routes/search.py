@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_db
+from models.user import User
+from routes.auth import get_current_user
+from schemas.search import GlobalSearchResponse
+from services.search_service import SearchService
+
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=GlobalSearchResponse)
+async def global_search(
+    q: str = Query(..., min_length=2, max_length=100, description="Text to look for in folder and document names"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results per page"),
+    cursor: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> GlobalSearchResponse:
+    try:
+        return await SearchService.global_search(db, current_user, q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
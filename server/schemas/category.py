@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 import uuid
 from pydantic import BaseModel, Field
 
@@ -38,7 +38,8 @@ class Category(BaseModel):
 class CategoryContentResponse(BaseModel):
     folders: List[FolderItem]
     documents: List[DocumentItem]
-    pagination: PaginationInfo
+    pagination: Optional[PaginationInfo] = None
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,18 @@
+import uuid
+from pydantic import BaseModel
+
+
+class DeletionStatus(BaseModel):
+    entity: str
+    entity_id: uuid.UUID
+    organization_id: uuid.UUID
+    state: str
+    categories_deleted: int = 0
+    folders_deleted: int = 0
+    documents_deleted: int = 0
+    departments_deleted: int = 0
+    categories_remaining: int | None = None
+    folders_remaining: int | None = None
+    documents_remaining: int | None = None
+    departments_remaining: int | None = None
+    error: str | None = None
@@ -1,12 +1,14 @@
 from datetime import datetime
-from pydantic import BaseModel
-from typing import Optional
+import uuid
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 
 class DocumentItem(BaseModel):
     id: str
     name: str
     mime_type: str
+    snippet: Optional[str] = None
 
 
 class DocumentMetadata(BaseModel):
@@ -22,4 +24,49 @@ class UpdateDocumentRequest(BaseModel):
     name: str
 
 class MoveDocumentRequest(BaseModel):
-    folder_id: Optional[str] = None
\ No newline at end of file
+    folder_id: Optional[str] = None
+
+class CopyDocumentRequest(BaseModel):
+    folder_id: Optional[str] = None
+    name: Optional[str] = None
+
+class CopyDocumentResponse(BaseModel):
+    id: uuid.UUID
+
+class BulkMoveDocumentsRequest(BaseModel):
+    document_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=1000)
+    folder_id: Optional[uuid.UUID] = Field(None, description="Target folder; null moves each document to its category root")
+
+class BulkDeleteDocumentsRequest(BaseModel):
+    document_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=1000)
+
+class BulkDocumentResult(BaseModel):
+    id: uuid.UUID
+    status: str
+    detail: Optional[str] = None
+
+class BulkDocumentResponse(BaseModel):
+    results: List[BulkDocumentResult]
+
+class SignedUrlResponse(BaseModel):
+    url: str
+    expires_at: datetime
+
+
+class ArchiveEntry(BaseModel):
+    name: str
+    is_dir: bool
+    size: int
+    compressed_size: int
+    compression_method: int
+    modified_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentRowsResponse(BaseModel):
+    start: int
+    total: int
+    header: Optional[list[str]] = None
+    rows: list[str] | list[list[str]]
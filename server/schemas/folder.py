@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List
+import uuid
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 
 class FolderItem(BaseModel):
@@ -12,6 +13,30 @@ class FolderPrivacyUpdate(BaseModel):
     is_private: bool
 
 
+class FolderPrivacyBatchUpdate(BaseModel):
+    folder_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=1000)
+    is_private: bool
+
+
+class FolderPrivacyBatchResponse(BaseModel):
+    updated: int
+
+
+class FolderMovePayload(BaseModel):
+    parent_id: Optional[uuid.UUID] = Field(None, description="ID of the new parent folder; null moves the folder to the category root")
+
+
+class FolderCopyPayload(BaseModel):
+    parent_id: Optional[uuid.UUID] = Field(None, description="ID of the folder to copy into; null copies into the category root")
+    name: Optional[str] = Field(None, description="Name of the copy; defaults to the name of the copied folder")
+
+
+class FolderCopyResult(BaseModel):
+    id: uuid.UUID
+    folders_copied: int
+    documents_copied: int
+
+
 class FolderUpdate(BaseModel):
     name: str
     is_private: bool
@@ -23,4 +48,16 @@ class FolderTreeNode(BaseModel):
     name: str
     children: List['FolderTreeNode'] = []
 
-FolderTreeNode.model_rebuild()
\ No newline at end of file
+FolderTreeNode.model_rebuild()
+
+
+class FolderChildNode(BaseModel):
+    id: str
+    name: str
+    is_private: bool
+    child_folder_count: int
+    document_count: int
+    has_children: bool
+    children: List['FolderChildNode'] = []
+
+FolderChildNode.model_rebuild()
@@ -0,0 +1,30 @@
+import uuid
+from pydantic import BaseModel, Field
+
+
+class SearchResultItem(BaseModel):
+    id: uuid.UUID
+    kind: str = Field(..., description="Either 'folder' or 'document'")
+    name: str
+    folder_id: uuid.UUID | None = Field(None, description="Parent folder of the result, if any")
+    mime_type: str | None = None
+    score: float
+
+
+class SearchResultGroup(BaseModel):
+    category_id: uuid.UUID
+    category_name: str
+    organization_id: uuid.UUID
+    items: list[SearchResultItem]
+
+
+class GlobalSearchResponse(BaseModel):
+    groups: list[SearchResultGroup]
+    next_cursor: str | None = None
+
+
+class AutocompleteItem(BaseModel):
+    id: uuid.UUID
+    kind: str = Field(..., description="Either 'folder' or 'document'")
+    name: str
+    folder_id: uuid.UUID | None = None
@@ -0,0 +1,40 @@
+import uuid
+from pydantic import BaseModel, Field
+
+
+class VolumeUsage(BaseModel):
+    name: str
+    root: str
+    total_bytes: int
+    used_bytes: int
+    free_bytes: int
+    category_count: int
+
+
+class RebalancePayload(BaseModel):
+    volume: str = Field(..., description="The name of the volume to move the category to")
+
+
+class RebalanceStatus(BaseModel):
+    category_id: uuid.UUID
+    source_volume: str
+    target_volume: str
+    state: str
+    files_copied: int = 0
+    bytes_copied: int = 0
+    error: str | None = None
+
+
+class TieringResult(BaseModel):
+    demoted: int
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int = 0
+    entries: int
+    weight: int = Field(..., description="Total weight of the cached values (bytes for the document cache)")
+    max_weight: int
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import effective_access_cache
+from models.user import user_departments
+from repositories.permission_repository import PermissionRepository
+
+
+@dataclass(frozen=True)
+class EffectiveAccess:
+    department_ids: frozenset[uuid.UUID]
+    category_ids: frozenset[uuid.UUID]
+    granted_folder_ids: frozenset[uuid.UUID]
+
+
+class AccessService:
+    """Per-worker cache of each user's effective access: their departments, the categories shared with
+    those departments and the folders granted to them directly or through a department.
+
+    Entries are dropped when this worker changes a membership or grant and expire after
+    ``ACCESS_CACHE_TTL_SECONDS`` so changes made by other workers are picked up.
+    """
+
+    @staticmethod
+    async def get_effective_access(db: AsyncSession, user_id: uuid.UUID) -> EffectiveAccess:
+        access = effective_access_cache.get(user_id)
+        if access is None:
+            access_ids = await PermissionRepository.get_effective_access_ids(db, user_id)
+            access = EffectiveAccess(
+                department_ids=frozenset(access_ids["departments"]),
+                category_ids=frozenset(access_ids["categories"]),
+                granted_folder_ids=frozenset(access_ids["folders"]),
+            )
+            effective_access_cache.put(user_id, access)
+        return access
+
+    @staticmethod
+    def invalidate_user(user_id: uuid.UUID) -> None:
+        effective_access_cache.invalidate(user_id)
+
+    @staticmethod
+    async def invalidate_department(db: AsyncSession, department_id: uuid.UUID) -> None:
+        result = await db.execute(select(user_departments.c.user_id).where(user_departments.c.department_id == department_id))
+        for user_id in result.scalars().all():
+            effective_access_cache.invalidate(user_id)
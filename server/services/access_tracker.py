@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime, timezone
+import logging
+import uuid
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models.document import Document
+
+
+logger = logging.getLogger(__name__)
+
+
+class AccessTracker:
+    """Buffers document access timestamps in memory and writes them in batches."""
+
+    _pending: dict[uuid.UUID, datetime] = {}
+
+    @staticmethod
+    def record(document_id: uuid.UUID) -> None:
+        AccessTracker._pending[document_id] = datetime.now(timezone.utc)
+
+    @staticmethod
+    async def flush(db: AsyncSession) -> int:
+        if not AccessTracker._pending:
+            return 0
+
+        pending, AccessTracker._pending = AccessTracker._pending, {}
+        table = Document.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("document_id"))
+            .where(or_(table.c.last_accessed_at.is_(None), table.c.last_accessed_at < bindparam("accessed_at")))
+            .values(last_accessed_at=bindparam("accessed_at"), updated_at=table.c.updated_at)
+        )
+        try:
+            await db.execute(stmt, [{"document_id": document_id, "accessed_at": accessed_at} for document_id, accessed_at in pending.items()])
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            for document_id, accessed_at in pending.items():
+                AccessTracker._pending.setdefault(document_id, accessed_at)
+            raise
+        return len(pending)
+
+    @staticmethod
+    async def flush_periodically() -> None:
+        while True:
+            await asyncio.sleep(settings.ACCESS_FLUSH_INTERVAL_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await AccessTracker.flush(db)
+            except Exception as e:
+                logger.warning(f"Failed to flush document access times: {e}")
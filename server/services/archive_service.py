@@ -0,0 +1,247 @@
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import struct
+from typing import AsyncIterator
+import zlib
+from core.cache import archive_directory_cache
+from core.config import settings
+from core.storage_base import DEFAULT_CHUNK_SIZE, get_storage
+
+
+logger = logging.getLogger(__name__)
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+ZIP64_EOCD_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+CENTRAL_DIRECTORY_SIGNATURE = b"PK\x01\x02"
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+EOCD_FORMAT = "<4s4H2IH"
+ZIP64_EOCD_LOCATOR_FORMAT = "<4sIQI"
+ZIP64_EOCD_FORMAT = "<4sQ2H2I4Q"
+CENTRAL_DIRECTORY_FORMAT = "<4s6H3I5H2I"
+LOCAL_HEADER_FORMAT = "<4s5H3I2H"
+
+EOCD_SIZE = struct.calcsize(EOCD_FORMAT)
+ZIP64_EOCD_LOCATOR_SIZE = struct.calcsize(ZIP64_EOCD_LOCATOR_FORMAT)
+ZIP64_EOCD_SIZE = struct.calcsize(ZIP64_EOCD_FORMAT)
+CENTRAL_DIRECTORY_SIZE = struct.calcsize(CENTRAL_DIRECTORY_FORMAT)
+LOCAL_HEADER_SIZE = struct.calcsize(LOCAL_HEADER_FORMAT)
+MAX_COMMENT_SIZE = 0xFFFF
+ZIP64_EXTRA_ID = 0x0001
+
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+FLAG_ENCRYPTED = 0x1
+FLAG_UTF8 = 0x800
+
+
+@dataclass
+class ZipEntry:
+    name: str
+    compression_method: int
+    flags: int
+    crc32: int
+    compressed_size: int
+    size: int
+    header_offset: int
+    modified_at: datetime | None
+
+    @property
+    def is_dir(self) -> bool:
+        return self.name.endswith("/")
+
+
+class ArchiveService:
+    """Browses stored ZIP archives through ranged reads of the central directory and single entries."""
+
+    @staticmethod
+    async def get_entries(file_hash: str | None, file_path: str) -> list[ZipEntry]:
+        entries = archive_directory_cache.get(file_hash) if file_hash else None
+        if entries is None:
+            entries = await ArchiveService._read_central_directory(file_path)
+            if file_hash:
+                archive_directory_cache.put(file_hash, entries)
+        return entries
+
+    @staticmethod
+    async def get_entry(file_hash: str | None, file_path: str, name: str) -> ZipEntry | None:
+        for entry in await ArchiveService.get_entries(file_hash, file_path):
+            if entry.name == name:
+                return entry
+        return None
+
+    @staticmethod
+    async def _read_central_directory(file_path: str) -> list[ZipEntry]:
+        storage = get_storage()
+        archive_size = await storage.size(file_path)
+        if archive_size is None:
+            raise FileNotFoundError(f"Archive {file_path} does not exist.")
+
+        tail_size = min(archive_size, EOCD_SIZE + MAX_COMMENT_SIZE + ZIP64_EOCD_LOCATOR_SIZE)
+        tail_start = archive_size - tail_size
+        tail = await storage.read_range(file_path, tail_start, tail_size)
+
+        eocd_pos = tail.rfind(EOCD_SIGNATURE)
+        if eocd_pos < 0 or len(tail) - eocd_pos < EOCD_SIZE:
+            raise ValueError("Document is not a valid ZIP archive")
+
+        _, _, _, _, entry_count, cd_size, cd_offset, _ = struct.unpack_from(EOCD_FORMAT, tail, eocd_pos)
+
+        if entry_count == 0xFFFF or 0xFFFFFFFF in (cd_size, cd_offset):
+            locator_pos = eocd_pos - ZIP64_EOCD_LOCATOR_SIZE
+            if locator_pos < 0 or tail[locator_pos : locator_pos + 4] != ZIP64_EOCD_LOCATOR_SIGNATURE:
+                raise ValueError("ZIP64 end of central directory locator is missing")
+
+            _, _, zip64_eocd_offset, _ = struct.unpack_from(ZIP64_EOCD_LOCATOR_FORMAT, tail, locator_pos)
+            if zip64_eocd_offset + ZIP64_EOCD_SIZE > archive_size:
+                raise ValueError("ZIP64 end of central directory record is out of bounds")
+            zip64_eocd = await storage.read_range(file_path, zip64_eocd_offset, ZIP64_EOCD_SIZE)
+            if len(zip64_eocd) != ZIP64_EOCD_SIZE or zip64_eocd[:4] != ZIP64_EOCD_SIGNATURE:
+                raise ValueError("ZIP64 end of central directory record is corrupt")
+            _, _, _, _, _, _, _, entry_count, cd_size, cd_offset = struct.unpack(ZIP64_EOCD_FORMAT, zip64_eocd)
+
+        if cd_size > settings.ARCHIVE_MAX_CENTRAL_DIRECTORY_BYTES:
+            raise ValueError("ZIP central directory is too large to browse")
+
+        if cd_offset + cd_size > archive_size:
+            raise ValueError("ZIP central directory is out of bounds")
+
+        central_directory = await storage.read_range(file_path, cd_offset, cd_size)
+        if len(central_directory) != cd_size:
+            raise ValueError("ZIP central directory is truncated")
+        return ArchiveService._parse_central_directory(central_directory, entry_count)
+
+    @staticmethod
+    def _parse_central_directory(data: bytes, entry_count: int) -> list[ZipEntry]:
+        entries = []
+        pos = 0
+        for _ in range(entry_count):
+            if data[pos : pos + 4] != CENTRAL_DIRECTORY_SIGNATURE or len(data) - pos < CENTRAL_DIRECTORY_SIZE:
+                raise ValueError("ZIP central directory is corrupt")
+
+            (
+                _, _, _, flags, method, mod_time, mod_date, crc32, compressed_size, size,
+                name_length, extra_length, comment_length, _, _, _, header_offset,
+            ) = struct.unpack_from(CENTRAL_DIRECTORY_FORMAT, data, pos)
+            pos += CENTRAL_DIRECTORY_SIZE
+
+            if len(data) - pos < name_length + extra_length + comment_length:
+                raise ValueError("ZIP central directory is truncated")
+            raw_name = data[pos : pos + name_length]
+            extra = data[pos + name_length : pos + name_length + extra_length]
+            pos += name_length + extra_length + comment_length
+
+            if 0xFFFFFFFF in (compressed_size, size, header_offset):
+                size, compressed_size, header_offset = ArchiveService._apply_zip64_extra(
+                    extra, size, compressed_size, header_offset
+                )
+
+            entries.append(
+                ZipEntry(
+                    name=raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437"),
+                    compression_method=method,
+                    flags=flags,
+                    crc32=crc32,
+                    compressed_size=compressed_size,
+                    size=size,
+                    header_offset=header_offset,
+                    modified_at=ArchiveService._dos_datetime(mod_date, mod_time),
+                )
+            )
+        return entries
+
+    @staticmethod
+    def _apply_zip64_extra(extra: bytes, size: int, compressed_size: int, header_offset: int) -> tuple[int, int, int]:
+        pos = 0
+        while pos + 4 <= len(extra):
+            header_id, data_size = struct.unpack_from("<2H", extra, pos)
+            pos += 4
+            if header_id == ZIP64_EXTRA_ID:
+                count = min(data_size, len(extra) - pos) // 8
+                values = list(struct.unpack_from(f"<{count}Q", extra, pos))
+                needed = [size, compressed_size, header_offset].count(0xFFFFFFFF)
+                if len(values) < needed:
+                    raise ValueError("ZIP64 extra field is truncated")
+                if size == 0xFFFFFFFF:
+                    size = values.pop(0)
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = values.pop(0)
+                if header_offset == 0xFFFFFFFF:
+                    header_offset = values.pop(0)
+                return size, compressed_size, header_offset
+            pos += data_size
+        return size, compressed_size, header_offset
+
+    @staticmethod
+    def _dos_datetime(date: int, time: int) -> datetime | None:
+        try:
+            return datetime(1980 + (date >> 9), (date >> 5) & 0xF, date & 0x1F, time >> 11, (time >> 5) & 0x3F, (time & 0x1F) * 2)
+        except ValueError:
+            return None
+
+    @staticmethod
+    async def open_entry(file_path: str, entry: ZipEntry) -> AsyncIterator[bytes]:
+        """Validate an entry and return an iterator streaming its uncompressed content."""
+        if entry.is_dir:
+            raise ValueError("Archive entry is a directory")
+        if entry.flags & FLAG_ENCRYPTED:
+            raise ValueError("Encrypted archive entries are not supported")
+        if entry.compression_method not in (METHOD_STORED, METHOD_DEFLATED):
+            raise ValueError(f"Unsupported compression method: {entry.compression_method}")
+
+        header = await get_storage().read_range(file_path, entry.header_offset, LOCAL_HEADER_SIZE)
+        if len(header) != LOCAL_HEADER_SIZE or header[:4] != LOCAL_HEADER_SIGNATURE:
+            raise ValueError("ZIP local file header is corrupt")
+
+        *_, name_length, extra_length = struct.unpack(LOCAL_HEADER_FORMAT, header)
+        data_offset = entry.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+        return ArchiveService._stream_entry(file_path, entry, data_offset)
+
+    @staticmethod
+    async def _stream_entry(file_path: str, entry: ZipEntry, data_offset: int) -> AsyncIterator[bytes]:
+        """Stream an entry's data, trusting nothing the archive declares.
+
+        Inflated output is produced at most ``DEFAULT_CHUNK_SIZE`` bytes per call and the stream fails as
+        soon as it exceeds the declared size, so a zip bomb cannot inflate without bound. A size or CRC
+        mismatch ends the stream with an error instead of silently serving corrupt data.
+        """
+        storage = get_storage()
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if entry.compression_method == METHOD_DEFLATED else None
+        crc32 = 0
+        produced = 0
+        remaining = entry.compressed_size
+        position = data_offset
+
+        def check(data: bytes) -> bytes:
+            nonlocal crc32, produced
+            produced += len(data)
+            if produced > entry.size:
+                raise ValueError(f"Archive entry {entry.name} is larger than its declared size")
+            crc32 = zlib.crc32(data, crc32)
+            return data
+
+        while remaining > 0:
+            chunk = await storage.read_range(file_path, position, min(DEFAULT_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            position += len(chunk)
+            remaining -= len(chunk)
+
+            if decompressor is None:
+                yield check(chunk)
+                continue
+
+            while chunk:
+                data = decompressor.decompress(chunk, DEFAULT_CHUNK_SIZE)
+                chunk = decompressor.unconsumed_tail
+                if data:
+                    yield check(data)
+
+        if decompressor and (tail := decompressor.flush()):
+            yield check(tail)
+
+        if produced != entry.size or crc32 != entry.crc32:
+            logger.warning(f"Size or CRC mismatch for archive entry {entry.name} in {file_path}")
+            raise ValueError(f"Archive entry {entry.name} is corrupt")
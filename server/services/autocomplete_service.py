@@ -0,0 +1,151 @@
+from bisect import bisect_left, insort
+from typing import Collection
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import autocomplete_index_cache
+from core.config import settings
+from models.document import Document
+from models.folder import Folder
+from repositories.folder_repository import FolderRepository
+from repositories.permission_repository import PermissionRepository
+from schemas.search import AutocompleteItem
+
+FOLDER = "folder"
+DOCUMENT = "document"
+
+
+class PrefixIndex:
+    """Sorted ``(lowercase name, id)`` keys of every folder and document in a category."""
+
+    def __init__(self, version: int | None) -> None:
+        self.version = version
+        self.keys: list[tuple[str, str]] = []
+        self.entries: dict[str, tuple[str, str, uuid.UUID | None]] = {}
+        self.private_folders: set[uuid.UUID] = set()
+
+    def add(self, kind: str, entity_id: uuid.UUID, name: str, folder_id: uuid.UUID | None) -> None:
+        self.remove(entity_id)
+        self.entries[str(entity_id)] = (kind, name, folder_id)
+        insort(self.keys, (name.lower(), str(entity_id)))
+
+    def remove(self, entity_id: uuid.UUID) -> None:
+        entry = self.entries.pop(str(entity_id), None)
+        if entry is None:
+            return
+        key = (entry[1].lower(), str(entity_id))
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+
+    def set_folder_privacy(self, folder_id: uuid.UUID, is_private: bool) -> None:
+        if is_private:
+            self.private_folders.add(folder_id)
+        else:
+            self.private_folders.discard(folder_id)
+
+    def match(self, prefix: str, max_candidates: int) -> list[tuple[str, uuid.UUID, str, uuid.UUID | None]]:
+        prefix = prefix.lower()
+        candidates = []
+        position = bisect_left(self.keys, (prefix, ""))
+        while position < len(self.keys) and len(candidates) < max_candidates:
+            name_key, entity_id = self.keys[position]
+            if not name_key.startswith(prefix):
+                break
+            kind, name, folder_id = self.entries[entity_id]
+            candidates.append((kind, uuid.UUID(entity_id), name, folder_id))
+            position += 1
+        return candidates
+
+
+class AutocompleteService:
+    """Per-worker, lazily built prefix indexes of folder and document names, one per category, held in a
+    size-bounded LRU cache.
+
+    An index is rebuilt when the category's folder tree version changes, so folder changes made on any worker
+    are picked up by the next request. Document changes made through this worker update the index in place;
+    those made by other workers become visible once the index expires after ``AUTOCOMPLETE_INDEX_TTL_SECONDS``.
+    """
+
+    @staticmethod
+    async def suggest(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        prefix: str,
+        granted_folder_ids: Collection[uuid.UUID],
+        is_superuser: bool,
+        limit: int = 10,
+    ) -> list[AutocompleteItem]:
+        index = await AutocompleteService._get_index(db, category_id)
+        candidates = index.match(prefix, limit * settings.AUTOCOMPLETE_CANDIDATE_FACTOR)
+
+        # A folder is guarded by its own privacy flag, a document by the flag of the folder it is in.
+        guarding_folders = [entity_id if kind == FOLDER else folder_id for kind, entity_id, _, folder_id in candidates]
+
+        hidden_folders: set[uuid.UUID] = set()
+        if not is_superuser:
+            private_folder_ids = {folder_id for folder_id in guarding_folders if folder_id in index.private_folders}
+            if private_folder_ids:
+                accessible = await PermissionRepository.get_accessible_folder_ids(
+                    db, private_folder_ids, granted_folder_ids, is_superuser=False
+                )
+                hidden_folders = private_folder_ids - accessible
+
+        suggestions = []
+        for (kind, entity_id, name, folder_id), guarding_folder in zip(candidates, guarding_folders):
+            if guarding_folder in hidden_folders:
+                continue
+            suggestions.append(AutocompleteItem(id=entity_id, kind=kind, name=name, folder_id=folder_id if kind == DOCUMENT else None))
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+    @staticmethod
+    async def _get_index(db: AsyncSession, category_id: uuid.UUID) -> PrefixIndex:
+        version = await FolderRepository.get_tree_version(db, category_id)
+        index = autocomplete_index_cache.get(category_id)
+        if index is None or index.version != version:
+            index = await AutocompleteService._build_index(db, category_id, version)
+            autocomplete_index_cache.put(category_id, index)
+        return index
+
+    @staticmethod
+    async def _build_index(db: AsyncSession, category_id: uuid.UUID, version: int | None) -> PrefixIndex:
+        index = PrefixIndex(version)
+
+        folders = await db.execute(select(Folder.id, Folder.name, Folder.is_private).where(Folder.category_id == category_id))
+        for folder_id, name, is_private in folders.all():
+            index.entries[str(folder_id)] = (FOLDER, name, None)
+            index.keys.append((name.lower(), str(folder_id)))
+            index.set_folder_privacy(folder_id, is_private)
+
+        documents = await db.execute(select(Document.id, Document.name, Document.folder_id).where(Document.category_id == category_id))
+        for document_id, name, folder_id in documents.all():
+            index.entries[str(document_id)] = (DOCUMENT, name, folder_id)
+            index.keys.append((name.lower(), str(document_id)))
+
+        index.keys.sort()
+        return index
+
+    @staticmethod
+    def invalidate(category_id: uuid.UUID) -> None:
+        autocomplete_index_cache.invalidate(category_id)
+
+    @staticmethod
+    def folder_saved(folder: Folder) -> None:
+        index = autocomplete_index_cache.get(folder.category_id)  # type: ignore
+        if index is not None:
+            index.add(FOLDER, folder.id, str(folder.name), None)  # type: ignore
+            index.set_folder_privacy(folder.id, bool(folder.is_private))  # type: ignore
+
+    @staticmethod
+    def document_saved(document: Document) -> None:
+        index = autocomplete_index_cache.get(document.category_id)  # type: ignore
+        if index is not None:
+            index.add(DOCUMENT, document.id, str(document.name), document.folder_id)  # type: ignore
+
+    @staticmethod
+    def entity_removed(category_id: uuid.UUID, entity_id: uuid.UUID) -> None:
+        index = autocomplete_index_cache.get(category_id)
+        if index is not None:
+            index.remove(entity_id)
@@ -1,28 +1,38 @@
-from pathlib import Path
-import shutil
-from typing import Sequence
+import base64
+from datetime import datetime
+import json
+from typing import Any, Sequence
 import uuid
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from repositories.category_repository import CategoryRepository
+from repositories.content_repository import LISTING_ORDERINGS
 from schemas.category import Category as CategorySchema, CategoryContentResponse, CategoryCreatePayload
 from models.category import Category
 from models.department import Department
+from models.user import User
 from repositories.base_repository import BaseRepository
 from schemas.pagination import PaginationInfo, PaginationParams, PaginationResponse
-from core.config import settings
+from core.storage_base import category_key, get_storage
+from schemas.deletion import DeletionStatus
 from schemas.document import DocumentItem
 from schemas.folder import FolderItem
+from services.access_service import AccessService
 from services.department_service import DepartmentService
+from services.placement_service import PlacementService
+from services.deletion_service import DeletionService
 
-CATEGORY_MEDIA_ROOT = Path(settings.MEDIA_ROOT) / "categories"
+
+CURSOR_PHASE_FOLDERS = "f"
+CURSOR_PHASE_DOCUMENTS = "d"
 
 
 class CategoryService:
     @staticmethod
     async def get_categories_for_user_in_organization(db: AsyncSession, user_id: uuid.UUID, organization_id: uuid.UUID) -> Sequence[CategorySchema]:
-        categories = await CategoryRepository.get_categories_for_user_in_organization(db, user_id, organization_id)
+        access = await AccessService.get_effective_access(db, user_id)
+        categories = await CategoryRepository.get_categories_for_user_in_organization(db, access.category_ids, organization_id)
         return [CategorySchema.model_validate(category) for category in categories]
 
     @staticmethod
@@ -31,7 +41,8 @@ class CategoryService:
         await BaseRepository.create_flush(db, category)
 
         try:
-            CategoryService._create_category_dir(category.id)  # type: ignore
+            await PlacementService.assign_category(db, category)
+            await CategoryService._create_category_dir(category.id)  # type: ignore
         except FileExistsError:
             await db.rollback()
             raise HTTPException(status_code=400, detail="Category directory already exists.")
@@ -62,32 +73,24 @@ class CategoryService:
             filters=pagination.filters,
             options=[selectinload(Category.organization)],
             organization_ids=organization_ids,
+            conditions=[Category.deleting_at.is_(None)],
         )
 
     @staticmethod
     async def get_category_by_id(db: AsyncSession, category_id: uuid.UUID) -> Category | None:
-        return await BaseRepository.get_by_id(Category, db, category_id)
+        category = await BaseRepository.get_by_id(Category, db, category_id)
+        return category if category is not None and category.deleting_at is None else None
 
     @staticmethod
     async def get_category_for_user(db: AsyncSession, category_id: uuid.UUID, user_id: uuid.UUID) -> Category | None:
-        return await CategoryRepository.get_category_for_user(db, category_id, user_id)
+        access = await AccessService.get_effective_access(db, user_id)
+        return await CategoryRepository.get_category_for_user(db, category_id, access.category_ids)
 
     @staticmethod
-    async def delete_category(db: AsyncSession, category_id: uuid.UUID) -> None:
-        category = await BaseRepository.get_by_id(Category, db, category_id)
-
-        if category is None:
-            raise HTTPException(status_code=404, detail="Category not found.")
-
-        await BaseRepository.delete(Category, db, category_id)
-
-        try:
-            CategoryService._delete_category_dir(category.id)  # type: ignore
-        except FileNotFoundError:
-            pass  # If the directory does not exist, we can ignore this error
-        except Exception as e:
-            await db.rollback()
-            raise HTTPException(status_code=500, detail=f"Failed to delete category directory: {str(e)}")
+    async def delete_category(db: AsyncSession, category: Category) -> DeletionStatus:
+        """Hide the category right away; its rows and files are removed by ``DeletionService.delete_category``,
+        which the caller should run in the background."""
+        return await DeletionService.start_category_deletion(db, category)
 
     @staticmethod
     async def validate_unique_name_on_update(db: AsyncSession, category_id: uuid.UUID, new_name: str) -> bool:
@@ -103,18 +106,8 @@ class CategoryService:
         await BaseRepository.update(db, category)
 
     @staticmethod
-    def _create_category_dir(category_id: uuid.UUID) -> None:
-        CATEGORY_MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
-        (CATEGORY_MEDIA_ROOT / str(category_id)).mkdir(exist_ok=False)
-
-    @staticmethod
-    def _delete_category_dir(category_id: uuid.UUID) -> None:
-        category_path = CATEGORY_MEDIA_ROOT / str(category_id)
-
-        if category_path.exists() and category_path.is_dir():
-            shutil.rmtree(category_path)
-        else:
-            raise FileNotFoundError(f"Category directory {category_path} does not exist.")
+    async def _create_category_dir(category_id: uuid.UUID) -> None:
+        await get_storage().make_prefix(category_key(category_id), exist_ok=False)
 
     @staticmethod
     async def get_departments_for_category(db: AsyncSession, category_id: uuid.UUID) -> Sequence[Department]:
@@ -137,6 +130,7 @@ class CategoryService:
             raise ValueError("Department is already assigned to this category")
 
         await CategoryRepository.assign_department_to_category(db, category_id, department_id)
+        await AccessService.invalidate_department(db, department_id)
 
     @staticmethod
     async def unassign_department_from_category(db: AsyncSession, category_id: uuid.UUID, department_id: uuid.UUID) -> None:
@@ -145,6 +139,7 @@ class CategoryService:
             raise ValueError(f"Department {department_id} is not assigned to category {category_id}")
 
         await CategoryRepository.unassign_department_from_category(db, category_id, department_id)
+        await AccessService.invalidate_department(db, department_id)
 
     @staticmethod
     async def get_paginated_departments_with_assignment(db: AsyncSession, category_id: uuid.UUID, pagination: PaginationParams) -> PaginationResponse:
@@ -156,13 +151,23 @@ class CategoryService:
         category_id: uuid.UUID,
         folder_id: uuid.UUID | None,
         pagination: PaginationParams,
-        user_id: uuid.UUID,
+        user: User,
         search_query: str | None = None,
+        search_mode: str = "name",
+        cursor: str | None = None,
     ) -> CategoryContentResponse:
+        if cursor is not None:
+            if search_query:
+                raise ValueError("Cursor pagination is not available for searches")
+            return await CategoryService._get_category_content_after_cursor(db, category_id, folder_id, pagination, user, cursor)
+        if search_query and search_mode == "content":
+            return await CategoryService._get_category_content_with_content_search(
+                db, category_id, folder_id, pagination, user, search_query
+            )
         if search_query:
-            return await CategoryService._get_category_content_with_search(db, category_id, folder_id, pagination, user_id, search_query)
+            return await CategoryService._get_category_content_with_search(db, category_id, folder_id, pagination, user, search_query)
         else:
-            return await CategoryService._get_category_content_without_search(db, category_id, folder_id, pagination, user_id)
+            return await CategoryService._get_category_content_without_search(db, category_id, folder_id, pagination, user)
 
     @staticmethod
     async def get_folder_breadcrumb(db: AsyncSession, category, folder_id: uuid.UUID) -> list[dict]:
@@ -182,24 +187,21 @@ class CategoryService:
         category_id: uuid.UUID,
         folder_id: uuid.UUID | None,
         pagination: PaginationParams,
-        user_id: uuid.UUID,
+        user: User,
         search_query: str,
     ) -> CategoryContentResponse:
         from repositories.folder_repository import FolderRepository
         from repositories.document_repository import DocumentRepository
-        from services.user_service import UserService
 
         skip = (pagination.page - 1) * pagination.page_size
 
-        user = await UserService.get_user_by_id(db, user_id)
-        is_superuser = bool(user.is_superuser) if user else False
-        user_department_ids = [dept.id for dept in user.departments] if user else []
+        is_superuser = bool(user.is_superuser)
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
 
         folders, folder_count = await FolderRepository.search_folders_recursive_with_permissions(
             db=db,
             category_id=category_id,
-            user_id=user_id,
-            user_department_ids=user_department_ids,
+            granted_folder_ids=access.granted_folder_ids,
             is_superuser=is_superuser,
             search_query=search_query,
             parent_folder_id=folder_id,
@@ -215,14 +217,13 @@ class CategoryService:
         documents = []
         document_count = 0
         if remaining_slots > 0 or folders_returned == 0:
-            doc_skip = max(0, skip - folder_count) if skip >= folder_count else 0
+            doc_skip = max(0, skip - folder_count)
             doc_limit = remaining_slots if folders_returned > 0 else pagination.page_size
 
             documents, document_count = await DocumentRepository.search_documents_recursive_with_permissions(
                 db=db,
                 category_id=category_id,
-                user_id=user_id,
-                user_department_ids=user_department_ids,
+                granted_folder_ids=access.granted_folder_ids,
                 is_superuser=is_superuser,
                 search_query=search_query,
                 parent_folder_id=folder_id,
@@ -247,28 +248,63 @@ class CategoryService:
         )
 
     @staticmethod
-    async def _get_category_content_without_search(
+    async def _get_category_content_with_content_search(
         db: AsyncSession,
         category_id: uuid.UUID,
         folder_id: uuid.UUID | None,
         pagination: PaginationParams,
-        user_id: uuid.UUID,
+        user: User,
+        search_query: str,
     ) -> CategoryContentResponse:
-        from repositories.folder_repository import FolderRepository
         from repositories.document_repository import DocumentRepository
-        from services.folder_service import FolderService
 
-        skip = (pagination.page - 1) * pagination.page_size
+        is_superuser = bool(user.is_superuser)
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
 
-        folder_count = await FolderRepository.count_folders_by_parent(
-            db, category_id, folder_id, filter_field=pagination.filter_field, filter_value=pagination.filter_value
+        results, total_items = await DocumentRepository.search_documents_by_content_with_permissions(
+            db=db,
+            category_id=category_id,
+            granted_folder_ids=access.granted_folder_ids,
+            is_superuser=is_superuser,
+            search_query=search_query,
+            parent_folder_id=folder_id,
+            skip=pagination.offset,
+            limit=pagination.page_size,
         )
 
-        folders = await FolderRepository.get_folders_by_parent(
+        total_pages = (total_items + pagination.page_size - 1) // pagination.page_size if total_items > 0 else 1
+
+        return CategoryContentResponse(
+            folders=[],
+            documents=[
+                DocumentItem(id=str(d.id), name=str(d.name), mime_type=str(d.mime_type), snippet=snippet) for d, snippet in results
+            ],
+            pagination=PaginationInfo(
+                page=pagination.page,
+                page_size=pagination.page_size,
+                total=total_items,
+                total_pages=total_pages,
+            ),
+        )
+
+    @staticmethod
+    async def _get_category_content_without_search(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        folder_id: uuid.UUID | None,
+        pagination: PaginationParams,
+        user: User,
+    ) -> CategoryContentResponse:
+        from repositories.content_repository import ContentRepository
+
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+        rows, total_items = await ContentRepository.get_folder_content(
             db,
             category_id,
             folder_id,
-            skip=skip,
+            granted_folder_ids=access.granted_folder_ids,
+            is_superuser=bool(user.is_superuser),
+            skip=pagination.offset,
             limit=pagination.page_size,
             filter_field=pagination.filter_field,
             filter_value=pagination.filter_value,
@@ -276,43 +312,108 @@ class CategoryService:
             ordering_desc=pagination.ordering_desc,
         )
 
-        accessible_folders = []
-        for folder in folders:
-            if await FolderService.user_has_access_to_folder(db, folder.id, user_id):  # type: ignore
-                accessible_folders.append(folder)
+        total_pages = (total_items + pagination.page_size - 1) // pagination.page_size if total_items > 0 else 1
 
-        folders = accessible_folders
-        folders_returned = len(folders)
-        remaining_slots = pagination.page_size - folders_returned
+        return CategoryContentResponse(
+            folders=[FolderItem(id=str(row.id), name=row.name, is_private=bool(row.is_private)) for row in rows if row.kind == "folder"],
+            documents=[DocumentItem(id=str(row.id), name=row.name, mime_type=str(row.mime_type)) for row in rows if row.kind == "document"],
+            pagination=PaginationInfo(
+                page=pagination.page,
+                page_size=pagination.page_size,
+                total=total_items,
+                total_pages=total_pages,
+            ),
+        )
 
-        documents = []
-        if remaining_slots > 0:
-            documents = await DocumentRepository.get_documents_by_folder(
+    @staticmethod
+    async def _get_category_content_after_cursor(
+        db: AsyncSession,
+        category_id: uuid.UUID,
+        folder_id: uuid.UUID | None,
+        pagination: PaginationParams,
+        user: User,
+        cursor: str,
+    ) -> CategoryContentResponse:
+        """Keyset pagination over folders, then documents, each ordered by ``(sort key, id)``.
+
+        An empty cursor starts at the first page. Every page is a seek on the composite listing indexes, so
+        deep pages cost the same as the first one, and permission filtering happens in SQL so pages are exact.
+        """
+        from repositories.folder_repository import FolderRepository
+        from repositories.document_repository import DocumentRepository
+
+        ordering = pagination.ordering if pagination.ordering in LISTING_ORDERINGS else "name"
+        listing_options: dict[str, Any] = dict(
+            filter_field=pagination.filter_field,
+            filter_value=pagination.filter_value,
+            ordering=ordering,
+            ordering_desc=pagination.ordering_desc,
+        )
+
+        phase, after = CURSOR_PHASE_FOLDERS, None
+        if cursor:
+            phase, after = CategoryService._decode_content_cursor(cursor, ordering, pagination.ordering_desc)
+
+        folders = []
+        if phase == CURSOR_PHASE_FOLDERS:
+            access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+            folders = await FolderRepository.get_folders_by_parent_after(
                 db,
                 category_id,
                 folder_id,
-                skip=0,
-                limit=remaining_slots,
-                filter_field=pagination.filter_field,
-                filter_value=pagination.filter_value,
-                ordering=pagination.ordering,
-                ordering_desc=pagination.ordering_desc,
+                granted_folder_ids=access.granted_folder_ids,
+                is_superuser=bool(user.is_superuser),
+                after=after,
+                limit=pagination.page_size + 1,
+                **listing_options,
             )
+            after = None
 
-        document_count = await DocumentRepository.count_documents_by_folder(
-            db, category_id, folder_id, filter_field=pagination.filter_field, filter_value=pagination.filter_value
-        )
-
-        total_items = folder_count + document_count
-        total_pages = (total_items + pagination.page_size - 1) // pagination.page_size if total_items > 0 else 1
+        next_cursor = None
+        documents = []
+        if len(folders) > pagination.page_size:
+            folders = folders[: pagination.page_size]
+            next_cursor = CategoryService._encode_content_cursor(CURSOR_PHASE_FOLDERS, folders[-1], ordering, pagination.ordering_desc)
+        else:
+            remaining_slots = pagination.page_size - len(folders)
+            documents = await DocumentRepository.get_documents_by_folder_after(
+                db, category_id, folder_id, after=after, limit=remaining_slots + 1, **listing_options
+            )
+            if len(documents) > remaining_slots:
+                documents = documents[:remaining_slots]
+                next_cursor = CategoryService._encode_content_cursor(
+                    CURSOR_PHASE_DOCUMENTS, documents[-1] if documents else None, ordering, pagination.ordering_desc
+                )
 
         return CategoryContentResponse(
-            folders=[FolderItem(id=str(f.id), name=str(f.name), is_private=f.is_private) for f in folders],
+            folders=[FolderItem(id=str(f.id), name=str(f.name), is_private=bool(f.is_private)) for f in folders],
             documents=[DocumentItem(id=str(d.id), name=str(d.name), mime_type=str(d.mime_type)) for d in documents],
-            pagination=PaginationInfo(
-                page=pagination.page,
-                page_size=pagination.page_size,
-                total=total_items,
-                total_pages=total_pages,
-            ),
+            next_cursor=next_cursor,
         )
+
+    @staticmethod
+    def _encode_content_cursor(phase: str, last_item: Any, ordering: str, ordering_desc: bool) -> str:
+        payload: dict[str, Any] = {"p": phase, "o": ordering, "r": ordering_desc}
+        if last_item is not None:
+            value = getattr(last_item, ordering)
+            payload["v"] = value.isoformat() if isinstance(value, datetime) else value
+            payload["i"] = str(last_item.id)
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+    @staticmethod
+    def _decode_content_cursor(cursor: str, ordering: str, ordering_desc: bool) -> tuple[str, tuple | None]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            phase, cursor_ordering = payload["p"], (payload["o"], payload["r"])
+            after = None
+            if "i" in payload:
+                value = datetime.fromisoformat(payload["v"]) if payload["o"] == "created_at" else str(payload["v"])
+                after = (value, uuid.UUID(payload["i"]))
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid content cursor")
+
+        if phase not in (CURSOR_PHASE_FOLDERS, CURSOR_PHASE_DOCUMENTS):
+            raise ValueError("Invalid content cursor")
+        if cursor_ordering != (ordering, ordering_desc):
+            raise ValueError("Cursor does not match the requested ordering")
+        return phase, after
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import uuid
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.storage_base import category_key, get_storage
+from models.category import Category
+from models.department import Department
+from models.document import Document
+from models.folder import Folder
+from models.organization import Organization
+from repositories.deletion_repository import DeletionRepository
+from schemas.deletion import DeletionStatus
+from services.access_service import AccessService
+from services.autocomplete_service import AutocompleteService
+
+
+logger = logging.getLogger(__name__)
+
+CATEGORY = "category"
+ORGANIZATION = "organization"
+
+
+class DeletionService:
+    """Deletes categories and organizations in the background.
+
+    The entity is first marked as deleting, which hides it from users and admin listings, and its rows are
+    then removed in bounded batches (documents, then folders deepest first) so no request loads a whole
+    tenant into memory or holds long locks. Files are removed before the category row itself, so a failed
+    deletion can simply be resumed. Deletions interrupted by a restart are resumed on startup.
+    """
+
+    _jobs: dict[uuid.UUID, DeletionStatus] = {}
+    _tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    async def get_status(db: AsyncSession, entity: str, entity_id: uuid.UUID) -> DeletionStatus | None:
+        """Return the progress of a deletion. The worker running the job reports its own counters; any other
+        worker derives the state from the ``deleting_at`` marker and the rows that are left. Returns None once
+        the entity is gone, unless this worker ran the job."""
+        status = DeletionService._jobs.get(entity_id)
+        if status is not None and status.entity == entity:
+            return status
+
+        if entity == CATEGORY:
+            row = await DeletionRepository.get_category_progress(db, entity_id)
+            if row is None:
+                return None
+            organization_id, documents, folders = row
+            return DeletionStatus(
+                entity=CATEGORY,
+                entity_id=entity_id,
+                organization_id=organization_id,
+                state="deleting",
+                documents_remaining=documents,
+                folders_remaining=folders,
+            )
+
+        row = await DeletionRepository.get_organization_progress(db, entity_id)
+        if row is None:
+            return None
+        categories, documents, folders, departments = row
+        return DeletionStatus(
+            entity=ORGANIZATION,
+            entity_id=entity_id,
+            organization_id=entity_id,
+            state="deleting",
+            categories_remaining=categories,
+            documents_remaining=documents,
+            folders_remaining=folders,
+            departments_remaining=departments,
+        )
+
+    @staticmethod
+    async def start_category_deletion(db: AsyncSession, category: Category) -> DeletionStatus:
+        await DeletionRepository.mark_category_deleting(db, category.id)  # type: ignore
+        return DeletionService._create_job(CATEGORY, category.id, category.organization_id)  # type: ignore
+
+    @staticmethod
+    async def start_organization_deletion(db: AsyncSession, organization: Organization) -> DeletionStatus:
+        await DeletionRepository.mark_organization_deleting(db, organization.id)  # type: ignore
+        return DeletionService._create_job(ORGANIZATION, organization.id, organization.id)  # type: ignore
+
+    @staticmethod
+    def _create_job(entity: str, entity_id: uuid.UUID, organization_id: uuid.UUID) -> DeletionStatus:
+        status = DeletionStatus(entity=entity, entity_id=entity_id, organization_id=organization_id, state="pending")
+        DeletionService._jobs[entity_id] = status
+        return status
+
+    @staticmethod
+    async def resume_pending() -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                organizations, categories = await DeletionRepository.get_pending_deletions(db)
+        except Exception as e:
+            logger.warning(f"Failed to look up pending deletions: {e}")
+            return
+
+        for (organization_id,) in organizations:
+            DeletionService._create_job(ORGANIZATION, organization_id, organization_id)
+            DeletionService._spawn(DeletionService.delete_organization(organization_id))
+        for category_id, organization_id in categories:
+            DeletionService._create_job(CATEGORY, category_id, organization_id)
+            DeletionService._spawn(DeletionService.delete_category(category_id))
+
+    @staticmethod
+    def _spawn(coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        DeletionService._tasks.add(task)
+        task.add_done_callback(DeletionService._tasks.discard)
+
+    @staticmethod
+    async def delete_category(category_id: uuid.UUID) -> None:
+        status = DeletionService._jobs[category_id]
+        try:
+            async with AsyncSessionLocal() as db:
+                await DeletionService._delete_category_rows(db, category_id, status)
+            status.state = "completed"
+            logger.info(f"Deleted category {category_id}")
+        except Exception as e:
+            status.state = "failed"
+            status.error = str(e)
+            logger.error(f"Failed to delete category {category_id}: {e}")
+
+    @staticmethod
+    async def delete_organization(organization_id: uuid.UUID) -> None:
+        status = DeletionService._jobs[organization_id]
+        try:
+            async with AsyncSessionLocal() as db:
+                for category_id in await DeletionRepository.get_category_ids(db, organization_id):
+                    await DeletionService._delete_category_rows(db, category_id, status)
+
+                status.state = "deleting_departments"
+                department_ids = await db.execute(select(Department.id).where(Department.organization_id == organization_id))
+                for department_id in department_ids.scalars().all():
+                    await AccessService.invalidate_department(db, department_id)
+                status.departments_deleted += await DeletionService._delete_in_batches(
+                    db, Department, Department.organization_id == organization_id
+                )
+
+                await DeletionRepository.delete_batch(db, Organization, Organization.id == organization_id, 1)
+            status.state = "completed"
+            logger.info(f"Deleted organization {organization_id}")
+        except Exception as e:
+            status.state = "failed"
+            status.error = str(e)
+            logger.error(f"Failed to delete organization {organization_id}: {e}")
+
+    @staticmethod
+    async def _delete_category_rows(db: AsyncSession, category_id: uuid.UUID, status: DeletionStatus) -> None:
+        status.state = "deleting_documents"
+        status.documents_deleted += await DeletionService._delete_in_batches(db, Document, Document.category_id == category_id)
+
+        # Deepest folders go first so the ON DELETE CASCADE on parent_id never fans out beyond a batch.
+        status.state = "deleting_folders"
+        status.folders_deleted += await DeletionService._delete_in_batches(
+            db, Folder, Folder.category_id == category_id, order_by=func.nlevel(Folder.path).desc()
+        )
+
+        status.state = "deleting_files"
+        await get_storage().delete_prefix(category_key(category_id))
+
+        await DeletionRepository.delete_batch(db, Category, Category.id == category_id, 1)
+        status.categories_deleted += 1
+        AutocompleteService.invalidate(category_id)
+
+    @staticmethod
+    async def _delete_in_batches(db: AsyncSession, model, condition, order_by=None) -> int:
+        deleted = 0
+        while batch := await DeletionRepository.delete_batch(db, model, condition, settings.DELETION_BATCH_SIZE, order_by):
+            deleted += batch
+            await asyncio.sleep(0)
+        return deleted
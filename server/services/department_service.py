@@ -6,6 +6,7 @@ from schemas.department import Department as DepartmentSchema
 from repositories.base_repository import BaseRepository
 from schemas.pagination import PaginationParams, PaginationResponse
 from repositories.department_repository import DepartmentRepository
+from services.access_service import AccessService
 from services.user_service import UserService
 
 
@@ -43,6 +44,7 @@ class DepartmentService:
     async def delete_department(db: AsyncSession, department_id: uuid.UUID) -> None:
         department = await BaseRepository.get_by_id(Department, db, department_id)
         if department:
+            await AccessService.invalidate_department(db, department.id)  # type: ignore
             await BaseRepository.delete(model=Department, db=db, entity_id=str(department.id))
 
     @staticmethod
@@ -86,6 +88,7 @@ class DepartmentService:
             raise ValueError(f"User {user_id} is not assigned to organization {department.organization_id}")
 
         await DepartmentRepository.assign_user_to_department(db, user_id, department_id)
+        AccessService.invalidate_user(user_id)
 
     @staticmethod
     async def unassign_user_from_department(db: AsyncSession, user_id: uuid.UUID, department_id: uuid.UUID) -> None:
@@ -95,6 +98,7 @@ class DepartmentService:
             raise ValueError(f"User {user_id} is not assigned to department {department_id}")
 
         await DepartmentRepository.unassign_user_from_department(db, user_id, department_id)
+        AccessService.invalidate_user(user_id)
 
     @staticmethod
     async def is_department_name_unique_by_organization(db: AsyncSession, organization_id: uuid.UUID, name: str) -> bool:
@@ -1,21 +1,30 @@
-import os
 import uuid
 import hashlib
 import mimetypes
-import asyncio
+import time
 
 from fastapi import HTTPException, UploadFile
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy import select
+from core.cache import document_body_cache
 from core.config import settings
+from core.storage_base import category_key, content_disposition, get_storage, run_concurrently
 from repositories.base_repository import BaseRepository
 from repositories.document_repository import DocumentRepository
-from models.document import Document
+from models.document import Document, StorageTier
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Collection, Optional, Sequence
 
 from models.user import User
 from models.folder import Folder
+from schemas.document import BulkDocumentResult
+from services.access_tracker import AccessTracker
+from services.autocomplete_service import AutocompleteService
+from services.permission_service import PermissionService
 from services.folder_service import FolderService
+from services.tiering_service import TieringService
+from services.trash_service import TrashService
 
 
 class DocumentService:
@@ -52,6 +61,8 @@ class DocumentService:
         result = await db.execute(query)
         document = result.scalar_one_or_none()
         if document:
+            DocumentService.invalidate_cached_body(document)
+            AutocompleteService.entity_removed(document.category_id, document.id)  # type: ignore
             await db.delete(document)
             await db.commit()
 
@@ -60,6 +71,7 @@ class DocumentService:
         document = Document(**document_data)
         await BaseRepository.create(db, document)
         await BaseRepository.refresh(db, document, ["category"])
+        AutocompleteService.document_saved(document)
         return document
 
     @staticmethod
@@ -71,6 +83,8 @@ class DocumentService:
         else:
             data = payload
 
+        DocumentService.invalidate_cached_body(document)  # type: ignore
+
         for field, value in data.items():
             setattr(document, field, value)
 
@@ -90,45 +104,168 @@ class DocumentService:
 
         try:
             await DocumentService._rename_document_file(db, document, new_name)
+            DocumentService.invalidate_cached_body(document)
             document.name = new_name  # type: ignore
             await BaseRepository.update(db, document)
+            AutocompleteService.document_saved(document)
         except Exception:
             await db.rollback()
             raise
 
     @staticmethod
-    async def get_file_path(db: AsyncSession, document: Document) -> str:
+    async def get_file_path(db: AsyncSession, document: Document, resolve_tier: bool = True) -> str:
         if document.folder_id is None:
-            return os.path.join(settings.MEDIA_ROOT, "categories", str(document.category_id), str(document.name))
+            file_path = category_key(document.category_id, name=str(document.name))  # type: ignore
+        else:
+            folder = await FolderService.get_folder_by_id(db, document.folder_id)  # type: ignore
+            file_path = category_key(document.category_id, folder.path, str(document.name))  # type: ignore
+
+        if resolve_tier and document.storage_tier == StorageTier.COLD:
+            await TieringService.promote(db, document, file_path)
+
+        return file_path
+
+    @staticmethod
+    def record_access(document: Document) -> None:
+        AccessTracker.record(document.id)  # type: ignore
 
-        folder = await FolderService.get_folder_by_id(db, document.folder_id)  # type: ignore
-        folder_path = await FolderService.convert_ltree_to_path(folder.path)  # type: ignore
-        return os.path.join(settings.MEDIA_ROOT, "categories", str(document.category_id), folder_path, str(document.name))
+    @staticmethod
+    async def is_file_exists(file_path: str) -> bool:
+        return await get_storage().exists(file_path)
 
     @staticmethod
-    def is_file_exists(file_path: str) -> bool:
-        return os.path.isfile(file_path)
+    async def build_file_response(
+        file_path: str, filename: str, media_type: str, as_attachment: bool = False
+    ) -> FileResponse | RedirectResponse | StreamingResponse:
+        storage = get_storage()
+
+        presigned_url = await storage.presigned_url(file_path, filename, media_type, as_attachment=as_attachment)
+        if presigned_url:
+            return RedirectResponse(presigned_url, status_code=307)
+
+        headers = {"Content-Disposition": content_disposition(filename, as_attachment)}
+
+        local_path = storage.local_path(file_path)
+        if local_path:
+            return FileResponse(path=local_path, media_type=media_type, headers=headers)
+
+        return StreamingResponse(storage.iter_chunks(file_path), media_type=media_type, headers=headers)
+
+    @staticmethod
+    def is_body_cacheable(document: Document) -> bool:
+        return (
+            document.file_hash is not None
+            and document.file_size is not None
+            and document.file_size <= settings.DOCUMENT_CACHE_MAX_ITEM_BYTES  # type: ignore
+        )
+
+    @staticmethod
+    async def get_cached_body(db: AsyncSession, document: Document) -> bytes | None:
+        """Return the body of a small document from the per-worker cache, loading it from storage on a miss.
+
+        Returns None for documents that are too large to cache or whose file is missing.
+        """
+        if not DocumentService.is_body_cacheable(document):
+            return None
+
+        body = document_body_cache.get(document.file_hash)
+        if body is not None:
+            return body
+
+        file_path = await DocumentService.get_file_path(db, document)
+        return await DocumentService._read_into_cache(str(document.file_hash), file_path)
+
+    @staticmethod
+    async def _read_into_cache(file_hash: str, file_path: str) -> bytes | None:
+        body = await DocumentService._read_body(file_path)
+        if body is not None and len(body) <= settings.DOCUMENT_CACHE_MAX_ITEM_BYTES:
+            document_body_cache.put(file_hash, body)
+        return body
+
+    @staticmethod
+    async def _read_body(file_path: str) -> bytes | None:
+        storage = get_storage()
+        if not await storage.exists(file_path):
+            return None
+        return b"".join([chunk async for chunk in storage.iter_chunks(file_path)])
+
+    @staticmethod
+    def _hash_matches(body: bytes, file_hash: str) -> bool:
+        """Check a body against a stored hash: uploads store an MD5, synchronized files a SHA-256 hex digest."""
+        algorithm = {32: hashlib.md5, 64: hashlib.sha256}.get(len(file_hash))
+        return algorithm is not None and algorithm(body).hexdigest() == file_hash
+
+    @staticmethod
+    def invalidate_cached_body(document: Document) -> None:
+        if document.file_hash is not None:
+            document_body_cache.invalidate(document.file_hash)
+
+    @staticmethod
+    def build_body_response(body: bytes, filename: str, media_type: str, as_attachment: bool = False) -> Response:
+        return Response(content=body, media_type=media_type, headers={"Content-Disposition": content_disposition(filename, as_attachment)})
+
+    @staticmethod
+    async def get_signed_url_claims(db: AsyncSession, document: Document, as_attachment: bool = False) -> dict:
+        """Everything needed to serve the document later without a database round trip."""
+        file_path = await DocumentService.get_file_path(db, document)
+        return {
+            "d": str(document.id),
+            "h": document.file_hash,
+            "k": file_path,
+            "n": document.name,
+            "m": document.mime_type or "application/octet-stream",
+            "s": document.file_size,
+            "a": as_attachment,
+        }
+
+    @staticmethod
+    async def build_signed_response(claims: dict) -> Response:
+        file_hash, file_path, filename, media_type, as_attachment = (
+            claims["h"], claims["k"], claims["n"], claims["m"], claims["a"]
+        )
+
+        # The file may have changed at its key since the URL was signed, so bytes read from storage are only
+        # cached and tagged with the token's hash once they are verified against it.
+        verified = False
+        if file_hash and claims.get("s") is not None and claims["s"] <= settings.DOCUMENT_CACHE_MAX_ITEM_BYTES:
+            body = document_body_cache.get(file_hash)
+            verified = body is not None
+            if body is None:
+                body = await DocumentService._read_body(file_path)
+                if body is None:
+                    raise HTTPException(status_code=404, detail="File not found on server")
+                verified = DocumentService._hash_matches(body, file_hash)
+                if verified and len(body) <= settings.DOCUMENT_CACHE_MAX_ITEM_BYTES:
+                    document_body_cache.put(file_hash, body)
+            response = DocumentService.build_body_response(body, filename, media_type, as_attachment=as_attachment)
+        else:
+            if not await DocumentService.is_file_exists(file_path):
+                raise HTTPException(status_code=404, detail="File not found on server")
+            response = await DocumentService.build_file_response(file_path, filename, media_type, as_attachment=as_attachment)
+
+        AccessTracker.record(uuid.UUID(claims["d"]))
+        if verified:
+            response.headers["ETag"] = f'"{file_hash}"'
+        response.headers["Cache-Control"] = f"private, max-age={max(int(claims['exp'] - time.time()), 0)}"
+        return response
 
     @staticmethod
     async def is_user_permitted_to_view_document(db: AsyncSession, user: User, document_id: uuid.UUID) -> bool:
-        return await DocumentRepository.is_user_permitted_to_view_document(db, user, document_id)
+        return document_id in await PermissionService.get_viewable_document_ids(db, user, [document_id])
 
     @staticmethod
     async def generate_document_file_path(
         db: AsyncSession, category_id: uuid.UUID, original_filename: str, folder_id: Optional[uuid.UUID] = None
     ) -> str:
         if not folder_id:
-            file_path = os.path.join(settings.MEDIA_ROOT, "categories", str(category_id), original_filename)
-            return file_path
+            return category_key(category_id, name=original_filename)
 
         folder = await FolderService.get_folder_by_id(db, folder_id)
 
         if not folder or bool(folder.category_id != category_id):
             raise ValueError("Invalid folder ID for the given category")
 
-        folder_path = await FolderService.convert_ltree_to_path(folder.path)
-
-        return os.path.join(settings.MEDIA_ROOT, "categories", str(category_id), folder_path, original_filename)
+        return category_key(category_id, folder.path, original_filename)
 
     @staticmethod
     async def generate_file_path(db: AsyncSession, document_name: str, folder_id: Optional[uuid.UUID]) -> str:
@@ -142,20 +279,18 @@ class DocumentService:
 
         folder_path = await FolderService.convert_ltree_to_path(folder.path)
 
-        return os.path.join(folder_path, document_name)
+        return f"{folder_path}/{document_name}"
 
     @staticmethod
     async def save_document_file(file_path: str, file_data: UploadFile) -> None:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file:
-            file.write(await file_data.read())
+        await file_data.seek(0)
+        await get_storage().save(file_path, file_data.file)
 
     @staticmethod
     async def get_document_hash(file_path: str) -> str:
         hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
+        async for chunk in get_storage().iter_chunks(file_path):
+            hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
     @staticmethod
@@ -172,8 +307,7 @@ class DocumentService:
     @staticmethod
     async def cleanup_file(file_path: str) -> None:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            await get_storage().delete(file_path)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to cleanup file {file_path}: {str(e)}")
 
@@ -208,6 +342,7 @@ class DocumentService:
         file_size: int,
         category_id: uuid.UUID,
         folder_id: Optional[uuid.UUID] = None,
+        content_text: Optional[str] = None,
     ) -> None:
         await DocumentService.create_document(
             db,
@@ -219,6 +354,7 @@ class DocumentService:
                 "category_id": category_id,
                 "folder_id": folder_id,
                 "sync_status": "SYNCED",
+                "content_text": content_text,
             },
         )
 
@@ -237,17 +373,18 @@ class DocumentService:
         if existing_document:
             raise HTTPException(status_code=409, detail=f"Document with name '{new_name}' already exists in this location")
 
+        storage = get_storage()
         file_path = await DocumentService.get_file_path(db, document)
-        new_file_path = os.path.join(os.path.dirname(file_path), new_name)
+        new_file_path = f"{file_path.rsplit('/', 1)[0]}/{new_name}"
 
-        if not os.path.exists(file_path):
+        if not await storage.exists(file_path):
             raise HTTPException(status_code=500, detail=f"File not found on filesystem: {file_path}")
 
-        if os.path.exists(new_file_path):
+        if await storage.exists(new_file_path):
             raise HTTPException(status_code=409, detail=f"File with name '{new_name}' already exists in the filesystem")
 
         try:
-            os.rename(file_path, new_file_path)
+            await storage.move(file_path, new_file_path)
         except OSError as e:
             raise HTTPException(status_code=500, detail=f"Failed to rename file on filesystem: {str(e)}")
 
@@ -275,16 +412,58 @@ class DocumentService:
         if existing and existing.id is not document_id:
             raise HTTPException(status_code=409, detail="Document with this name already exists in the target folder")
 
-        async def move_file() -> None:
-            file_exists = await asyncio.to_thread(os.path.exists, old_file_path_str)
-            if file_exists:
-                await asyncio.to_thread(os.makedirs, os.path.dirname(new_file_path_str), exist_ok=True)
-                await asyncio.to_thread(os.rename, old_file_path_str, new_file_path_str)
-
-        await move_file()
+        storage = get_storage()
+        if await storage.exists(old_file_path_str):
+            await storage.move(old_file_path_str, new_file_path_str)
 
+        DocumentService.invalidate_cached_body(document)
         document.folder_id = new_folder_id # type: ignore
         await BaseRepository.update(db, document)
+        AutocompleteService.document_saved(document)
+
+    @staticmethod
+    async def copy_document(
+        db: AsyncSession, document: Document, target_folder: Optional[Folder], new_name: Optional[str] = None
+    ) -> uuid.UUID:
+        """Copy a document into ``target_folder`` (or its category root). The file is cloned by the storage
+        backend and the row, including its extracted text, is copied in the database."""
+        if target_folder is not None and target_folder.category_id != document.category_id:  # type: ignore
+            raise HTTPException(status_code=400, detail="Target folder must belong to the same category")
+
+        name = str(document.name)
+        if new_name:
+            name = new_name
+            extension = mimetypes.guess_extension(document.mime_type) or ""  # type: ignore
+            if extension and not name.lower().endswith(extension.lower()):
+                name += extension
+
+        target_folder_id = target_folder.id if target_folder is not None else None
+        if await DocumentRepository.get_taken_names(db, target_folder_id, [(document.category_id, name)]):  # type: ignore
+            raise HTTPException(status_code=409, detail=f"Document with name '{name}' already exists in the target folder")
+
+        storage = get_storage()
+        file_path = await DocumentService.get_file_path(db, document, resolve_tier=False)
+        target_path = category_key(document.category_id, target_folder.path if target_folder is not None else None, name)  # type: ignore
+
+        if await storage.exists(target_path):
+            raise HTTPException(status_code=409, detail=f"File with name '{name}' already exists in the filesystem")
+
+        try:
+            await storage.copy(file_path, target_path)
+        except FileNotFoundError:
+            # A document whose file is already missing is copied in the database only, like move_document does.
+            pass
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to copy file on filesystem: {str(e)}")
+
+        try:
+            copy_id = await DocumentRepository.copy_document(db, document.id, target_folder_id, name)  # type: ignore
+        except Exception:
+            await DocumentService._delete_file(target_path)
+            raise
+
+        AutocompleteService.document_saved(Document(id=copy_id, name=name, folder_id=target_folder_id, category_id=document.category_id))
+        return copy_id
 
     @staticmethod
     async def delete_document(db: AsyncSession, document_id: uuid.UUID) -> None:
@@ -292,23 +471,153 @@ class DocumentService:
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        file_path = await DocumentService.get_file_path(db, document)
+        file_path = await DocumentService.get_file_path(db, document, resolve_tier=False)
 
+        DocumentService.invalidate_cached_body(document)
+        AutocompleteService.entity_removed(document.category_id, document.id)  # type: ignore
         await db.delete(document)
 
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            await get_storage().delete(file_path)
         except Exception:
             await db.rollback()
             raise HTTPException(status_code=500, detail="Failed to delete document file, database changes rolled back")
 
         await db.commit()
 
+    @staticmethod
+    async def get_documents_by_ids_with_category(db: AsyncSession, document_ids: Collection[uuid.UUID]) -> Sequence[Document]:
+        return await DocumentRepository.get_by_ids_with_category(db, document_ids)
+
+    @staticmethod
+    async def bulk_move_documents(
+        db: AsyncSession, documents: Sequence[Document], target_folder: Optional[Folder]
+    ) -> dict[uuid.UUID, BulkDocumentResult]:
+        """Move documents into ``target_folder``, or each into its category root, with concurrent file renames
+        and a single UPDATE. Returns a result per document."""
+        results: dict[uuid.UUID, BulkDocumentResult] = {}
+        target_folder_id = target_folder.id if target_folder is not None else None
+
+        candidates: dict[tuple[uuid.UUID, str], Document] = {}
+        for document in documents:
+            key = (document.category_id, str(document.name))
+            if target_folder is not None and document.category_id != target_folder.category_id:  # type: ignore
+                results[document.id] = BulkDocumentResult(id=document.id, status="failed", detail="Target folder belongs to a different category")  # type: ignore
+            elif document.folder_id == target_folder_id:  # type: ignore
+                results[document.id] = BulkDocumentResult(id=document.id, status="unchanged")  # type: ignore
+            elif key in candidates:
+                results[document.id] = BulkDocumentResult(id=document.id, status="conflict", detail="Another document with this name is moved to the same location")  # type: ignore
+            else:
+                candidates[key] = document  # type: ignore
+
+        taken = await DocumentRepository.get_taken_names(db, target_folder_id, candidates.keys())  # type: ignore
+        for key in taken:
+            document = candidates.pop(key)
+            results[document.id] = BulkDocumentResult(id=document.id, status="conflict", detail="Document with this name already exists in the target folder")  # type: ignore
+
+        movable = list(candidates.values())
+        folder_paths = await FolderService.get_folder_paths(db, {document.folder_id for document in movable if document.folder_id is not None})  # type: ignore
+        target_path = target_folder.path if target_folder is not None else None
+        renames = [
+            (
+                category_key(document.category_id, folder_paths.get(document.folder_id), str(document.name)),  # type: ignore
+                category_key(document.category_id, target_path, str(document.name)),  # type: ignore
+            )
+            for document in movable
+        ]
+
+        errors = await run_concurrently(DocumentService._move_file(old, new) for old, new in renames)
+        moved = []
+        for document, rename, error in zip(movable, renames, errors):
+            if error is None:
+                moved.append((document, rename))
+            else:
+                results[document.id] = BulkDocumentResult(id=document.id, status="failed", detail=f"Failed to move file: {error}")  # type: ignore
+
+        if moved:
+            try:
+                await DocumentRepository.move_to_folder(db, [document.id for document, _ in moved], target_folder_id)  # type: ignore
+            except Exception:
+                await run_concurrently(DocumentService._move_file(new, old) for _, (old, new) in moved)
+                raise
+
+        for document, _ in moved:
+            DocumentService.invalidate_cached_body(document)
+            set_committed_value(document, "folder_id", target_folder_id)
+            set_committed_value(document, "storage_tier", StorageTier.HOT)
+            AutocompleteService.document_saved(document)
+            results[document.id] = BulkDocumentResult(id=document.id, status="moved")  # type: ignore
+        return results
+
+    @staticmethod
+    async def bulk_delete_documents(
+        db: AsyncSession, documents: Sequence[Document]
+    ) -> tuple[dict[uuid.UUID, BulkDocumentResult], list[str]]:
+        """Move the documents' files into the trash concurrently, then delete the rows of every document
+        whose file was trashed in a single DELETE. If the DELETE fails, the files are moved back.
+
+        Returns a result per document and the trash entries to purge once the request is done.
+        """
+        results: dict[uuid.UUID, BulkDocumentResult] = {}
+        folder_paths = await FolderService.get_folder_paths(db, {document.folder_id for document in documents if document.folder_id is not None})  # type: ignore
+        file_paths = [
+            category_key(document.category_id, folder_paths.get(document.folder_id), str(document.name))  # type: ignore
+            for document in documents
+        ]
+
+        outcomes = await run_concurrently(
+            DocumentService._trash_file(file_path, document.category_id) for document, file_path in zip(documents, file_paths)  # type: ignore
+        )
+        deleted = []
+        for document, file_path, (entry, error) in zip(documents, file_paths, outcomes):
+            if error is None:
+                deleted.append((document, file_path, entry))
+            else:
+                results[document.id] = BulkDocumentResult(id=document.id, status="failed", detail=f"Failed to delete file: {error}")  # type: ignore
+
+        trashed = [(entry, file_path) for _, file_path, entry in deleted if entry is not None]
+        if deleted:
+            try:
+                await DocumentRepository.delete_by_ids(db, [document.id for document, _, _ in deleted])  # type: ignore
+            except Exception:
+                await run_concurrently(TrashService.restore_object(entry, file_path) for entry, file_path in trashed)
+                raise
+
+        for document, _, _ in deleted:
+            DocumentService.invalidate_cached_body(document)
+            AutocompleteService.entity_removed(document.category_id, document.id)  # type: ignore
+            results[document.id] = BulkDocumentResult(id=document.id, status="deleted")  # type: ignore
+        return results, [entry for entry, _ in trashed]
+
+    @staticmethod
+    async def _move_file(old_path: str, new_path: str) -> Exception | None:
+        storage = get_storage()
+        try:
+            await storage.move(old_path, new_path)
+        except Exception as e:
+            # A document whose file is already missing is moved in the database only, like move_document does.
+            if await storage.exists(old_path):
+                return e
+        return None
+
+    @staticmethod
+    async def _trash_file(file_path: str, category_id: uuid.UUID) -> tuple[str | None, Exception | None]:
+        try:
+            return await TrashService.move_object_to_trash(file_path, category_id), None
+        except Exception as e:
+            return None, e
+
+    @staticmethod
+    async def _delete_file(file_path: str) -> Exception | None:
+        try:
+            await get_storage().delete(file_path)
+        except Exception as e:
+            return e
+        return None
+
     @staticmethod
     async def _get_file_path_for_folder(db: AsyncSession, document: Document, folder: Optional[Folder]) -> str:
         if folder is None:
-            return os.path.join(settings.MEDIA_ROOT, "categories", str(document.category_id), str(document.name))
+            return category_key(document.category_id, name=str(document.name))  # type: ignore
 
-        folder_path = await FolderService.convert_ltree_to_path(folder.path)
-        return os.path.join(settings.MEDIA_ROOT, "categories", str(document.category_id), folder_path, str(document.name))
+        return category_key(document.category_id, folder.path, str(document.name))  # type: ignore
@@ -1,19 +1,33 @@
-import asyncio
-import os
-import shutil
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Optional, Sequence
 import uuid
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy_utils import Ltree
 from models.folder import Folder
+from models.user import User
 from repositories.folder_repository import FolderRepository
 from repositories.base_repository import BaseRepository
 from schemas.pagination import PaginationResponse
-from schemas.folder import FolderUpdate, FolderTreeNode
-from core.config import settings
+from schemas.folder import FolderChildNode, FolderCopyResult, FolderUpdate, FolderTreeNode
+from core.cache import folder_tree_cache
+from core.storage_base import category_key, get_storage, run_concurrently
+from services.access_service import AccessService
+from services.autocomplete_service import AutocompleteService
+from services.permission_service import PermissionService
+from services.trash_service import TrashService
 from services.user_service import UserService
 
 
+@dataclass
+class FolderTreeRow:
+    id: uuid.UUID
+    name: str
+    parent_id: uuid.UUID | None
+    path: str
+    is_private: bool
+
+
 class FolderService:
     @staticmethod
     async def get_folder_by_id(db: AsyncSession, folder_id: uuid.UUID) -> Folder | None:
@@ -23,6 +37,10 @@ class FolderService:
     async def get_folder_by_id_with_category(db: AsyncSession, folder_id: uuid.UUID) -> Optional[Folder]:
         return await FolderRepository.get_by_id_with_category(db, folder_id)
 
+    @staticmethod
+    async def get_folder_paths(db: AsyncSession, folder_ids: Collection[uuid.UUID]) -> dict[uuid.UUID, str]:
+        return await FolderRepository.get_paths(db, folder_ids)
+
     @staticmethod
     async def get_by_path(db: AsyncSession, category_id: uuid.UUID, path: str) -> Optional[Folder]:
         return await FolderRepository.get_by_path(db, category_id, path)
@@ -34,8 +52,9 @@ class FolderService:
     @staticmethod
     async def create_folder(db: AsyncSession, data: Dict) -> Folder | None:
         folder = Folder(**data)
-        await BaseRepository.create(db, folder)
+        await FolderRepository.create(db, folder)
         await BaseRepository.refresh(db, folder, ["category"])
+        AutocompleteService.folder_saved(folder)
         return folder
 
     @staticmethod
@@ -49,10 +68,12 @@ class FolderService:
     @staticmethod
     async def assign_department_to_folder(db: AsyncSession, folder: Folder, department) -> None:
         await FolderRepository.assign_department_to_folder(db, folder, department)
+        await AccessService.invalidate_department(db, department.id)
 
     @staticmethod
     async def unassign_department_from_folder(db: AsyncSession, folder: Folder, department) -> None:
         await FolderRepository.unassign_department_from_folder(db, folder, department)
+        await AccessService.invalidate_department(db, department.id)
 
     @staticmethod
     async def is_user_assigned(db: AsyncSession, folder_id: uuid.UUID, user_id: uuid.UUID) -> bool:
@@ -61,10 +82,12 @@ class FolderService:
     @staticmethod
     async def assign_user_to_folder(db: AsyncSession, folder: Folder, user) -> None:
         await FolderRepository.assign_user_to_folder(db, folder, user)
+        AccessService.invalidate_user(user.id)
 
     @staticmethod
     async def unassign_user_from_folder(db: AsyncSession, folder: Folder, user) -> None:
         await FolderRepository.unassign_user_from_folder(db, folder, user)
+        AccessService.invalidate_user(user.id)
 
     @staticmethod
     async def get_paginated_departments_assigned_to_folder(db: AsyncSession, pagination, folder_id: uuid.UUID) -> PaginationResponse:
@@ -79,20 +102,27 @@ class FolderService:
         return await FolderRepository.is_any_department_assigned(db, folder_id, department_ids)
 
     @staticmethod
-    async def set_folder_private(db: AsyncSession, folder_id: uuid.UUID, is_private: bool) -> None:
+    async def set_folder_private(db: AsyncSession, folder_id: uuid.UUID, is_private: bool) -> int:
         folder = await FolderService.get_folder_by_id_with_category(db, folder_id)
 
         if not folder:
             raise HTTPException(status_code=404, detail="Folder not found")
 
-        sub_folders = await FolderRepository.get_all_child_folders(db, folder_id)
+        return await FolderService.set_folders_private(db, [folder], is_private)
+
+    @staticmethod
+    async def get_folders_by_ids_with_category(db: AsyncSession, folder_ids: Collection[uuid.UUID]) -> Sequence[Folder]:
+        return await FolderRepository.get_by_ids_with_category(db, folder_ids)
 
-        for sub_folder in sub_folders:
-            setattr(sub_folder, "is_private", is_private)
-            await BaseRepository.update(db, sub_folder)
+    @staticmethod
+    async def set_folders_private(
+        db: AsyncSession, folders: Sequence[Folder], is_private: bool, include_descendants: bool = True
+    ) -> int:
+        updated = await FolderRepository.set_privacy(db, folders, is_private, include_descendants)
 
-        setattr(folder, "is_private", is_private)
-        await BaseRepository.update(db, folder)
+        for category_id in {folder.category_id for folder in folders}:
+            AutocompleteService.invalidate(category_id)  # type: ignore
+        return updated
 
     @staticmethod
     async def update_folder(db: AsyncSession, folder_id: uuid.UUID, data: FolderUpdate) -> None:
@@ -109,167 +139,292 @@ class FolderService:
 
     @staticmethod
     async def user_has_access_to_folder(db: AsyncSession, folder_id: uuid.UUID, user_id: uuid.UUID) -> bool:
-        folder = await FolderService.get_folder_by_id(db, folder_id)
+        user = await UserService.get_user_by_id(db, user_id)
 
-        if not folder:
+        if not user:
             return False
 
-        user = await UserService.get_user_by_id(db, user_id)
+        return folder_id in await PermissionService.get_accessible_folder_ids(db, user, [folder_id])
 
-        if user and bool(user.is_superuser):
-            return True
+    @staticmethod
+    async def _update_folder_name(db: AsyncSession, folder: Folder, data: FolderUpdate) -> None:
+        path_str = str(folder.path)
+        new_path = data.name if "." not in path_str else f"{path_str.rsplit('.', 1)[0]}.{data.name}"
+
+        if await FolderRepository.get_by_path(db, folder.category_id, new_path):  # type: ignore
+            raise HTTPException(status_code=400, detail="A folder with this name already exists in the category")
 
-        if not bool(folder.is_private):
-            return True
+        real_old_path = category_key(folder.category_id, path_str)  # type: ignore
+        real_new_path = category_key(folder.category_id, new_path)  # type: ignore
 
-        if await FolderService.is_user_assigned(db, folder_id, user_id):
-            return True
+        await FolderService._rename_folder_in_filesystem(real_old_path, real_new_path)  # type: ignore
 
-        if user:
-            department_ids = [department.id for department in user.departments]
-            if await FolderService.is_any_department_assigned(db, folder_id, department_ids):
-                return True
+        try:
+            await FolderRepository.rewrite_subtree(db, folder, new_path, name=data.name)
+        except Exception:
+            # Put the files back so storage keeps matching the paths that are still in the database.
+            await FolderService._rename_folder_in_filesystem(real_new_path, real_old_path)
+            raise
 
-        return False
+        AutocompleteService.folder_saved(folder)
 
     @staticmethod
-    async def _update_folder_name(db: AsyncSession, folder: Folder, data: FolderUpdate) -> None:
-        existing_folder = await FolderRepository.check_folder_exists_by_name_category_path(db, folder.category_id, data.name, folder.path)  # type: ignore
+    async def move_folder(db: AsyncSession, folder_id: uuid.UUID, parent_id: uuid.UUID | None) -> Folder:
+        folder = await FolderService._validate_folder_exists(db, folder_id)
+        path_str = str(folder.path)
 
-        if existing_folder:
-            raise HTTPException(status_code=400, detail="A folder with this name already exists in the category")
+        parent = None
+        if parent_id is not None:
+            parent = await FolderService.get_folder_by_id(db, parent_id)
+            if not parent or parent.category_id != folder.category_id:  # type: ignore
+                raise HTTPException(status_code=404, detail="Target folder not found in this category")
+
+            parent_path = str(parent.path)
+            if parent_path == path_str or parent_path.startswith(path_str + "."):
+                raise HTTPException(status_code=400, detail="A folder cannot be moved into itself or one of its subfolders")
+
+        if folder.parent_id == parent_id:  # type: ignore
+            return folder
+
+        new_path = f"{parent.path}.{folder.name}" if parent is not None else str(folder.name)
+        if await FolderRepository.get_by_path(db, folder.category_id, new_path):  # type: ignore
+            raise HTTPException(status_code=400, detail="A folder with this name already exists in the target folder")
+
+        real_old_path = category_key(folder.category_id, path_str)  # type: ignore
+        real_new_path = category_key(folder.category_id, new_path)  # type: ignore
+
+        await FolderService._rename_folder_in_filesystem(real_old_path, real_new_path)
+
+        # Privacy is a per-folder flag, so a subtree moved under a private parent has to become private too.
+        make_private = parent is not None and bool(parent.is_private)
 
+        try:
+            await FolderRepository.rewrite_subtree(db, folder, new_path, make_private=make_private, parent_id=parent_id)
+        except Exception:
+            await FolderService._rename_folder_in_filesystem(real_new_path, real_old_path)
+            raise
+
+        if make_private:
+            AutocompleteService.invalidate(folder.category_id)  # type: ignore
+        else:
+            AutocompleteService.folder_saved(folder)
+        return folder
+
+    @staticmethod
+    async def copy_folder(
+        db: AsyncSession, folder_id: uuid.UUID, parent_id: uuid.UUID | None, name: str | None = None
+    ) -> FolderCopyResult:
+        """Copy a folder with its whole subtree under ``parent_id`` (or the category root). Files are cloned
+        concurrently by the storage backend; the folder and document rows are copied with one bulk insert
+        each. Department and user grants are not copied."""
+        folder = await FolderService._validate_folder_exists(db, folder_id)
         path_str = str(folder.path)
-        new_path = data.name if "." not in path_str else f"{path_str.rsplit('.', 1)[0]}.{data.name}"
 
-        real_old_path = os.path.join(settings.MEDIA_ROOT, "categories", str(folder.category_id), path_str.replace(".", os.sep))
-        real_new_path = os.path.join(settings.MEDIA_ROOT, "categories", str(folder.category_id), new_path.replace(".", os.sep))
+        parent = None
+        if parent_id is not None:
+            parent = await FolderService.get_folder_by_id(db, parent_id)
+            if not parent or parent.category_id != folder.category_id:  # type: ignore
+                raise HTTPException(status_code=404, detail="Target folder not found in this category")
 
-        await FolderService._rename_folder_in_filesystem(real_old_path, real_new_path)  # type: ignore
+            parent_path = str(parent.path)
+            if parent_path == path_str or parent_path.startswith(path_str + "."):
+                raise HTTPException(status_code=400, detail="A folder cannot be copied into itself or one of its subfolders")
 
-        sub_folders = await FolderRepository.get_all_child_folders(db, folder.id)  # type: ignore
-        for sub_folder in sub_folders:
-            old_sub_path = str(sub_folder.path)
-            new_sub_path = old_sub_path.replace(path_str, new_path, 1)
-            setattr(sub_folder, "path", new_sub_path)
-            await BaseRepository.update(db, sub_folder)
+        name = name or str(folder.name)
+        new_path = f"{parent.path}.{name}" if parent is not None else name
+        try:
+            if "." in name:
+                raise ValueError(name)
+            Ltree.validate(new_path)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid folder name: {name}")
+        if await FolderRepository.get_by_path(db, folder.category_id, new_path):  # type: ignore
+            raise HTTPException(status_code=400, detail="A folder with this name already exists in the target folder")
+
+        subtree = await FolderRepository.get_subtree(db, folder)
+        # As with moves, a copy placed under a private folder is private throughout.
+        inherit_private = parent is not None and bool(parent.is_private)
+        copy_ids = {row.id: uuid.uuid4() for row in subtree}
+        copy_paths = {row.id: new_path + str(row.path)[len(path_str):] for row in subtree}
+        folder_rows = [
+            {
+                "id": copy_ids[row.id],
+                "name": name if row.id == folder.id else row.name,
+                "path": Ltree(copy_paths[row.id]),
+                "parent_id": parent_id if row.id == folder.id else copy_ids[row.parent_id],
+                "is_private": row.is_private or inherit_private,
+                "access_mode": row.access_mode,
+                "category_id": folder.category_id,
+            }
+            for row in subtree
+        ]
+
+        old_paths = {str(row.path): copy_paths[row.id] for row in subtree}
+        documents = await FolderRepository.get_subtree_document_paths(db, folder)
+        copies = [
+            (category_key(folder.category_id, folder_path, document_name), category_key(folder.category_id, old_paths[str(folder_path)], document_name))  # type: ignore
+            for folder_path, document_name in documents
+        ]
+
+        storage = get_storage()
+        copy_key = category_key(folder.category_id, new_path)  # type: ignore
+        try:
+            await run_concurrently(storage.make_prefix(category_key(folder.category_id, path)) for path in copy_paths.values())  # type: ignore
+            errors = await run_concurrently(FolderService._copy_file(old, new) for old, new in copies)
+        except OSError as e:
+            errors = [e]
+
+        error = next((error for error in errors if error is not None), None)
+        if error is not None:
+            await storage.delete_prefix(copy_key)
+            raise HTTPException(status_code=500, detail=f"Failed to copy folder in filesystem: {str(error)}")
+
+        try:
+            documents_copied = await FolderRepository.copy_subtree(db, folder_rows, copy_ids)
+        except Exception:
+            await storage.delete_prefix(copy_key)
+            raise
 
-        setattr(folder, "name", data.name)
-        setattr(folder, "path", new_path)
-        await BaseRepository.update(db, folder)
+        AutocompleteService.invalidate(folder.category_id)  # type: ignore
+        return FolderCopyResult(id=copy_ids[folder.id], folders_copied=len(folder_rows), documents_copied=documents_copied)  # type: ignore
+
+    @staticmethod
+    async def _copy_file(old_key: str, new_key: str) -> Exception | None:
+        try:
+            await get_storage().copy(old_key, new_key)
+        except FileNotFoundError:
+            # Documents whose file is already missing are copied in the database only.
+            pass
+        except Exception as e:
+            return e
+        return None
 
     @staticmethod
     async def _rename_folder_in_filesystem(old_path: str, new_path: str) -> None:
         try:
-            await asyncio.to_thread(os.rename, old_path, new_path)
+            await get_storage().move_prefix(old_path, new_path)
         except OSError as e:
             raise HTTPException(status_code=500, detail=f"Failed to rename folder in filesystem: {str(e)}")
 
     @staticmethod
     async def _update_folder_privacy(db: AsyncSession, folder: Folder, data: FolderUpdate) -> None:
-        if (data.apply_to_children and not data.is_private) or data.is_private:
-            sub_folders = await FolderRepository.get_all_child_folders(db, folder.id)  # type: ignore
-            for sub_folder in sub_folders:
-                setattr(sub_folder, "is_private", data.is_private)
-                await BaseRepository.update(db, sub_folder)
-
-        setattr(folder, "is_private", data.is_private)
-        await BaseRepository.update(db, folder)
+        include_descendants = data.is_private or data.apply_to_children
+        await FolderService.set_folders_private(db, [folder], data.is_private, include_descendants)
 
     @staticmethod
     async def convert_ltree_to_path(ltree_str: Any) -> str:
-        return str(ltree_str).replace(".", os.sep)
+        return str(ltree_str).replace(".", "/")
 
     @staticmethod
-    async def get_category_folder_tree(db: AsyncSession, category_id: uuid.UUID) -> list[FolderTreeNode]:
-        root_folders = await FolderRepository.get_folders_by_parent(db, category_id, parent_id=None)
-        tree = []
-        for folder in root_folders:
-            tree.append(await FolderService._build_folder_tree_node(db, folder))
-        return tree
+    async def get_category_folder_tree(
+        db: AsyncSession, category_id: uuid.UUID, user: User, depth: int | None = None
+    ) -> list[FolderTreeNode]:
+        """Build the folder tree of a category from one cached query, hiding private subtrees the user is
+        not granted. With ``depth``, folders deeper than that many levels are left out."""
+        rows = await FolderService._get_folder_tree_rows(db, category_id)
+
+        children_by_parent: dict[uuid.UUID | None, list[FolderTreeRow]] = {}
+        for row in rows:
+            children_by_parent.setdefault(row.parent_id, []).append(row)
+
+        granted_paths: list[str] = []
+        if not user.is_superuser:
+            access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+            paths_by_id = {row.id: row.path for row in rows}
+            granted_paths = [paths_by_id[folder_id] for folder_id in access.granted_folder_ids if folder_id in paths_by_id]
+
+        def is_visible(row: FolderTreeRow) -> bool:
+            if user.is_superuser or not row.is_private:
+                return True
+            return any(row.path == path or row.path.startswith(path + ".") for path in granted_paths)
 
-    @staticmethod
-    async def _validate_folder_exists(db: AsyncSession, folder_id: uuid.UUID) -> Folder:
-        folder = await FolderService.get_folder_by_id_with_category(db, folder_id)
-        if not folder:
-            raise HTTPException(status_code=404, detail="Folder not found")
-        return folder
+        def build_nodes(parent_id: uuid.UUID | None, level: int) -> list[FolderTreeNode]:
+            if depth is not None and level > depth:
+                return []
+            return [
+                FolderTreeNode(id=str(row.id), name=row.name, children=build_nodes(row.id, level + 1))
+                for row in children_by_parent.get(parent_id, [])
+                if is_visible(row)
+            ]
 
-    @staticmethod
-    async def _get_folders_to_delete(db: AsyncSession, folder_id: uuid.UUID) -> list[Folder]:
-        child_folders = list(await FolderRepository.get_all_child_folders(db, folder_id))
-        root_folder = await FolderService.get_folder_by_id(db, folder_id)
-        if root_folder:
-            child_folders.insert(0, root_folder)
-        return child_folders
+        return build_nodes(None, 1)
 
     @staticmethod
-    async def _delete_documents_for_folder(db: AsyncSession, folder_to_delete: Folder) -> None:
-        from repositories.document_repository import DocumentRepository
-
-        documents = await DocumentRepository.get_documents_by_folder(db, folder_to_delete.category_id, folder_to_delete.id)  # type: ignore
-
-        for doc in documents:
-            if doc.folder_id is None:
-                file_path = os.path.join(settings.MEDIA_ROOT, "categories", str(doc.category_id), str(doc.name))
-            else:
-                doc_folder = await FolderService.get_folder_by_id(db, doc.folder_id)  # type: ignore
-                if doc_folder:
-                    folder_path = str(await FolderService.convert_ltree_to_path(doc_folder.path) if doc_folder.path else doc_folder.name)  # type: ignore
-                    file_path = os.path.join(settings.MEDIA_ROOT, "categories", str(doc.category_id), folder_path, str(doc.name))
-                else:
-                    file_path = os.path.join(settings.MEDIA_ROOT, "categories", str(doc.category_id), str(doc.name))
+    async def get_folder_children(
+        db: AsyncSession, category_id: uuid.UUID, folder_id: uuid.UUID | None, user: User, depth: int = 1
+    ) -> list[FolderChildNode]:
+        root = None
+        if folder_id is not None:
+            root = await FolderService.get_folder_by_id(db, folder_id)
+            if not root or root.category_id != category_id:  # type: ignore
+                raise HTTPException(status_code=404, detail="Folder not found")
+            if folder_id not in await PermissionService.get_accessible_folder_ids(db, user, [folder_id]):
+                raise HTTPException(status_code=403, detail="You do not have permission to view this folder")
+
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+        rows = await FolderRepository.get_subtree_with_counts(
+            db, category_id, root, depth, granted_folder_ids=access.granted_folder_ids, is_superuser=bool(user.is_superuser)
+        )
 
-            await db.delete(doc)
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception:
-                await db.rollback()
-                raise HTTPException(status_code=500, detail="Failed to delete document file, database changes rolled back")
+        children_by_parent: dict[uuid.UUID | None, list] = {}
+        for row in rows:
+            children_by_parent.setdefault(row.parent_id, []).append(row)
+
+        def build_nodes(parent_id: uuid.UUID | None) -> list[FolderChildNode]:
+            return [
+                FolderChildNode(
+                    id=str(row.id),
+                    name=row.name,
+                    is_private=bool(row.is_private),
+                    child_folder_count=row.child_folder_count,
+                    document_count=row.document_count,
+                    has_children=row.child_folder_count > 0,
+                    children=build_nodes(row.id),
+                )
+                for row in children_by_parent.get(parent_id, [])
+            ]
+
+        return build_nodes(folder_id)
 
     @staticmethod
-    async def _delete_folders_from_db(db: AsyncSession, folders: list[Folder]) -> None:
-        for folder_to_delete in reversed(folders):
-            await db.delete(folder_to_delete)
+    async def _get_folder_tree_rows(db: AsyncSession, category_id: uuid.UUID) -> list[FolderTreeRow]:
+        """Return the category's folder rows, cached per worker under the category's folder tree version so
+        that a change made on any worker is picked up by the next request everywhere."""
+        cache_key = (category_id, await FolderRepository.get_tree_version(db, category_id))
+        rows = folder_tree_cache.get(cache_key)
+        if rows is None:
+            rows = [
+                FolderTreeRow(id=row.id, name=row.name, parent_id=row.parent_id, path=str(row.path), is_private=bool(row.is_private))
+                for row in await FolderRepository.get_tree_rows(db, category_id)
+            ]
+            folder_tree_cache.put(cache_key, rows)
+        return rows
 
     @staticmethod
-    async def _delete_folder_from_filesystem(db: AsyncSession, folder: Folder) -> None:
-        folder_path = os.path.join(
-            settings.MEDIA_ROOT,
-            "categories",
-            str(folder.category_id),
-            str(folder.name) if folder.path is None else await FolderService.convert_ltree_to_path(folder.path),
-        )
-        try:
-            if os.path.exists(folder_path):
-                shutil.rmtree(folder_path)
-        except Exception:
-            await db.rollback()
-            raise HTTPException(status_code=500, detail="Failed to delete folder from disk, database changes rolled back")
+    async def _validate_folder_exists(db: AsyncSession, folder_id: uuid.UUID) -> Folder:
+        folder = await FolderService.get_folder_by_id_with_category(db, folder_id)
+        if not folder:
+            raise HTTPException(status_code=404, detail="Folder not found")
+        return folder
 
     @staticmethod
-    async def delete_folder(db: AsyncSession, folder_id: uuid.UUID) -> None:
+    async def delete_folder(db: AsyncSession, folder_id: uuid.UUID) -> str | None:
+        """Delete a folder and its subtree. The folder's files are moved to the trash in one step; the
+        returned trash key should be purged once the request is done."""
         folder = await FolderService._validate_folder_exists(db, folder_id)
+        folder_key = category_key(folder.category_id, folder.path)  # type: ignore
 
-        all_folders_to_delete = await FolderService._get_folders_to_delete(db, folder_id)
-
-        for folder_to_delete in all_folders_to_delete:
-            await FolderService._delete_documents_for_folder(db, folder_to_delete)
-
-        await FolderService._delete_folders_from_db(db, all_folders_to_delete)
-
-        await FolderService._delete_folder_from_filesystem(db, folder)
-
-        await db.commit()
+        try:
+            trashed_key = await TrashService.move_to_trash(folder_key, folder.category_id)  # type: ignore
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to delete folder from disk: {str(e)}")
 
-    @staticmethod
-    async def _build_folder_tree_node(db: AsyncSession, folder: Folder) -> FolderTreeNode:
-        children_folders = await FolderRepository.get_folders_by_parent(db, folder.category_id, parent_id=folder.id)  # type: ignore
-        children = [await FolderService._build_folder_tree_node(db, child) for child in children_folders]
+        try:
+            await FolderRepository.delete_subtree(db, folder)
+        except Exception:
+            if trashed_key:
+                await TrashService.restore(trashed_key, folder_key)
+            raise
 
-        return FolderTreeNode(
-            id=str(folder.id),  # type: ignore
-            name=folder.name,  # type: ignore
-            children=children,
-        )
+        AutocompleteService.invalidate(folder.category_id)  # type: ignore
+        return trashed_key
@@ -0,0 +1,143 @@
+from array import array
+import csv
+from dataclasses import dataclass
+import io
+from core.cache import line_index_cache
+from core.config import settings
+from core.storage_base import DEFAULT_CHUNK_SIZE, get_storage
+
+
+@dataclass
+class LineIndex:
+    """Byte offsets of every ``interval``-th record of a text file.
+
+    In CSV mode a record ends at a newline outside of quoted fields, so rows containing quoted line
+    breaks count as a single record, and the first record is parsed once as the header.
+    """
+
+    interval: int
+    offsets: array
+    record_count: int
+    size: int
+    csv_mode: bool
+    header: list[str] | None = None
+
+
+class LineIndexService:
+    @staticmethod
+    async def get_index(file_hash: str | None, file_path: str, csv_mode: bool) -> LineIndex:
+        cache_key = (file_hash, csv_mode)
+        index = line_index_cache.get(cache_key) if file_hash else None
+        if index is None:
+            index = await LineIndexService._build_index(file_path, csv_mode)
+            if file_hash:
+                line_index_cache.put(cache_key, index)
+        return index
+
+    @staticmethod
+    async def _build_index(file_path: str, csv_mode: bool) -> LineIndex:
+        interval = settings.LINE_INDEX_INTERVAL
+        offsets = array("Q", [0])
+        record_count = 0
+        record_start = 0
+        position = 0
+        in_quotes = False
+
+        async for chunk in get_storage().iter_chunks(file_path):
+            newlines = chunk.count(b"\n")
+            if not csv_mode and record_count + newlines < len(offsets) * interval:
+                if newlines:
+                    record_count += newlines
+                    record_start = position + chunk.rfind(b"\n") + 1
+                position += len(chunk)
+                continue
+
+            search_from = 0
+            while (newline := chunk.find(b"\n", search_from)) >= 0:
+                if csv_mode and chunk.count(b'"', search_from, newline) % 2:
+                    in_quotes = not in_quotes
+                search_from = newline + 1
+                if in_quotes:
+                    continue
+
+                record_count += 1
+                record_start = position + newline + 1
+                if record_count % interval == 0:
+                    offsets.append(record_start)
+
+            if csv_mode and chunk.count(b'"', search_from) % 2:
+                in_quotes = not in_quotes
+            position += len(chunk)
+
+        if position > record_start:
+            record_count += 1
+        if offsets[-1] >= position and len(offsets) > 1:
+            offsets.pop()
+
+        index = LineIndex(interval=interval, offsets=offsets, record_count=record_count, size=position, csv_mode=csv_mode)
+        if csv_mode and record_count:
+            header_record = await LineIndexService._read_records(file_path, index, 0, 1)
+            index.header = LineIndexService._parse_csv(header_record)[0] if header_record else []
+        return index
+
+    @staticmethod
+    async def _read_records(file_path: str, index: LineIndex, start: int, count: int) -> list[bytes]:
+        """Seek to the closest indexed record before ``start`` and read ``count`` raw records from there."""
+        storage = get_storage()
+        checkpoint = min(start // index.interval, len(index.offsets) - 1)
+        record = checkpoint * index.interval
+        position = index.offsets[checkpoint]
+
+        records: list[bytes] = []
+        buffer = b""
+        search_from = 0
+        in_quotes = False
+
+        while len(records) < count and position < index.size:
+            chunk = await storage.read_range(file_path, position, DEFAULT_CHUNK_SIZE)
+            if not chunk:
+                break
+            position += len(chunk)
+            buffer += chunk
+
+            record_start = 0
+            while len(records) < count and (newline := buffer.find(b"\n", search_from)) >= 0:
+                if index.csv_mode and buffer.count(b'"', search_from, newline) % 2:
+                    in_quotes = not in_quotes
+                search_from = newline + 1
+                if in_quotes:
+                    continue
+
+                if record >= start:
+                    records.append(buffer[record_start:search_from])
+                record += 1
+                record_start = search_from
+
+            buffer = buffer[record_start:]
+            search_from -= record_start
+
+        if len(records) < count and buffer and position >= index.size and record >= start:
+            records.append(buffer)
+        return records
+
+    @staticmethod
+    def _parse_csv(records: list[bytes]) -> list[list[str]]:
+        text = b"".join(records).decode("utf-8", errors="replace").lstrip("\ufeff")
+        return list(csv.reader(io.StringIO(text, newline="")))
+
+    @staticmethod
+    async def read_rows(
+        file_hash: str | None, file_path: str, csv_mode: bool, start: int, limit: int
+    ) -> tuple[LineIndex, list[str] | list[list[str]]]:
+        index = await LineIndexService.get_index(file_hash, file_path, csv_mode)
+
+        if csv_mode:
+            records = await LineIndexService._read_records(file_path, index, start + 1, limit)
+            return index, LineIndexService._parse_csv(records) if records else []
+
+        records = await LineIndexService._read_records(file_path, index, start, limit)
+        return index, [record.decode("utf-8", errors="replace").rstrip("\r\n") for record in records]
+
+    @staticmethod
+    def total_rows(index: LineIndex) -> int:
+        return max(index.record_count - 1, 0) if index.csv_mode else index.record_count
@@ -5,18 +5,21 @@ from schemas.pagination import PaginationParams, PaginationResponse
 from models.organization import Organization
 from schemas.organization import Organization as OrganizationSchema
 from repositories.base_repository import BaseRepository
+from schemas.deletion import DeletionStatus
+from services.deletion_service import DeletionService
 
 
 class OrganizationService:
     @staticmethod
     async def get_organization_by_id(db: AsyncSession, organization_id: uuid.UUID) -> Organization | None:
-        return await BaseRepository.get_by_id(Organization, db, organization_id)
+        organization = await BaseRepository.get_by_id(Organization, db, organization_id)
+        return organization if organization is not None and organization.deleting_at is None else None
 
     @staticmethod
-    async def delete_organization(db: AsyncSession, organization_id: uuid.UUID) -> None:
-        organization = await BaseRepository.get_by_id(Organization, db, organization_id)
-        if organization:
-            await BaseRepository.delete(model=Organization, db=db, entity_id=organization.id) # type: ignore
+    async def delete_organization(db: AsyncSession, organization: Organization) -> DeletionStatus:
+        """Hide the organization and its categories right away; the rows and files are removed by
+        ``DeletionService.delete_organization``, which the caller should run in the background."""
+        return await DeletionService.start_organization_deletion(db, organization)
 
     @staticmethod
     async def get_paginated_organizations(
@@ -32,6 +35,7 @@ class OrganizationService:
             ordering_desc=pagination.ordering_desc,
             filters=pagination.filters,
             ids=organization_ids,
+            conditions=[Organization.deleting_at.is_(None)],
         )
 
     @staticmethod
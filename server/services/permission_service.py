@@ -0,0 +1,26 @@
+from typing import Iterable
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from repositories.permission_repository import PermissionRepository
+from services.access_service import AccessService
+
+
+class PermissionService:
+    @staticmethod
+    async def get_accessible_folder_ids(db: AsyncSession, user: User, folder_ids: Iterable[uuid.UUID]) -> set[uuid.UUID]:
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+        return await PermissionRepository.get_accessible_folder_ids(
+            db, folder_ids, granted_folder_ids=access.granted_folder_ids, is_superuser=bool(user.is_superuser)
+        )
+
+    @staticmethod
+    async def get_viewable_document_ids(db: AsyncSession, user: User, document_ids: Iterable[uuid.UUID]) -> set[uuid.UUID]:
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+        return await PermissionRepository.get_viewable_document_ids(
+            db,
+            document_ids,
+            organization_ids=[org.id for org in user.additional_organizations],  # type: ignore
+            granted_folder_ids=access.granted_folder_ids,
+            is_superuser=bool(user.is_superuser),
+        )
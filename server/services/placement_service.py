@@ -0,0 +1,312 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.storage.placement import PlacementPolicy, create_placement_policy, volume_placement
+from core.storage_base import CATEGORIES_PREFIX
+from models.category import Category
+from models.category_placement import CategoryPlacement
+from models.document import Document
+from models.folder import Folder
+from schemas.storage import RebalanceStatus, VolumeUsage
+
+
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+MAX_CATCH_UP_PASSES = 5
+
+
+class _BandwidthThrottle:
+    def __init__(self, bytes_per_second: int) -> None:
+        self.bytes_per_second = bytes_per_second
+        self.started_at = time.monotonic()
+        self.transferred = 0
+
+    def consume(self, size: int) -> None:
+        if self.bytes_per_second <= 0:
+            return
+        self.transferred += size
+        expected = self.transferred / self.bytes_per_second
+        elapsed = time.monotonic() - self.started_at
+        if expected > elapsed:
+            time.sleep(expected - elapsed)
+
+
+class PlacementService:
+    _policy: PlacementPolicy | None = None
+    _rebalance_jobs: dict[uuid.UUID, RebalanceStatus] = {}
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.STORAGE_BACKEND == "local" and bool(settings.MEDIA_VOLUMES)
+
+    @staticmethod
+    def _get_policy() -> PlacementPolicy:
+        if PlacementService._policy is None:
+            PlacementService._policy = create_placement_policy(settings.MEDIA_PLACEMENT_POLICY)
+        return PlacementService._policy
+
+    @staticmethod
+    async def load_placements(db: AsyncSession) -> None:
+        result = await db.execute(select(CategoryPlacement.category_id, CategoryPlacement.volume))
+        volume_placement.replace({str(category_id): volume for category_id, volume in result.all()})
+
+    @staticmethod
+    async def refresh_placements_periodically() -> None:
+        while True:
+            await asyncio.sleep(settings.MEDIA_PLACEMENT_REFRESH_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await PlacementService.load_placements(db)
+            except Exception as e:
+                logger.warning(f"Failed to refresh media placements: {e}")
+
+    @staticmethod
+    async def assign_category(db: AsyncSession, category: Category) -> None:
+        if not PlacementService.is_enabled():
+            return
+
+        volume = PlacementService._get_policy().choose(
+            settings.MEDIA_VOLUMES,
+            category.id,  # type: ignore
+            category.organization_id,  # type: ignore
+        )
+        db.add(CategoryPlacement(category_id=category.id, volume=volume))
+        await db.flush()
+        volume_placement.set(category.id, volume)  # type: ignore
+
+    @staticmethod
+    def get_volume_usage() -> list[VolumeUsage]:
+        category_counts = volume_placement.category_counts()
+        usage = []
+        for name, root in sorted(settings.MEDIA_VOLUMES.items()):
+            disk = shutil.disk_usage(root)
+            usage.append(
+                VolumeUsage(
+                    name=name,
+                    root=root,
+                    total_bytes=disk.total,
+                    used_bytes=disk.used,
+                    free_bytes=disk.free,
+                    category_count=category_counts.get(name, 0),
+                )
+            )
+        return usage
+
+    @staticmethod
+    def get_rebalance_status(category_id: uuid.UUID) -> RebalanceStatus | None:
+        return PlacementService._rebalance_jobs.get(category_id)
+
+    @staticmethod
+    async def start_rebalance(db: AsyncSession, category_id: uuid.UUID, target_volume: str) -> RebalanceStatus:
+        if not PlacementService.is_enabled():
+            raise ValueError("Multi-volume storage is not configured")
+
+        if target_volume not in settings.MEDIA_VOLUMES:
+            raise ValueError(f"Unknown volume: {target_volume}")
+
+        running = PlacementService._rebalance_jobs.get(category_id)
+        if running and running.state not in ("completed", "failed"):
+            raise ValueError(f"Category {category_id} is already being rebalanced")
+
+        placement = await db.get(CategoryPlacement, category_id)
+        source_volume = str(placement.volume) if placement else volume_placement.default_volume
+
+        if source_volume == target_volume:
+            raise ValueError(f"Category {category_id} is already stored on volume {target_volume}")
+
+        status = RebalanceStatus(
+            category_id=category_id,
+            source_volume=source_volume,  # type: ignore
+            target_volume=target_volume,
+            state="pending",
+        )
+        PlacementService._rebalance_jobs[category_id] = status
+        return status
+
+    @staticmethod
+    async def rebalance_category(category_id: uuid.UUID) -> None:
+        """Move a category to another volume while it stays readable and writable.
+
+        Files are copied with a bandwidth limit and re-synchronized until a pass finds no changes. The
+        placement is then switched, and once every worker has refreshed its placement map the source
+        copy is reconciled with the target until nothing differs, and only then removed.
+        """
+        status = PlacementService._rebalance_jobs[category_id]
+        source = os.path.join(volume_placement.root_for(status.source_volume), CATEGORIES_PREFIX, str(category_id))
+        target = os.path.join(volume_placement.root_for(status.target_volume), CATEGORIES_PREFIX, str(category_id))
+        throttle = _BandwidthThrottle(settings.MEDIA_REBALANCE_BANDWIDTH_BYTES)
+
+        try:
+            status.state = "copying"
+            for _ in range(MAX_CATCH_UP_PASSES):
+                changes = await asyncio.to_thread(PlacementService._sync_tree, source, target, throttle, status)
+                if changes == 0:
+                    break
+            else:
+                await asyncio.to_thread(shutil.rmtree, target, True)
+                raise RuntimeError(f"Category still changing after {MAX_CATCH_UP_PASSES} copy passes, try again later")
+
+            status.state = "switching"
+            switched_at = time.time()
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    pg_insert(CategoryPlacement)
+                    .values(category_id=category_id, volume=status.target_volume)
+                    .on_conflict_do_update(index_elements=["category_id"], set_={"volume": status.target_volume})
+                )
+                await db.commit()
+            volume_placement.set(category_id, status.target_volume)
+
+            status.state = "draining"
+            await asyncio.sleep(max(settings.MEDIA_REBALANCE_GRACE_SECONDS, settings.MEDIA_PLACEMENT_REFRESH_SECONDS))
+
+            # Workers now write to the target only. Reconcile the frozen source against it until a full
+            # pass finds nothing left to do; the source is only removed after such a pass.
+            for _ in range(MAX_CATCH_UP_PASSES):
+                async with AsyncSessionLocal() as db:
+                    document_paths = await PlacementService._get_document_paths(db, category_id)
+                changes = await asyncio.to_thread(
+                    PlacementService._reconcile_tree, source, target, throttle, status, switched_at, document_paths
+                )
+                if changes == 0:
+                    break
+            else:
+                raise RuntimeError(f"Source copy still differs after {MAX_CATCH_UP_PASSES} passes; it was kept at {source}")
+
+            await asyncio.to_thread(shutil.rmtree, source, True)
+
+            status.state = "completed"
+            logger.info(f"Moved category {category_id} from volume {status.source_volume} to {status.target_volume}")
+        except Exception as e:
+            status.state = "failed"
+            status.error = str(e)
+            logger.error(f"Failed to rebalance category {category_id}: {e}", exc_info=True)
+
+    @staticmethod
+    async def _get_document_paths(db: AsyncSession, category_id: uuid.UUID) -> set[str]:
+        """Return the path of every document file of a category, relative to the category directory."""
+        result = await db.execute(
+            select(Folder.path, Document.name)
+            .select_from(Document)
+            .join(Folder, Document.folder_id == Folder.id, isouter=True)
+            .where(Document.category_id == category_id)
+        )
+        return {
+            os.path.join(*str(folder_path).split("."), name) if folder_path is not None else name
+            for folder_path, name in result.all()
+        }
+
+    @staticmethod
+    def _sync_tree(source: str, target: str, throttle: _BandwidthThrottle, status: RebalanceStatus) -> int:
+        """Mirror ``source`` onto ``target``, which nobody else writes to yet. Returns the number of changes."""
+        changes = 0
+        seen: set[str] = set()
+
+        os.makedirs(target, exist_ok=True)
+        for root, dir_names, file_names in os.walk(source):
+            rel_root = os.path.relpath(root, source)
+            for dir_name in dir_names:
+                os.makedirs(os.path.join(target, rel_root, dir_name), exist_ok=True)
+                seen.add(os.path.normpath(os.path.join(rel_root, dir_name)))
+
+            for file_name in file_names:
+                rel_path = os.path.normpath(os.path.join(rel_root, file_name))
+                seen.add(rel_path)
+                source_stat = os.stat(os.path.join(source, rel_path))
+                try:
+                    target_stat = os.stat(os.path.join(target, rel_path))
+                    if target_stat.st_size == source_stat.st_size and target_stat.st_mtime_ns == source_stat.st_mtime_ns:
+                        continue
+                except FileNotFoundError:
+                    pass
+
+                PlacementService._copy_file(os.path.join(source, rel_path), os.path.join(target, rel_path), throttle, status)
+                changes += 1
+
+        for root, dir_names, file_names in os.walk(target, topdown=False):
+            rel_root = os.path.relpath(root, target)
+            for file_name in file_names:
+                if os.path.normpath(os.path.join(rel_root, file_name)) not in seen:
+                    os.remove(os.path.join(root, file_name))
+                    changes += 1
+            for dir_name in dir_names:
+                if os.path.normpath(os.path.join(rel_root, dir_name)) not in seen:
+                    shutil.rmtree(os.path.join(root, dir_name), ignore_errors=True)
+                    changes += 1
+
+        return changes
+
+    @staticmethod
+    def _reconcile_tree(
+        source: str,
+        target: str,
+        throttle: _BandwidthThrottle,
+        status: RebalanceStatus,
+        switched_at: float,
+        document_paths: set[str],
+    ) -> int:
+        """Bring a live ``target`` up to date with the frozen ``source`` after the placement switch.
+
+        Every source file is compared, whatever its mtime, since renames keep the mtime of the file.
+        Target files written after the switch win over the source, and the database decides which files
+        still belong to a document: missing ones are copied, stale copies left behind by renames or
+        deletes on the source are removed. Returns the number of changes.
+        """
+        changes = 0
+        source_files: set[str] = set()
+
+        for root, dir_names, file_names in os.walk(source):
+            rel_root = os.path.relpath(root, source)
+            for dir_name in dir_names:
+                os.makedirs(os.path.join(target, rel_root, dir_name), exist_ok=True)
+
+            for file_name in file_names:
+                rel_path = os.path.normpath(os.path.join(rel_root, file_name))
+                source_files.add(rel_path)
+                source_stat = os.stat(os.path.join(source, rel_path))
+                try:
+                    target_stat = os.stat(os.path.join(target, rel_path))
+                except FileNotFoundError:
+                    if rel_path not in document_paths:
+                        continue
+                else:
+                    if target_stat.st_size == source_stat.st_size and target_stat.st_mtime_ns == source_stat.st_mtime_ns:
+                        continue
+                    if target_stat.st_mtime > switched_at:
+                        continue
+
+                PlacementService._copy_file(os.path.join(source, rel_path), os.path.join(target, rel_path), throttle, status)
+                changes += 1
+
+        for root, _, file_names in os.walk(target):
+            rel_root = os.path.relpath(root, target)
+            for file_name in file_names:
+                rel_path = os.path.normpath(os.path.join(rel_root, file_name))
+                if rel_path in source_files or rel_path in document_paths:
+                    continue
+                if os.stat(os.path.join(root, file_name)).st_mtime <= switched_at:
+                    os.remove(os.path.join(root, file_name))
+                    changes += 1
+
+        return changes
+
+    @staticmethod
+    def _copy_file(source: str, target: str, throttle: _BandwidthThrottle, status: RebalanceStatus) -> None:
+        partial = f"{target}.rebalance"
+        with open(source, "rb") as src, open(partial, "wb") as dst:
+            while chunk := src.read(COPY_CHUNK_SIZE):
+                dst.write(chunk)
+                throttle.consume(len(chunk))
+                status.bytes_copied += len(chunk)
+        shutil.copystat(source, partial)
+        os.replace(partial, target)
+        status.files_copied += 1
@@ -0,0 +1,68 @@
+import base64
+from decimal import Decimal, InvalidOperation
+import json
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from repositories.search_repository import SearchRepository
+from schemas.search import GlobalSearchResponse, SearchResultGroup, SearchResultItem
+from services.access_service import AccessService
+
+
+class SearchService:
+    @staticmethod
+    async def global_search(
+        db: AsyncSession, user: User, search_query: str, limit: int, cursor: str | None = None
+    ) -> GlobalSearchResponse:
+        organization_ids = [org.id for org in user.additional_organizations]
+        if user.primary_organization_id is not None and user.primary_organization_id not in organization_ids:
+            organization_ids.append(user.primary_organization_id)
+
+        if not organization_ids:
+            return GlobalSearchResponse(groups=[])
+
+        access = await AccessService.get_effective_access(db, user.id)  # type: ignore
+        rows = await SearchRepository.search_visible_content(
+            db,
+            organization_ids=organization_ids,  # type: ignore
+            category_ids=access.category_ids,
+            granted_folder_ids=access.granted_folder_ids,
+            is_superuser=bool(user.is_superuser),
+            search_query=search_query,
+            limit=limit + 1,
+            after=SearchService._decode_cursor(cursor) if cursor else None,
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = SearchService._encode_cursor(last.score, last.kind, last.id)
+
+        groups: dict[uuid.UUID, SearchResultGroup] = {}
+        for row in rows:
+            group = groups.get(row.category_id)
+            if group is None:
+                group = groups[row.category_id] = SearchResultGroup(
+                    category_id=row.category_id, category_name=row.category_name, organization_id=row.organization_id, items=[]
+                )
+            group.items.append(
+                SearchResultItem(
+                    id=row.id, kind=row.kind, name=row.name, folder_id=row.folder_id, mime_type=row.mime_type, score=float(row.score)
+                )
+            )
+
+        return GlobalSearchResponse(groups=list(groups.values()), next_cursor=next_cursor)
+
+    @staticmethod
+    def _encode_cursor(score: Decimal, kind: str, entity_id: uuid.UUID) -> str:
+        payload = json.dumps({"s": str(score), "k": kind, "i": str(entity_id)}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[Decimal, str, uuid.UUID]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return Decimal(payload["s"]), str(payload["k"]), uuid.UUID(payload["i"])
+        except (ValueError, KeyError, TypeError, InvalidOperation):
+            raise ValueError("Invalid search cursor")
@@ -1,22 +1,20 @@
 import logging
-import asyncio
 import hashlib
 import mimetypes
-from pathlib import Path
 from typing import Any, Dict, Set
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.config import settings
+from core.storage_base import category_key, get_storage
+from services.autocomplete_service import AutocompleteService
 from services.document_service import DocumentService
 from services.folder_service import FolderService
 from services.category_service import CategoryService
+from services.text_extraction_service import TextExtractionService
 
 
 logger = logging.getLogger(__name__)
 
-CATEGORY_MEDIA_ROOT = Path(settings.MEDIA_ROOT) / "categories"
-
 
 class SyncService:
     @staticmethod
@@ -27,14 +25,14 @@ class SyncService:
             logger.warning(f"Category with ID {category_id} not found.")
             raise ValueError(f"Category with ID {category_id} not found.")
 
-        category_path = CATEGORY_MEDIA_ROOT / str(category.id)
+        category_path = category_key(category.id)  # type: ignore
 
-        if not category_path.exists():
+        try:
+            scanned_folders, scanned_docs = await SyncService._scan_filesystem(category_path)
+        except FileNotFoundError:
             logger.warning(f"Category path {category_path} does not exist.")
             raise FileNotFoundError(f"Category path {category_path} does not exist.")
 
-        scanned_folders, scanned_docs = await SyncService._scan_filesystem(category_path)
-
         await SyncService._sync_folders(db, category_id, scanned_folders)
         await SyncService._sync_documents(db, category_id, scanned_docs)
 
@@ -45,48 +43,48 @@ class SyncService:
             set(scanned_docs.keys()),
         )
 
+        AutocompleteService.invalidate(category_id)
         logger.info(f"Synchronized category {category_id}")
 
     @staticmethod
-    async def _scan_filesystem(category_path: Path) -> tuple[dict[Any, Any], dict[Any, Any]]:
+    async def _scan_filesystem(category_path: str) -> tuple[dict[Any, Any], dict[Any, Any]]:
         folders = {}
         documents = {}
 
-        for root, dirs, files in category_path.walk():
-            # Folders
-            for dir_name in dirs:
-                dir_path = root / dir_name
-                rel_path = dir_path.relative_to(category_path)
-                path_str = str(rel_path).replace("\\", ".").replace("/", ".")
-                folders[path_str] = {
-                    "name": dir_name,
-                    "path": path_str,
-                    "parent_path": str(rel_path.parent).replace("\\", ".").replace("/", ".") if rel_path.parent != Path(".") else None,
-                }
-
-            # Documents
-            for file_name in files:
-                file_path = root / file_name
-                rel_path = file_path.relative_to(category_path)
-                file_hash = await asyncio.get_event_loop().run_in_executor(None, SyncService._compute_hash, file_path)
-                mime_type, _ = mimetypes.guess_type(str(file_path))
-                folder_path = str(rel_path.parent).replace("\\", ".").replace("/", ".") if rel_path.parent != Path(".") else None
-                documents[(folder_path, file_name)] = {
-                    "name": file_name,
-                    "file_hash": file_hash,
-                    "mime_type": mime_type,
-                    "file_size": file_path.stat().st_size,
-                    "folder_path": folder_path,
-                }
+        dirs, files = await get_storage().list_tree(category_path)
+
+        # Folders
+        for rel_path in dirs:
+            parent_path, _, dir_name = rel_path.rpartition("/")
+            path_str = rel_path.replace("/", ".")
+            folders[path_str] = {
+                "name": dir_name,
+                "path": path_str,
+                "parent_path": parent_path.replace("/", ".") if parent_path else None,
+            }
+
+        # Documents
+        for rel_path, file_size in files.items():
+            parent_path, _, file_name = rel_path.rpartition("/")
+            file_hash = await SyncService._compute_hash(f"{category_path}/{rel_path}")
+            mime_type, _ = mimetypes.guess_type(file_name)
+            folder_path = parent_path.replace("/", ".") if parent_path else None
+            documents[(folder_path, file_name)] = {
+                "name": file_name,
+                "file_hash": file_hash,
+                "mime_type": mime_type,
+                "file_size": file_size,
+                "folder_path": folder_path,
+                "file_path": f"{category_path}/{rel_path}",
+            }
 
         return folders, documents
 
     @staticmethod
-    def _compute_hash(file_path: Path) -> str:
+    async def _compute_hash(file_path: str) -> str:
         hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+        async for chunk in get_storage().iter_chunks(file_path):
+            hash_sha256.update(chunk)
         return hash_sha256.hexdigest()
 
     @staticmethod
@@ -124,14 +122,18 @@ class SyncService:
                             "category_id": category_id,
                             "folder_id": folder_id,
                             "sync_status": "SYNCED",
+                            "content_text": await TextExtractionService.extract(data["file_path"], data["mime_type"]),
                         },
                     )
                 except Exception as e:
                     logger.debug(f"Document {file_name} already exists in category {category_id}: {str(e)}")
                     await db.rollback()
             elif doc.file_hash != data["file_hash"]:
+                content_text = await TextExtractionService.extract(data["file_path"], data["mime_type"])
                 await DocumentService.update_document(
-                    db, doc.id, {"file_hash": data["file_hash"], "sync_status": "MODIFIED"} # type: ignore
+                    db,
+                    doc.id,  # type: ignore
+                    {"file_hash": data["file_hash"], "file_size": data["file_size"], "sync_status": "MODIFIED", "content_text": content_text},
                 )
 
     @staticmethod
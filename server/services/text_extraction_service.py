@@ -0,0 +1,70 @@
+import asyncio
+import io
+import logging
+import os
+from core.config import settings
+from core.storage_base import get_storage
+from models.document import SEARCHABLE_MIME_TYPES
+
+
+logger = logging.getLogger(__name__)
+
+
+class TextExtractionService:
+    """Extracts plain text from stored documents for the full-text search index."""
+
+    @staticmethod
+    async def extract(file_path: str, mime_type: str | None) -> str | None:
+        if mime_type not in SEARCHABLE_MIME_TYPES:
+            return None
+
+        try:
+            if mime_type == "application/pdf":
+                text = await TextExtractionService._extract_pdf(file_path)
+            else:
+                text = await TextExtractionService._extract_plain(file_path)
+        except Exception as e:
+            logger.warning(f"Failed to extract text from {file_path}: {str(e)}")
+            return None
+
+        if text is None:
+            return None
+        return text[: settings.SEARCH_MAX_TEXT_CHARS].replace("\x00", "")
+
+    @staticmethod
+    async def _extract_plain(file_path: str) -> str:
+        # utf-8 needs at most 4 bytes per character
+        max_bytes = settings.SEARCH_MAX_TEXT_CHARS * 4
+        data = bytearray()
+        async for chunk in get_storage().iter_chunks(file_path):
+            data.extend(chunk)
+            if len(data) >= max_bytes:
+                break
+        return bytes(data[:max_bytes]).decode("utf-8", errors="ignore")
+
+    @staticmethod
+    async def _extract_pdf(file_path: str) -> str | None:
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            return None
+
+        storage = get_storage()
+        local_path = storage.local_path(file_path)
+        if local_path is None or not os.path.isfile(local_path):
+            source = io.BytesIO(b"".join([chunk async for chunk in storage.iter_chunks(file_path)]))
+        else:
+            source = local_path
+
+        def extract_sync() -> str:
+            parts = []
+            length = 0
+            for page in PdfReader(source).pages:
+                page_text = page.extract_text() or ""
+                parts.append(page_text)
+                length += len(page_text)
+                if length >= settings.SEARCH_MAX_TEXT_CHARS:
+                    break
+            return "\n".join(parts)
+
+        return await asyncio.to_thread(extract_sync)
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.storage.tiered_storage import TieredStorageBackend
+from core.storage_base import category_key, get_storage
+from models.document import Document, StorageTier
+from models.folder import Folder
+
+
+logger = logging.getLogger(__name__)
+
+
+class TieringService:
+    @staticmethod
+    def get_tiered_storage() -> TieredStorageBackend | None:
+        storage = get_storage()
+        return storage if isinstance(storage, TieredStorageBackend) else None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return TieringService.get_tiered_storage() is not None
+
+    @staticmethod
+    async def demote_cold_documents(db: AsyncSession, limit: int | None = None) -> int:
+        storage = TieringService.get_tiered_storage()
+        if storage is None:
+            raise ValueError("Tiered storage is not configured")
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.COLD_TIER_AFTER_DAYS)
+        result = await db.execute(
+            select(Document.id, Document.category_id, Document.name, Folder.path)
+            .outerjoin(Folder, Document.folder_id == Folder.id)
+            .where(Document.storage_tier == StorageTier.HOT)
+            .where(func.coalesce(Document.last_accessed_at, Document.created_at) < cutoff)
+            .limit(limit or settings.TIERING_BATCH_SIZE)
+        )
+
+        demoted_ids = []
+        for document_id, category_id, name, folder_path in result.all():
+            try:
+                if await storage.demote(category_key(category_id, folder_path, name)):
+                    demoted_ids.append(document_id)
+            except OSError as e:
+                logger.warning(f"Failed to move document {document_id} to the cold tier: {e}")
+
+        if demoted_ids:
+            await TieringService._set_tier(db, demoted_ids, StorageTier.COLD)
+        return len(demoted_ids)
+
+    @staticmethod
+    async def promote(db: AsyncSession, document: Document, file_path: str) -> None:
+        storage = TieringService.get_tiered_storage()
+        if storage is not None:
+            await storage.promote(file_path)
+
+        # Promotion happens in the middle of a request, so the tier is written on its own session instead of
+        # committing whatever the caller has pending, and the loaded row is not marked dirty again.
+        async with AsyncSessionLocal() as tier_db:
+            await TieringService._set_tier(tier_db, [document.id], StorageTier.HOT)  # type: ignore
+        set_committed_value(document, "storage_tier", StorageTier.HOT)
+
+    @staticmethod
+    async def _set_tier(db: AsyncSession, document_ids: list, tier: StorageTier) -> None:
+        await db.execute(
+            update(Document)
+            .where(Document.id.in_(document_ids))
+            .values(storage_tier=tier, updated_at=Document.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def run_periodically() -> None:
+        while True:
+            await asyncio.sleep(settings.TIERING_INTERVAL_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    demoted = await TieringService.demote_cold_documents(db)
+                if demoted:
+                    logger.info(f"Moved {demoted} documents to the cold tier")
+            except Exception as e:
+                logger.warning(f"Failed to run storage tiering: {e}")
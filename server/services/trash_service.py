@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import posixpath
+import time
+import uuid
+from core.config import settings
+from core.storage_base import TRASH_PREFIX, get_storage, trash_key, trashed_at
+
+
+logger = logging.getLogger(__name__)
+
+
+class TrashService:
+    """Detaches storage prefixes with a single move into the trash area and reclaims their space later.
+
+    Entries are purged right after the request that trashed them and, as a fallback for entries left
+    behind by crashed or restarted workers, by a periodic sweep of the whole trash area.
+    """
+
+    @staticmethod
+    async def move_to_trash(prefix: str, category_id: uuid.UUID) -> str | None:
+        """Move ``prefix`` into the trash and return its trash key, or None if there was nothing to move."""
+        key = trash_key(category_id)
+        try:
+            await get_storage().move_prefix(prefix, key)
+        except FileNotFoundError:
+            return None
+        return key
+
+    @staticmethod
+    async def move_object_to_trash(key: str, category_id: uuid.UUID) -> str | None:
+        """Move a single object into a fresh trash entry and return the entry's key, or None if the object
+        does not exist. Unlike ``move_prefix``, this works for single objects on every backend."""
+        storage = get_storage()
+        entry = trash_key(category_id)
+        try:
+            await storage.move(key, f"{entry}/{posixpath.basename(key)}")
+        except Exception:
+            if await storage.exists(key):
+                raise
+            return None
+        return entry
+
+    @staticmethod
+    async def restore(key: str, prefix: str) -> None:
+        await get_storage().move_prefix(key, prefix)
+
+    @staticmethod
+    async def restore_object(entry: str, key: str) -> None:
+        await get_storage().move(f"{entry}/{posixpath.basename(key)}", key)
+
+    @staticmethod
+    async def purge(key: str) -> None:
+        try:
+            await get_storage().delete_prefix(key)
+        except Exception as e:
+            logger.warning(f"Failed to purge {key} from the trash: {e}")
+
+    @staticmethod
+    async def collect() -> int:
+        """Purge trash entries older than ``TRASH_GRACE_SECONDS``. Newer entries may still be restored by
+        the request that trashed them if its database change fails."""
+        storage = get_storage()
+        cutoff = time.time() - settings.TRASH_GRACE_SECONDS
+        purged = 0
+        for category_id in await storage.list_children(TRASH_PREFIX):
+            for name in await storage.list_children(f"{TRASH_PREFIX}/{category_id}"):
+                created_at = trashed_at(name)
+                if created_at is not None and created_at > cutoff:
+                    continue
+                await TrashService.purge(f"{TRASH_PREFIX}/{category_id}/{name}")
+                purged += 1
+        return purged
+
+    @staticmethod
+    async def collect_periodically() -> None:
+        while True:
+            await asyncio.sleep(settings.TRASH_COLLECT_INTERVAL_SECONDS)
+            try:
+                purged = await TrashService.collect()
+                if purged:
+                    logger.info(f"Purged {purged} entries from the storage trash")
+            except Exception as e:
+                logger.warning(f"Failed to collect the storage trash: {e}")
@@ -0,0 +1,63 @@
+import asyncio
+import io
+import struct
+import zipfile
+import pytest
+import services.archive_service as archive_service
+from core.storage.local_storage import LocalStorageBackend
+from services.archive_service import CENTRAL_DIRECTORY_SIGNATURE, EOCD_SIGNATURE, ArchiveService
+
+
+def build_archive() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("a.txt", b"hello" * 1000)
+        archive.writestr("b.txt", b"world")
+    return buffer.getvalue()
+
+
+def read_entries(tmp_path, monkeypatch, data: bytes):
+    monkeypatch.setattr(archive_service, "get_storage", lambda: LocalStorageBackend(str(tmp_path)))
+    (tmp_path / "archive.zip").write_bytes(data)
+    return asyncio.run(ArchiveService._read_central_directory("archive.zip"))
+
+
+def test_valid_archive(tmp_path, monkeypatch):
+    entries = read_entries(tmp_path, monkeypatch, build_archive())
+    assert [entry.name for entry in entries] == ["a.txt", "b.txt"]
+
+
+def test_archive_missing_its_start(tmp_path, monkeypatch):
+    # The end of central directory record survives, but its offsets now point past the data.
+    with pytest.raises(ValueError):
+        read_entries(tmp_path, monkeypatch, build_archive()[30:])
+
+
+def test_archive_missing_its_end(tmp_path, monkeypatch):
+    with pytest.raises(ValueError):
+        read_entries(tmp_path, monkeypatch, build_archive()[:-10])
+
+
+def test_corrupt_central_directory_entry_count(tmp_path, monkeypatch):
+    data = bytearray(build_archive())
+    eocd_pos = data.rfind(EOCD_SIGNATURE)
+    struct.pack_into("<H", data, eocd_pos + 10, 50)
+    with pytest.raises(ValueError):
+        read_entries(tmp_path, monkeypatch, bytes(data))
+
+
+def test_short_central_directory_record():
+    with pytest.raises(ValueError):
+        ArchiveService._parse_central_directory(CENTRAL_DIRECTORY_SIGNATURE + b"\0" * 10, 1)
+
+
+def test_truncated_zip64_extra():
+    with pytest.raises(ValueError):
+        ArchiveService._apply_zip64_extra(b"\x01\x00\x00\x00", 0xFFFFFFFF, 0, 0)
+
+
+def test_local_header_out_of_bounds(tmp_path, monkeypatch):
+    entry = read_entries(tmp_path, monkeypatch, build_archive())[0]
+    entry.header_offset = 10_000_000
+    with pytest.raises(ValueError):
+        asyncio.run(ArchiveService.open_entry("archive.zip", entry))
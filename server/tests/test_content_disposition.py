@@ -0,0 +1,42 @@
+import asyncio
+import time
+import uuid
+from core.cache import document_body_cache
+from core.storage_base import content_disposition
+from services.document_service import DocumentService
+
+
+def test_content_disposition_ascii_name():
+    assert content_disposition("report.pdf") == "inline; filename=\"report.pdf\"; filename*=utf-8''report.pdf"
+
+
+def test_content_disposition_escapes_quotes_and_control_characters():
+    header = content_disposition('a "b"\\\r\n.txt', as_attachment=True)
+    assert header.startswith('attachment; filename="a _b____.txt";')
+    header.encode("latin-1")
+
+
+def test_body_response_with_non_ascii_name():
+    response = DocumentService.build_body_response(b"body", "zażółć.txt", "text/plain")
+    assert response.headers["content-disposition"] == (
+        "inline; filename=\"zazoc.txt\"; filename*=utf-8''za%C5%BC%C3%B3%C5%82%C4%87.txt"
+    )
+
+
+def test_signed_response_with_non_ascii_name():
+    document_body_cache.put("hash-zazolc", b"body")
+    claims = {
+        "d": str(uuid.uuid4()),
+        "h": "hash-zazolc",
+        "k": "categories/c/zażółć.txt",
+        "n": "zażółć.txt",
+        "m": "text/plain",
+        "s": 4,
+        "a": True,
+        "exp": time.time() + 60,
+    }
+
+    response = asyncio.run(DocumentService.build_signed_response(claims))
+
+    assert response.body == b"body"
+    assert response.headers["content-disposition"].startswith('attachment; filename="zazoc.txt";')
@@ -0,0 +1,42 @@
+import asyncio
+import hashlib
+import time
+import uuid
+import services.document_service as document_service
+from core.cache import document_body_cache
+from core.storage.local_storage import LocalStorageBackend
+from services.document_service import DocumentService
+
+
+def signed_response(tmp_path, monkeypatch, content: bytes, file_hash: str):
+    monkeypatch.setattr(document_service, "get_storage", lambda: LocalStorageBackend(str(tmp_path)))
+    (tmp_path / "doc.txt").write_bytes(content)
+    claims = {
+        "d": str(uuid.uuid4()),
+        "h": file_hash,
+        "k": "doc.txt",
+        "n": "doc.txt",
+        "m": "text/plain",
+        "s": len(content),
+        "a": False,
+        "exp": time.time() + 60,
+    }
+    return asyncio.run(DocumentService.build_signed_response(claims))
+
+
+def test_cache_miss_with_matching_hash_is_cached(tmp_path, monkeypatch):
+    file_hash = hashlib.md5(b"current").hexdigest()
+    response = signed_response(tmp_path, monkeypatch, b"current", file_hash)
+
+    assert response.body == b"current"
+    assert response.headers["etag"] == f'"{file_hash}"'
+    assert document_body_cache.get(file_hash) == b"current"
+
+
+def test_cache_miss_with_replaced_file_is_not_cached(tmp_path, monkeypatch):
+    file_hash = hashlib.sha256(b"signed").hexdigest()
+    response = signed_response(tmp_path, monkeypatch, b"replaced", file_hash)
+
+    assert response.body == b"replaced"
+    assert "etag" not in response.headers
+    assert document_body_cache.get(file_hash) is None